@@ -0,0 +1,66 @@
+"""Benchmark: status payload decoding, previous path vs payload.py decoders.
+
+The previous path ran json.loads with a text fallback in the client, then the
+coordinator re-checked the type (and re-parsed strings). The new path decodes
+once into a LightStatus record.
+
+    python benchmarks/bench_payload_decode.py
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import homeassistant  # noqa: F401
+except ImportError:
+    import conftest  # noqa: F401  # installs Home Assistant mocks
+
+from custom_components.hafele_local_mqtt.payload import decode_light_status
+
+MESSAGES = 200_000
+PAYLOAD = json.dumps(
+    {"device_name": "Kitchen ceiling 3", "onoff": 1, "lightness": 0.42, "temperature": 3200}
+).encode()
+
+
+def _previous_path(payload: bytes) -> dict:
+    """Client json.loads + text fallback, then the coordinator's type re-check."""
+    try:
+        data = json.loads(payload)
+    except (json.JSONDecodeError, TypeError):
+        data = payload.decode("utf-8") if isinstance(payload, bytes) else payload
+    if isinstance(data, str):
+        data = json.loads(data)
+    return dict(data)
+
+
+def _new_path(payload: bytes) -> dict:
+    """Decode once into a LightStatus, coordinator takes as_dict()."""
+    return decode_light_status(payload).as_dict()
+
+
+def _run(name: str, func) -> None:
+    start = time.perf_counter()
+    for _ in range(MESSAGES):
+        func(PAYLOAD)
+    elapsed = time.perf_counter() - start
+    print(f"{name:10s} {MESSAGES / elapsed:12,.0f} msg/s ({elapsed / MESSAGES * 1e6:.2f} us/msg)")
+
+
+def main() -> None:
+    """Run both decoding paths and print messages/sec."""
+    _run("previous", _previous_path)
+    _run("decoder", _new_path)
+    start = time.perf_counter()
+    for _ in range(MESSAGES):
+        PAYLOAD.decode()  # raw subscribers (decoder=None) skip even this
+    elapsed = time.perf_counter() - start
+    print(f"{'raw':10s} {MESSAGES / elapsed:12,.0f} msg/s (decoder=None, no parsing)")
+
+
+if __name__ == "__main__":
+    main()
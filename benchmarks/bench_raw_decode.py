@@ -0,0 +1,92 @@
+"""Benchmark: rawMessage decoding, straightforward path vs decode_raw_status.
+
+The raw stream carries every mesh access message, most of them not light
+status. The straightforward path parses every field of every message before
+looking at the opcode; decode_raw_status looks at the opcode first and only
+unpacks the payload of the three status opcodes.
+
+    python benchmarks/bench_raw_decode.py
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import homeassistant  # noqa: F401
+except ImportError:
+    import conftest  # noqa: F401  # installs Home Assistant mocks
+
+from custom_components.hafele_local_mqtt.payload import decode_raw_status
+
+MESSAGES = 200_000
+
+
+def _message(opcode: str, payload: str) -> bytes:
+    return json.dumps(
+        {
+            "source": "0x00a3",
+            "destination": "0xc000",
+            "opcode": opcode,
+            "payload": payload,
+            "sequence_number": 123456,
+            "ttl": 5,
+            "rssi": -71,
+        }
+    ).encode()
+
+
+# One light status in four messages - the rest is other mesh traffic
+STREAM = [
+    _message("824E", "ff7f"),
+    _message("8201", "0105"),  # Generic OnOff Set
+    _message("8260", "ffff8c0a"),
+    _message("5b", "0011223344"),  # vendor message
+    _message("8204", "000105"),
+    _message("824C", "ff7f0a"),  # Light Lightness Set
+    _message("8202", "01"),  # Generic OnOff Set Unacknowledged
+    _message("8203", ""),  # Generic Level Get
+]
+
+
+def _straightforward_path(raw: bytes) -> dict | None:
+    """Parse every field, then decide by opcode."""
+    obj = json.loads(raw)
+    source = int(obj["source"], 16)
+    destination = int(obj["destination"], 16)
+    opcode = int(obj["opcode"], 16)
+    data = bytes.fromhex(obj["payload"])
+    if opcode == 0x8204:
+        return {"source": source, "destination": destination, "onoff": data[-2 if len(data) >= 3 else 0]}
+    if opcode == 0x824E:
+        offset = 2 if len(data) >= 5 else 0
+        return {"source": source, "lightness": struct.unpack("<H", data[offset:offset + 2])[0] / 65535}
+    if opcode == 0x8260:
+        offset = 4 if len(data) >= 9 else 0
+        lightness, temperature = struct.unpack("<HH", data[offset:offset + 4])
+        return {"source": source, "lightness": lightness / 65535, "temperature": temperature}
+    return None
+
+
+def _run(name: str, func) -> None:
+    stream = STREAM
+    count = len(stream)
+    start = time.perf_counter()
+    for i in range(MESSAGES):
+        func(stream[i % count])
+    elapsed = time.perf_counter() - start
+    print(f"{name:16s} {MESSAGES / elapsed:12,.0f} msg/s ({elapsed / MESSAGES * 1e6:.2f} us/msg)")
+
+
+def main() -> None:
+    """Run both decoding paths over a mixed raw stream and print messages/sec."""
+    _run("straightforward", _straightforward_path)
+    _run("decoder", decode_raw_status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Microbenchmark: topic dispatch throughput with 10k subscriptions.
+
+Compares the TopicMatcher trie against a linear scan over all filters
+(what exact-match-plus-wildcard-fallback dispatch degenerates to).
+
+    python benchmarks/bench_topic_matcher.py
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import homeassistant  # noqa: F401
+except ImportError:
+    import conftest  # noqa: F401  # installs Home Assistant mocks
+
+from custom_components.hafele_local_mqtt.topic_matcher import TopicMatcher
+
+FILTERS = 10_000
+MESSAGES = 50_000
+
+
+def _linear_matches(topic_filter: str, topic: str) -> bool:
+    """Reference MQTT filter match used for the linear-scan baseline."""
+    filter_levels = topic_filter.split("/")
+    topic_levels = topic.split("/")
+    for index, level in enumerate(filter_levels):
+        if level == "#":
+            return True
+        if index >= len(topic_levels):
+            return False
+        if level != "+" and level != topic_levels[index]:
+            return False
+    return len(filter_levels) == len(topic_levels)
+
+
+def main() -> None:
+    """Run the benchmark and print messages/sec for both dispatchers."""
+    filters = [f"hafele/lights/device_{i}/status" for i in range(FILTERS - 3)]
+    filters += ["hafele/lights/+/status", "hafele/groups/+/status", "hafele/#"]
+    topics = [
+        f"hafele/lights/device_{random.randrange(FILTERS)}/status" for _ in range(MESSAGES)
+    ]
+
+    matcher = TopicMatcher()
+    for topic_filter in filters:
+        matcher.add(topic_filter, print)
+
+    start = time.perf_counter()
+    trie_hits = sum(len(matcher.match(topic)) for topic in topics)
+    trie_elapsed = time.perf_counter() - start
+
+    linear_topics = topics[: MESSAGES // 50]
+    start = time.perf_counter()
+    linear_hits = sum(
+        1 for topic in linear_topics for f in filters if _linear_matches(f, topic)
+    )
+    linear_elapsed = time.perf_counter() - start
+
+    print(f"filters: {len(filters)}")
+    print(
+        f"trie:   {MESSAGES / trie_elapsed:12,.0f} msg/s "
+        f"({trie_elapsed / MESSAGES * 1e6:.2f} us/msg, {trie_hits} callbacks)"
+    )
+    print(
+        f"linear: {len(linear_topics) / linear_elapsed:12,.0f} msg/s "
+        f"({linear_elapsed / len(linear_topics) * 1e6:.2f} us/msg, {linear_hits} callbacks)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -34,13 +34,24 @@ if "homeassistant" not in sys.modules:
     mock_ha.components = Mock()
     mock_ha.components.light = Mock()
     mock_ha.components.light.ColorMode = Mock()
-    _LightEntityBase = type("LightEntity", (), {"async_write_ha_state": Mock()})
+    _LightEntityBase = type(
+        "LightEntity",
+        (),
+        {
+            "async_write_ha_state": Mock(),
+            "hass": None,
+            "unique_id": property(lambda self: getattr(self, "_attr_unique_id", None)),
+        },
+    )
     mock_ha.components.light.LightEntity = _LightEntityBase
     mock_ha.components.light.ATTR_BRIGHTNESS = "brightness"
     mock_ha.components.light.ATTR_COLOR_TEMP_KELVIN = "color_temp_kelvin"
+    mock_ha.components.light.ATTR_TRANSITION = "transition"
     mock_ha.components.light.COLOR_MODE_COLOR_TEMP = "color_temp"
     mock_ha.components.button = Mock()
-    mock_ha.components.button.ButtonEntity = type("ButtonEntity", (), {})
+    mock_ha.components.button.ButtonEntity = type("ButtonEntity", (), {"hass": None})
+    mock_ha.components.scene = Mock()
+    mock_ha.components.scene.Scene = type("Scene", (), {})
     mock_ha.components.mqtt = Mock()
     mock_ha.components.mqtt.is_connected = Mock(return_value=True)
     mock_ha.components.mqtt.async_subscribe = Mock()
@@ -56,6 +67,9 @@ if "homeassistant" not in sys.modules:
         def __init__(self, coordinator=None, *args, **kwargs):
             self.coordinator = coordinator
 
+        async def async_will_remove_from_hass(self):
+            pass
+
     class _DataUpdateCoordinator:
         def __init__(self, hass=None, logger=None, name=None, update_interval=None, *args, **kwargs):
             self.hass = hass
@@ -66,6 +80,9 @@ if "homeassistant" not in sys.modules:
             self.async_set_updated_data = Mock()
             self.async_request_refresh = Mock()
 
+        async def _async_shutdown(self):
+            pass
+
     mock_ha.helpers.update_coordinator = Mock()
     mock_ha.helpers.update_coordinator.DataUpdateCoordinator = _DataUpdateCoordinator
     mock_ha.helpers.update_coordinator.CoordinatorEntity = _CoordinatorEntity
@@ -78,6 +95,7 @@ if "homeassistant" not in sys.modules:
     mock_ha.helpers.entity.DeviceInfo = _DeviceInfo
     mock_ha.helpers.entity_platform = Mock()
     mock_ha.helpers.entity_platform.AddEntitiesCallback = Mock()
+    mock_ha.helpers.dispatcher = Mock()
     mock_ha.data_entry_flow = Mock()
     mock_ha.data_entry_flow.FlowResultType = Mock()
     mock_ha.data_entry_flow.FlowResultType.FORM = "form"
@@ -93,10 +111,12 @@ if "homeassistant" not in sys.modules:
         ("homeassistant.components", mock_ha.components),
         ("homeassistant.components.light", mock_ha.components.light),
         ("homeassistant.components.button", mock_ha.components.button),
+        ("homeassistant.components.scene", mock_ha.components.scene),
         ("homeassistant.components.mqtt", mock_ha.components.mqtt),
         ("homeassistant.helpers.update_coordinator", mock_ha.helpers.update_coordinator),
         ("homeassistant.helpers.entity", mock_ha.helpers.entity),
         ("homeassistant.helpers.entity_platform", mock_ha.helpers.entity_platform),
+        ("homeassistant.helpers.dispatcher", mock_ha.helpers.dispatcher),
         ("homeassistant.data_entry_flow", mock_ha.data_entry_flow),
     ]:
         sys.modules[name] = mod
@@ -2,18 +2,43 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN, DEFAULT_POLLING_MODE, CONF_POLLING_MODE, DEFAULT_POLLING_INTERVAL, DEFAULT_POLLING_TIMEOUT
+from .const import (
+    DOMAIN,
+    DEFAULT_POLLING_MODE,
+    CONF_POLLING_MODE,
+    CONF_POLLING_WINDOW,
+    CONF_MAX_POLLING_INTERVAL,
+    DEFAULT_MAX_POLLING_INTERVAL,
+    CONF_MIN_POLLING_TIMEOUT,
+    DEFAULT_MIN_POLLING_TIMEOUT,
+    CONF_MAX_POLLING_TIMEOUT,
+    DEFAULT_MAX_POLLING_TIMEOUT,
+    DEFAULT_POLLING_WINDOW,
+    DEFAULT_POLLING_INTERVAL,
+    DEFAULT_POLLING_TIMEOUT,
+    CONF_COMMAND_COALESCE_WINDOW,
+    DEFAULT_COMMAND_COALESCE_WINDOW,
+    CONF_MESH_MESSAGE_RATE,
+    DEFAULT_MESH_MESSAGE_RATE,
+    CONF_MQTT_PERSISTENT_SESSION,
+    CONF_SINGLE_MESSAGE_TURN_ON,
+    CONF_ENABLE_GROUPS,
+    CONF_ENABLE_SCENES,
+    CONF_RAW_MESSAGE_TRACKING,
+)
 from .mqtt_client import HafeleMQTTClient
 from .discovery import HafeleDiscovery
+from .polling import RefreshSweep
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.LIGHT, Platform.BUTTON]
+PLATFORMS: list[Platform] = [Platform.LIGHT, Platform.BUTTON, Platform.SCENE]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -24,7 +49,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     topic_prefix = entry.data.get("topic_prefix", "hafele")
     polling_interval = entry.data.get("polling_interval", DEFAULT_POLLING_INTERVAL)
     polling_timeout = entry.data.get("polling_timeout", DEFAULT_POLLING_TIMEOUT)
+    min_polling_timeout = entry.data.get(CONF_MIN_POLLING_TIMEOUT, DEFAULT_MIN_POLLING_TIMEOUT)
+    max_polling_timeout = entry.data.get(CONF_MAX_POLLING_TIMEOUT, DEFAULT_MAX_POLLING_TIMEOUT)
     polling_mode = entry.data.get(CONF_POLLING_MODE, DEFAULT_POLLING_MODE)
+    polling_window = entry.data.get(CONF_POLLING_WINDOW, DEFAULT_POLLING_WINDOW)
+    max_polling_interval = entry.data.get(
+        CONF_MAX_POLLING_INTERVAL, DEFAULT_MAX_POLLING_INTERVAL
+    )
+    coalesce_window = entry.data.get(
+        CONF_COMMAND_COALESCE_WINDOW, DEFAULT_COMMAND_COALESCE_WINDOW
+    )
+    mesh_message_rate = entry.data.get(CONF_MESH_MESSAGE_RATE, DEFAULT_MESH_MESSAGE_RATE)
+    single_message_turn_on = entry.data.get(CONF_SINGLE_MESSAGE_TURN_ON, False)
+    enable_groups = entry.data.get(CONF_ENABLE_GROUPS, True)
+    enable_scenes = entry.data.get(CONF_ENABLE_SCENES, True)
+    raw_message_tracking = entry.data.get(CONF_RAW_MESSAGE_TRACKING, False)
     
     # Get MQTT broker configuration
     use_ha_mqtt = entry.data.get("use_ha_mqtt", True)
@@ -32,6 +71,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     mqtt_port = entry.data.get("mqtt_port", 1883) if not use_ha_mqtt else 1883
     mqtt_username = entry.data.get("mqtt_username") if not use_ha_mqtt else None
     mqtt_password = entry.data.get("mqtt_password") if not use_ha_mqtt else None
+    persistent_session = entry.data.get(CONF_MQTT_PERSISTENT_SESSION, False)
 
     # Initialize MQTT client
     mqtt_client = HafeleMQTTClient(
@@ -41,13 +81,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         port=mqtt_port,
         username=mqtt_username,
         password=mqtt_password,
+        coalesce_window=coalesce_window,
+        mesh_message_rate=mesh_message_rate,
+        client_id=f"{DOMAIN}_{entry.entry_id}",
+        persistent_session=persistent_session,
     )
     await mqtt_client.async_connect()
 
     # Initialize discovery
-    discovery = HafeleDiscovery(hass, mqtt_client, topic_prefix)
+    discovery = HafeleDiscovery(hass, mqtt_client, topic_prefix, entry.entry_id)
     await discovery.async_start()
 
+    # Light coordinators by device address, filled in by the light platform
+    coordinators: dict[int, Any] = {}
+
     # Store in hass data
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
@@ -56,7 +103,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "topic_prefix": topic_prefix,
         "polling_interval": polling_interval,
         "polling_timeout": polling_timeout,
+        "polling_timeout_bounds": (min_polling_timeout, max_polling_timeout),
+        # Addresses of lights that stopped answering polls (see light.py)
+        "unreachable_devices": set(),
         "polling_mode": polling_mode,
+        "polling_window": polling_window,
+        "max_polling_interval": max_polling_interval,
+        "single_message_turn_on": single_message_turn_on,
+        "enable_groups": enable_groups,
+        "enable_scenes": enable_scenes,
+        "raw_message_tracking": raw_message_tracking,
+        "coordinators": coordinators,
+        # Refreshes the lights a scene recall changed, in one sweep
+        "refresh_sweep": RefreshSweep(coordinators, polling_window),
     }
 
     # Forward setup to platforms
@@ -75,6 +134,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok:
         # Clean up
         data = hass.data[DOMAIN].pop(entry.entry_id)
+        refresh_sweep = data.get("refresh_sweep")
+        if refresh_sweep:
+            await refresh_sweep.async_stop()
         discovery = data.get("discovery")
         if discovery:
             await discovery.async_stop()
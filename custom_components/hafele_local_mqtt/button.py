@@ -1,16 +1,19 @@
 """Button platform for Hafele Local MQTT."""
 from __future__ import annotations
 
+import asyncio
 import logging
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, EVENT_DEVICES_UPDATED
+from .const import DOMAIN
 from .debugbutton import HafelePingButton
-from .discovery import HafeleDiscovery
+from .discovery import DeviceDelta, HafeleDiscovery
 from .mqtt_client import HafeleMQTTClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -27,15 +30,18 @@ async def async_setup_entry(
     discovery: HafeleDiscovery = data["discovery"]
     topic_prefix = data["topic_prefix"]
 
-    # Track which entities we've already created in this session
-    created_entities: set[tuple[int, str]] = set()  # (device_addr, button_type)
+    # Entities we've already created in this session, by (device_addr, button_type)
+    created_entities: dict[tuple[int, str], HafelePingButton] = {}
     
     # Get entity registry to check for existing entities
     entity_registry = er.async_get(hass)
 
-    async def _create_entities_for_devices() -> None:
-        """Create button entities for all discovered light devices."""
-        devices = discovery.get_all_devices()
+    async def _create_entities_for_devices(
+        devices: dict[int, dict[str, Any]] | None = None,
+    ) -> None:
+        """Create button entities for the given (default: all) discovered light devices."""
+        if devices is None:
+            devices = discovery.get_all_devices()
         new_entities = []
 
         for device_addr, device_info in devices.items():
@@ -43,24 +49,14 @@ async def async_setup_entry(
             
             # Only create buttons for light devices
             # Check device_types to ensure this is a light (not a switch, etc.)
-            device_types = device_info.get("device_types", [])
-            # device_types can contain: "light", "multiwhite", "rgb" (case may vary)
-            # If device_types exists, check if it contains any light-related type
-            if device_types:
-                # Check if this is a light type device (case-insensitive check)
-                device_types_lower = [dt.lower() for dt in device_types if isinstance(dt, str)]
-                is_light_device = any(
-                    dtype in ["light", "multiwhite", "rgb"] 
-                    for dtype in device_types_lower
+            if not _is_light_device(device_info):
+                _LOGGER.debug(
+                    "Skipping button creation for device %s (addr: %s) - not a light type (types: %s)",
+                    device_name,
+                    device_addr,
+                    device_info.get("device_types"),
                 )
-                if not is_light_device:
-                    _LOGGER.debug(
-                        "Skipping button creation for device %s (addr: %s) - not a light type (types: %s)",
-                        device_name,
-                        device_addr,
-                        device_types,
-                    )
-                    continue
+                continue
             
             # Create "Ping lightness" button
             lightness_button_id = (device_addr, "lightness")
@@ -87,7 +83,7 @@ async def async_setup_entry(
                     unique_id,
                 )
                 new_entities.append(entity)
-                created_entities.add(lightness_button_id)
+                created_entities[lightness_button_id] = entity
             
             # Create "Ping power" button
             power_button_id = (device_addr, "power")
@@ -114,7 +110,7 @@ async def async_setup_entry(
                     unique_id,
                 )
                 new_entities.append(entity)
-                created_entities.add(power_button_id)
+                created_entities[power_button_id] = entity
 
         if new_entities:
             _LOGGER.info("Adding %d button entities", len(new_entities))
@@ -139,16 +135,71 @@ async def async_setup_entry(
             # Add all entities - Home Assistant will handle duplicates gracefully
             async_add_entities(new_entities, update_before_add=False)
 
+    async def _async_remove_buttons(device_addr: int) -> None:
+        """Remove the ping buttons of a light the gateway no longer lists.
+
+        Their registry entries are kept for when the light is listed again.
+        """
+        for button_type in ("lightness", "power"):
+            entity = created_entities.pop((device_addr, button_type), None)
+            if entity is not None and entity.hass is not None:
+                await entity.async_remove()
+
+    def _update_buttons(device_addr: int, device_info: dict[str, Any]) -> bool:
+        """Apply changed discovery info to a light's buttons in place; False if it has none."""
+        entities = [
+            created_entities[(device_addr, button_type)]
+            for button_type in ("lightness", "power")
+            if (device_addr, button_type) in created_entities
+        ]
+        device_name = device_info.get("device_name", f"device_{device_addr}")
+        for entity in entities:
+            entity.update_device_info(device_info, device_name)
+        return len(entities) == 2
+
+    # Deltas are applied one at a time, in order
+    entities_lock = asyncio.Lock()
+
+    async def _async_apply_devices_delta(delta: DeviceDelta) -> None:
+        """Create buttons for added lights, update changed ones in place, remove removed ones."""
+        async with entities_lock:
+            new_devices = dict(delta.added)
+            for device_addr in delta.removed:
+                await _async_remove_buttons(device_addr)
+            for device_addr, device_info in delta.changed.items():
+                if not _is_light_device(device_info):
+                    await _async_remove_buttons(device_addr)
+                elif not _update_buttons(device_addr, device_info):
+                    # Buttons missing so far are created (or skipped for non-lights)
+                    new_devices[device_addr] = device_info
+            await _create_entities_for_devices(new_devices)
+
+    async def _async_create_all_entities() -> None:
+        """Create buttons for every discovered light not set up yet."""
+        async with entities_lock:
+            await _create_entities_for_devices()
+
     @callback
-    def _on_devices_updated(event) -> None:
-        """Handle device discovery update event."""
-        hass.async_create_task(_create_entities_for_devices())
+    def _on_devices_delta(delta: DeviceDelta) -> None:
+        """Handle the lights discovery delta of this entry."""
+        hass.async_create_task(_async_apply_devices_delta(delta))
 
     # Listen for device discovery updates
     entry.async_on_unload(
-        hass.bus.async_listen(EVENT_DEVICES_UPDATED, _on_devices_updated)
+        async_dispatcher_connect(hass, discovery.devices_signal, _on_devices_delta)
     )
 
     # Create entities for any devices already discovered
-    await _create_entities_for_devices()
+    await _async_create_all_entities()
+
 
+def _is_light_device(device_info: dict[str, Any]) -> bool:
+    """Return True unless the device's types say it isn't a light."""
+    device_types = device_info.get("device_types", [])
+    # device_types can contain: "light", "multiwhite", "rgb" (case may vary)
+    # If device_types exists, check if it contains any light-related type
+    if not device_types:
+        return True
+    # Check if this is a light type device (case-insensitive check)
+    device_types_lower = [dt.lower() for dt in device_types if isinstance(dt, str)]
+    return any(dtype in ["light", "multiwhite", "rgb"] for dtype in device_types_lower)
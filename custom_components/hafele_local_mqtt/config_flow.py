@@ -13,25 +13,42 @@ from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 
 from .const import (
+    CONF_COMMAND_COALESCE_WINDOW,
     CONF_ENABLE_GROUPS,
     CONF_ENABLE_SCENES,
+    CONF_RAW_MESSAGE_TRACKING,
+    CONF_MAX_POLLING_INTERVAL,
+    CONF_MAX_POLLING_TIMEOUT,
+    CONF_MESH_MESSAGE_RATE,
+    CONF_MIN_POLLING_TIMEOUT,
     CONF_MQTT_BROKER,
     CONF_MQTT_PASSWORD,
+    CONF_MQTT_PERSISTENT_SESSION,
     CONF_MQTT_PORT,
     CONF_MQTT_USERNAME,
     CONF_POLLING_INTERVAL,
     CONF_POLLING_MODE,
     CONF_POLLING_TIMEOUT,
+    CONF_POLLING_WINDOW,
+    CONF_SINGLE_MESSAGE_TURN_ON,
     CONF_TOPIC_PREFIX,
     CONF_USE_HA_MQTT,
+    DEFAULT_COMMAND_COALESCE_WINDOW,
+    DEFAULT_MAX_POLLING_INTERVAL,
+    DEFAULT_MAX_POLLING_TIMEOUT,
+    DEFAULT_MIN_POLLING_TIMEOUT,
+    DEFAULT_MESH_MESSAGE_RATE,
     DEFAULT_MQTT_PORT,
     DEFAULT_POLLING_INTERVAL,
     DEFAULT_POLLING_MODE,
     DEFAULT_POLLING_TIMEOUT,
+    DEFAULT_POLLING_WINDOW,
     DEFAULT_TOPIC_PREFIX,
     DOMAIN,
     POLLING_MODE_NORMAL,
     POLLING_MODE_ROTATIONAL,
+    POLLING_MODE_WINDOWED,
+    POLLING_MODE_GROUP_SWEEP,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -45,18 +62,46 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
         ),
         vol.Optional(CONF_MQTT_USERNAME): str,
         vol.Optional(CONF_MQTT_PASSWORD): str,
+        vol.Optional(CONF_MQTT_PERSISTENT_SESSION, default=False): bool,
         vol.Optional(CONF_TOPIC_PREFIX, default=DEFAULT_TOPIC_PREFIX): str,
         vol.Optional(
             CONF_POLLING_INTERVAL, default=DEFAULT_POLLING_INTERVAL
         ): vol.All(vol.Coerce(int), vol.Range(min=2, max=300)),
+        vol.Optional(
+            CONF_MAX_POLLING_INTERVAL, default=DEFAULT_MAX_POLLING_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
         vol.Optional(
             CONF_POLLING_TIMEOUT, default=DEFAULT_POLLING_TIMEOUT
         ): vol.All(vol.Coerce(int), vol.Range(min=1, max=30)),
+        vol.Optional(
+            CONF_MIN_POLLING_TIMEOUT, default=DEFAULT_MIN_POLLING_TIMEOUT
+        ): vol.All(vol.Coerce(float), vol.Range(min=0.02, max=5)),
+        vol.Optional(
+            CONF_MAX_POLLING_TIMEOUT, default=DEFAULT_MAX_POLLING_TIMEOUT
+        ): vol.All(vol.Coerce(float), vol.Range(min=1, max=60)),
         vol.Optional(
             CONF_POLLING_MODE, default=DEFAULT_POLLING_MODE
-        ): vol.In([POLLING_MODE_NORMAL, POLLING_MODE_ROTATIONAL]),
+        ): vol.In(
+            [
+                POLLING_MODE_NORMAL,
+                POLLING_MODE_ROTATIONAL,
+                POLLING_MODE_WINDOWED,
+                POLLING_MODE_GROUP_SWEEP,
+            ]
+        ),
+        vol.Optional(
+            CONF_POLLING_WINDOW, default=DEFAULT_POLLING_WINDOW
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+        vol.Optional(
+            CONF_COMMAND_COALESCE_WINDOW, default=DEFAULT_COMMAND_COALESCE_WINDOW
+        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=2)),
+        vol.Optional(
+            CONF_MESH_MESSAGE_RATE, default=DEFAULT_MESH_MESSAGE_RATE
+        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+        vol.Optional(CONF_SINGLE_MESSAGE_TURN_ON, default=False): bool,
         vol.Optional(CONF_ENABLE_GROUPS, default=True): bool,
         vol.Optional(CONF_ENABLE_SCENES, default=True): bool,
+        vol.Optional(CONF_RAW_MESSAGE_TRACKING, default=False): bool,
     }
 )
 
@@ -12,7 +12,21 @@ TOPIC_SCENES = "scenes"
 
 # Polling Configuration
 DEFAULT_POLLING_INTERVAL = 30  # seconds
-DEFAULT_POLLING_TIMEOUT = 3  # seconds
+DEFAULT_POLLING_TIMEOUT = 3  # seconds, until a light's response time has been measured
+# Each light derives its own timeout from its measured response times, within these bounds
+DEFAULT_MIN_POLLING_TIMEOUT = 0.1  # seconds
+DEFAULT_MAX_POLLING_TIMEOUT = 10  # seconds
+# Adaptive polling: a light whose status stays unchanged is polled less and less
+# often, up to this interval; any change or command snaps it back (0 disables)
+DEFAULT_MAX_POLLING_INTERVAL = 600  # seconds
+# Lights that reliably push their status changes (e.g. wall switches reported by the
+# gateway) are only polled as a heartbeat
+PUSH_HEARTBEAT_INTERVAL = 1800  # seconds
+PUSH_RELIABLE_CHANGES = 3  # pushed changes in a row, none missed, to count as reliable
+# Lights missing this many polls in a row are marked unavailable and polled with
+# exponential backoff, until they answer or push a status again
+UNREACHABLE_AFTER_TIMEOUTS = 3
+UNREACHABLE_MAX_POLL_INTERVAL = 3600  # seconds
 
 # MQTT Topic Patterns - Verified against API documentation
 # Reference: https://help.connect-mesh.io/mqtt/index.html
@@ -47,17 +61,52 @@ TOPIC_SCENE_ACTIVATE = "{prefix}/scenes/{scene_name}/activate"  # Operation ID:
 TOPIC_DEVICE_STATUS = "{prefix}/lights/{device_name}/status"  # lightStatus
 TOPIC_GROUP_STATUS = "{prefix}/groups/{group_name}/status"  # groupStatus (Operation ID: groupStatus)
 
+# Raw mesh access messages (RECEIVE rawMessages / SEND sendRawMessage)
+TOPIC_RAW_MESSAGE = "{prefix}/rawMessage"
+TOPIC_RAW_MESSAGE_SEND = "{prefix}/rawMessage/send"
+
+# Bluetooth mesh opcodes: Light Lightness Get (sent to group addresses for whole-room
+# refreshes) and the status opcodes decoded from the rawMessage stream
+OPCODE_LIGHT_LIGHTNESS_GET = 0x824B
+OPCODE_GENERIC_ONOFF_STATUS = 0x8204
+OPCODE_LIGHT_LIGHTNESS_STATUS = 0x824E
+OPCODE_LIGHT_CTL_STATUS = 0x8260
+
+# Wildcard status filters - one broker subscription per kind, routed in-process by name
+TOPIC_ALL_DEVICE_STATUS = "{prefix}/lights/+/status"
+TOPIC_ALL_GROUP_STATUS = "{prefix}/groups/+/status"
+
 # Configuration keys
 CONF_TOPIC_PREFIX = "topic_prefix"
 CONF_POLLING_INTERVAL = "polling_interval"
 CONF_POLLING_TIMEOUT = "polling_timeout"
+CONF_MIN_POLLING_TIMEOUT = "min_polling_timeout"
+CONF_MAX_POLLING_TIMEOUT = "max_polling_timeout"
 CONF_POLLING_MODE = "polling_mode"
+CONF_POLLING_WINDOW = "polling_window"
+CONF_MAX_POLLING_INTERVAL = "max_polling_interval"
 CONF_ENABLE_GROUPS = "enable_groups"
+CONF_SINGLE_MESSAGE_TURN_ON = "single_message_turn_on"
 CONF_ENABLE_SCENES = "enable_scenes"
+CONF_RAW_MESSAGE_TRACKING = "raw_message_tracking"
+
+# Outbound command coalescing: publishes to the same lights/{device}/power|lightness|ctl
+# topic within this window collapse to the latest value (0 disables coalescing)
+CONF_COMMAND_COALESCE_WINDOW = "command_coalesce_window"
+DEFAULT_COMMAND_COALESCE_WINDOW = 0.25  # seconds
+COALESCED_COMMAND_TOPICS = ("power", "lightness", "ctl", "temperature")
+
+# Mesh airtime budget: messages/sec shared by commands, verification GETs and polls
+CONF_MESH_MESSAGE_RATE = "mesh_message_rate"
+DEFAULT_MESH_MESSAGE_RATE = 8.0  # messages per second (0 disables limiting)
+DEFAULT_MESH_BACKLOG_LIMIT = 50  # queued publishes before low-priority traffic is shed
 
 # Polling modes
 POLLING_MODE_NORMAL = "normal"  # Each device polls independently
 POLLING_MODE_ROTATIONAL = "rotational"  # One device at a time in rotation - use at big networks (>5 lights)
+POLLING_MODE_WINDOWED = "windowed"  # Sweeps with up to polling_window GETs in flight
+POLLING_MODE_GROUP_SWEEP = "group_sweep"  # Windowed sweeps with one GET per group, device GETs only on disagreement
+DEFAULT_POLLING_WINDOW = 4  # status GETs in flight at once in windowed mode
 DEFAULT_POLLING_MODE = POLLING_MODE_NORMAL
 
 # MQTT Broker Configuration (optional - uses HA MQTT if not provided)
@@ -66,10 +115,33 @@ CONF_MQTT_PORT = "mqtt_port"
 CONF_MQTT_USERNAME = "mqtt_username"
 CONF_MQTT_PASSWORD = "mqtt_password"
 CONF_USE_HA_MQTT = "use_ha_mqtt"  # Use Home Assistant's MQTT integration
+CONF_MQTT_PERSISTENT_SESSION = "mqtt_persistent_session"  # clean_session off, broker keeps subscriptions
 
 # Default MQTT broker settings
 DEFAULT_MQTT_PORT = 1883
 
+# Direct-broker reconnect backoff (exponential with jitter)
+MQTT_RECONNECT_MIN_DELAY = 1  # seconds
+MQTT_RECONNECT_MAX_DELAY = 60  # seconds
+
+# Post-command verification: wait for the light to settle, then ask for its status
+# unless it already reported the commanded state on its own
+VERIFY_DEFAULT_DELAY = 5.0  # seconds, when no transition time was requested
+VERIFY_SETTLE_DELAY = 1.0  # seconds added to a requested transition time
+# Single-message turn_on (monochrome lights, opt-in): lightness > 0 turns a light on by
+# itself, so the power message is skipped. The first verification answers whether the
+# light really turned on; a light that didn't gets power + lightness again.
+SINGLE_MESSAGE_VERIFY_TIMEOUT = 30.0  # seconds to wait for the verification answer
+
+# Gateway-side transitions: lightness/ctl commands carry a transition_time
+MAX_TRANSITION_TIME = 372000  # deciseconds (API limit)
+
+# Group command planning: light commands arriving within this window (the entity
+# calls of one multi-entity service call) are covered by group commands
+GROUP_PLANNER_WINDOW = 0.01  # seconds
+
 # Event names
 EVENT_DEVICES_UPDATED = "hafele_local_mqtt_devices_updated"
+# Dispatcher signal (per config entry) carrying a DeviceDelta of the discovered lights
+SIGNAL_DEVICES_DELTA = "hafele_local_mqtt_devices_delta_{entry_id}"
 
@@ -14,6 +14,7 @@ from .const import (
     TOPIC_GET_DEVICE_POWER,
 )
 from .mqtt_client import HafeleMQTTClient
+from .rate_limiter import PublishPriority
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,23 +41,32 @@ class HafelePingButton(ButtonEntity):
         """Initialize the button."""
         self.mqtt_client = mqtt_client
         self.device_addr = device_addr
-        self.device_info = device_info
-        self.device_name = device_name
         self.topic_prefix = topic_prefix
         self.button_type = button_type
         self._attr_unique_id = unique_id
         self._attr_name = button_name
         self._attr_has_entity_name = True
+        self._apply_device_info(device_info, device_name)
 
+    def _apply_device_info(self, device_info: dict[str, Any], device_name: str) -> None:
+        """Set the light's discovery info, name and device info."""
+        self.device_info = device_info
+        self.device_name = device_name
         # Device info - link to the light device
         # Use the same identifier format as the light entity
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, str(device_addr))},
+            identifiers={(DOMAIN, str(self.device_addr))},
             name=device_name,
             manufacturer="Hafele",
             model="Local MQTT Light",
         )
 
+    def update_device_info(self, device_info: dict[str, Any], device_name: str) -> None:
+        """Take changed discovery info in place, keeping the entity and its registry entry."""
+        self._apply_device_info(device_info, device_name)
+        if self.hass is not None:
+            self.async_write_ha_state()
+
     async def async_press(self) -> None:
         """Handle the button press."""
         if self.button_type == "lightness":
@@ -89,5 +99,8 @@ class HafelePingButton(ButtonEntity):
             return
 
         # Publish empty payload to request status
-        await self.mqtt_client.async_publish(topic, {}, qos=1)
+        # User-requested GET: ahead of background polls, behind commands
+        await self.mqtt_client.async_publish(
+            topic, {}, qos=1, priority=PublishPriority.VERIFY
+        )
         _LOGGER.info("Sent %s get request for device %s", self.button_type, self.device_addr)
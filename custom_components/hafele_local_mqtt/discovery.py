@@ -1,35 +1,81 @@
 """Device discovery for Hafele Local MQTT."""
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 import inspect
-import json
 import logging
 from typing import Any, Callable
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 
 from .const import (
     EVENT_DEVICES_UPDATED,
+    SIGNAL_DEVICES_DELTA,
     TOPIC_DISCOVERY_GROUPS,
     TOPIC_DISCOVERY_LIGHTS,
     TOPIC_DISCOVERY_SCENES,
 )
 from .mqtt_client import HafeleMQTTClient
+from .payload import PayloadDecodeError, decode_discovery_list
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def scene_display_name(scene: dict[str, Any]) -> str | None:
+    """Return a discovered scene's name (the one used in its activate topic)."""
+    return scene.get("scene", scene.get("scene_name"))
+
+
+@dataclass(slots=True)
+class DeviceDelta:
+    """Lights added, changed and removed by one lights discovery message."""
+
+    added: dict[int, dict[str, Any]] = field(default_factory=dict)
+    changed: dict[int, dict[str, Any]] = field(default_factory=dict)
+    # Removed lights with their last known info
+    removed: dict[int, dict[str, Any]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+def diff_devices(
+    old: dict[int, dict[str, Any]], new: dict[int, dict[str, Any]]
+) -> DeviceDelta:
+    """Compare two device_addr -> info snapshots."""
+    delta = DeviceDelta()
+    for device_addr, info in new.items():
+        previous = old.get(device_addr)
+        if previous is None:
+            delta.added[device_addr] = info
+        elif previous != info:
+            delta.changed[device_addr] = info
+    for device_addr, info in old.items():
+        if device_addr not in new:
+            delta.removed[device_addr] = info
+    return delta
+
+
 class HafeleDiscovery:
     """Handle device discovery from MQTT topics."""
 
     def __init__(
-        self, hass: HomeAssistant, mqtt_client: HafeleMQTTClient, topic_prefix: str
+        self,
+        hass: HomeAssistant,
+        mqtt_client: HafeleMQTTClient,
+        topic_prefix: str,
+        entry_id: str | None = None,
     ) -> None:
         """Initialize discovery."""
         self.hass = hass
         self.mqtt_client = mqtt_client
         self.topic_prefix = topic_prefix
+        # Light deltas go to this entry's platforms only
+        self.devices_signal = SIGNAL_DEVICES_DELTA.format(entry_id=entry_id)
+        # Hash of the last lights payload applied, to skip identical republishes
+        self._lights_hash: int | None = None
         self.devices: dict[int, dict[str, Any]] = {}
         self.groups: dict[int, dict[str, Any]] = {}
         self.scenes: dict[int, dict[str, Any]] = {}
@@ -44,17 +90,18 @@ class HafeleDiscovery:
         groups_topic = TOPIC_DISCOVERY_GROUPS.format(prefix=self.topic_prefix)
         scenes_topic = TOPIC_DISCOVERY_SCENES.format(prefix=self.topic_prefix)
 
-        unsub_lights = await self.mqtt_client.async_subscribe(
-            lights_topic, self._on_lights_message
-        )
-        unsub_groups = await self.mqtt_client.async_subscribe(
-            groups_topic, self._on_groups_message
-        )
-        unsub_scenes = await self.mqtt_client.async_subscribe(
-            scenes_topic, self._on_scenes_message
+        # One round-trip for all three discovery topics; the lights list comes
+        # raw so a republished identical list is skipped before decoding
+        unsubscribers = await self.mqtt_client.async_subscribe_many(
+            [
+                (lights_topic, self._on_lights_message, None),
+                (groups_topic, self._on_groups_message),
+                (scenes_topic, self._on_scenes_message),
+            ],
+            decoder=decode_discovery_list,
         )
 
-        self._unsubscribers.extend([unsub_lights, unsub_groups, unsub_scenes])
+        self._unsubscribers.extend(unsubscribers)
 
     async def async_stop(self) -> None:
         """Stop discovery."""
@@ -69,10 +116,15 @@ class HafeleDiscovery:
         _LOGGER.info("Stopped Hafele device discovery")
 
     def _on_lights_message(self, topic: str, payload: Any) -> None:
-        """Handle lights discovery message."""
+        """Handle lights discovery message (the full list of lights)."""
         try:
-            if isinstance(payload, str):
-                lights = json.loads(payload)
+            digest = None
+            if isinstance(payload, (str, bytes)):
+                digest = hash(payload)
+                if digest == self._lights_hash:
+                    _LOGGER.debug("Lights discovery unchanged, skipping")
+                    return
+                lights = decode_discovery_list(payload)
             else:
                 lights = payload
 
@@ -80,32 +132,42 @@ class HafeleDiscovery:
                 _LOGGER.warning("Invalid lights payload format: %s", type(lights))
                 return
 
-            _LOGGER.info("Discovered %d lights", len(lights))
-
+            devices: dict[int, dict[str, Any]] = {}
             for light in lights:
                 device_addr = light.get("device_addr")
                 if device_addr is not None:
-                    self.devices[device_addr] = light
-                    _LOGGER.debug(
-                        "Discovered light: %s (addr: %s)",
-                        light.get("device_name"),
-                        device_addr,
-                    )
-
-            # Notify that devices have been updated
-            # Platforms will check discovery on their next update
-            self.hass.bus.async_fire(EVENT_DEVICES_UPDATED)
+                    devices[device_addr] = light
+
+            delta = diff_devices(self.devices, devices)
+            self.devices.clear()
+            self.devices.update(devices)
+            self._lights_hash = digest
+            if not delta:
+                _LOGGER.debug("Lights discovery unchanged (%d lights)", len(devices))
+                return
 
-        except (json.JSONDecodeError, KeyError, TypeError) as err:
+            _LOGGER.info(
+                "Discovered %d lights (%d added, %d changed, %d removed)",
+                len(devices),
+                len(delta.added),
+                len(delta.changed),
+                len(delta.removed),
+            )
+            # Only this entry's platforms get the delta
+            async_dispatcher_send(self.hass, self.devices_signal, delta)
+
+        except (PayloadDecodeError, KeyError, TypeError, AttributeError) as err:
             _LOGGER.error("Error parsing lights message: %s", err)
 
     def _on_groups_message(self, topic: str, payload: Any) -> None:
         """Handle groups discovery message."""
         try:
-            if isinstance(payload, str):
-                groups = json.loads(payload)
-            else:
-                groups = payload
+            # The client already decoded the payload; raw text is still accepted
+            groups = (
+                decode_discovery_list(payload)
+                if isinstance(payload, (str, bytes))
+                else payload
+            )
 
             if not isinstance(groups, list):
                 _LOGGER.warning("Invalid groups payload format: %s", type(groups))
@@ -126,16 +188,18 @@ class HafeleDiscovery:
             # Notify that groups have been updated
             self.hass.bus.async_fire(EVENT_DEVICES_UPDATED)
 
-        except (json.JSONDecodeError, KeyError, TypeError) as err:
+        except (PayloadDecodeError, KeyError, TypeError, AttributeError) as err:
             _LOGGER.error("Error parsing groups message: %s", err)
 
     def _on_scenes_message(self, topic: str, payload: Any) -> None:
         """Handle scenes discovery message."""
         try:
-            if isinstance(payload, str):
-                scenes = json.loads(payload)
-            else:
-                scenes = payload
+            # The client already decoded the payload; raw text is still accepted
+            scenes = (
+                decode_discovery_list(payload)
+                if isinstance(payload, (str, bytes))
+                else payload
+            )
 
             if not isinstance(scenes, list):
                 _LOGGER.warning("Invalid scenes payload format: %s", type(scenes))
@@ -144,16 +208,20 @@ class HafeleDiscovery:
             _LOGGER.info("Discovered %d scenes", len(scenes))
 
             for scene in scenes:
-                scene_id = scene.get("scene_id")
+                # The API identifies scenes by their (escaped) name; older gateways
+                # also send a scene_id
+                scene_id = scene.get("scene_id", scene.get("scene"))
                 if scene_id is not None:
                     self.scenes[scene_id] = scene
                     _LOGGER.debug(
                         "Discovered scene: %s (id: %s)",
-                        scene.get("scene_name"),
+                        scene_display_name(scene),
                         scene_id,
                     )
 
-        except (json.JSONDecodeError, KeyError, TypeError) as err:
+            self.hass.bus.async_fire(EVENT_DEVICES_UPDATED)
+
+        except (PayloadDecodeError, KeyError, TypeError, AttributeError) as err:
             _LOGGER.error("Error parsing scenes message: %s", err)
 
     def get_device(self, device_addr: int) -> dict[str, Any] | None:
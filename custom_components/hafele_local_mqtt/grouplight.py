@@ -0,0 +1,234 @@
+"""Group light entity for Hafele Local MQTT."""
+from __future__ import annotations
+
+import logging
+import math
+from typing import TYPE_CHECKING, Any, Callable, Mapping
+
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_TRANSITION,
+    ColorMode,
+    LightEntity,
+    LightEntityFeature,
+)
+from homeassistant.helpers.entity import DeviceInfo
+
+from .const import (
+    DOMAIN,
+    TOPIC_SET_GROUP_LIGHTNESS,
+    TOPIC_SET_GROUP_POWER,
+)
+from .mqtt_client import HafeleMQTTClient
+from .payload import encode_transition_time
+
+if TYPE_CHECKING:
+    from .light import HafeleLightCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def group_member_addrs(group_info: dict[str, Any]) -> list[int]:
+    """Return the device addresses of a discovered group."""
+    devices = group_info.get("devices")
+    if not isinstance(devices, list):
+        return []
+    return [addr for addr in devices if isinstance(addr, int)]
+
+
+class HafeleGroupLightEntity(LightEntity):
+    """A Hafele group, controlled with one mesh multicast per command.
+
+    State is derived from the member lights: on if any member is on, brightness
+    the mean of the members that are on. Commands update every member
+    optimistically in one batch; the members' own polling confirms them.
+    """
+
+    _attr_color_mode = ColorMode.BRIGHTNESS
+    _attr_supported_color_modes = {ColorMode.BRIGHTNESS}
+    _attr_supported_features = LightEntityFeature.TRANSITION
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        group_addr: int,
+        group_info: dict[str, Any],
+        coordinators: Mapping[int, HafeleLightCoordinator],
+        mqtt_client: HafeleMQTTClient,
+        topic_prefix: str,
+    ) -> None:
+        """Initialize the group light over a (live) address -> coordinator mapping."""
+        self.group_addr = group_addr
+        self.group_info = group_info
+        self.mqtt_client = mqtt_client
+        self.topic_prefix = topic_prefix
+        # Lights discovered after the group join it as their coordinators appear
+        self._coordinators = coordinators
+        self._group_name = group_info.get("group_name", f"group_{group_addr}")
+        self._attr_unique_id = f"group_{group_addr}_mqtt"
+        self._attr_name = self._group_name
+        # Member coordinators followed so far, with their unsubscribe callbacks
+        self._member_listeners: dict[
+            int, tuple[HafeleLightCoordinator, Callable[[], None]]
+        ] = {}
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"group_{group_addr}")},
+            name=self._attr_name,
+            manufacturer="Hafele",
+            model="Local MQTT Group",
+        )
+
+    def __str__(self) -> str:
+        return f"Group {self._group_name} ({self.group_addr})"
+
+    @property
+    def member_addrs(self) -> list[int]:
+        """Return the device addresses of the group's members."""
+        return group_member_addrs(self.group_info)
+
+    def _member_coordinators(self) -> list[HafeleLightCoordinator]:
+        """Return the coordinators of the members set up so far."""
+        coordinators = self._coordinators
+        return [coordinators[addr] for addr in self.member_addrs if addr in coordinators]
+
+    @property
+    def available(self) -> bool:
+        """Return True unless every known member is unreachable."""
+        members = self._member_coordinators()
+        return not members or any(not c.unreachable for c in members)
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return True if any member is on."""
+        states = [c.data.get("onoff") for c in self._member_coordinators() if c.data]
+        states = [s for s in states if s is not None]
+        if not states:
+            return None
+        return any(states)
+
+    @property
+    def brightness(self) -> int | None:
+        """Return the mean brightness of the members that are on."""
+        values = [
+            c.data["lightness"]
+            for c in self._member_coordinators()
+            if c.data
+            and c.data.get("onoff")
+            and isinstance(c.data.get("lightness"), (int, float))
+        ]
+        if not values:
+            return None
+        return int(sum(values) / len(values) * 255)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the members' state."""
+        await super().async_added_to_hass()
+        self.follow_members()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop following the members' state."""
+        for _, unsub in self._member_listeners.values():
+            unsub()
+        self._member_listeners.clear()
+        await super().async_will_remove_from_hass()
+
+    def follow_members(self) -> None:
+        """Follow the current coordinators of the members (call after lights change).
+
+        Members set up since are followed; members removed or set up again
+        (with a new coordinator) are dropped or moved to their new coordinator.
+        """
+        coordinators = self._coordinators
+        members = set(self.member_addrs)
+        changed = False
+        for addr, (coordinator, unsub) in list(self._member_listeners.items()):
+            if addr not in members or coordinators.get(addr) is not coordinator:
+                unsub()
+                del self._member_listeners[addr]
+                changed = True
+        for addr in members:
+            coordinator = coordinators.get(addr)
+            if coordinator is not None and addr not in self._member_listeners:
+                self._member_listeners[addr] = (
+                    coordinator,
+                    coordinator.async_add_listener(self.async_write_ha_state),
+                )
+                changed = True
+        if changed and self.hass is not None:
+            self.async_write_ha_state()
+
+    def _members_turn_on_from_lightness(self) -> bool:
+        """Return True if every member was seen turning on from a lightness message alone."""
+        coordinators = self._coordinators
+        for addr in self.member_addrs:
+            coordinator = coordinators.get(addr)
+            if coordinator is None or coordinator.entity is None:
+                return False
+            if not coordinator.entity.turns_on_from_lightness:
+                return False
+        return True
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn the group on with one multicast (two for a brightness, unless verified)."""
+        transition_time = encode_transition_time(kwargs.get(ATTR_TRANSITION))
+        power_topic = TOPIC_SET_GROUP_POWER.format(
+            prefix=self.topic_prefix, group_name=self._group_name
+        )
+        _LOGGER.info("%s turned on", self)
+        if ATTR_BRIGHTNESS in kwargs:
+            lightness = math.ceil(kwargs[ATTR_BRIGHTNESS] / 255.0 * 100) / 100.0
+            if not self._members_turn_on_from_lightness():
+                # Some member isn't known to turn on from lightness alone - power first
+                await self.mqtt_client.async_publish(power_topic, True, qos=1)
+            topic = TOPIC_SET_GROUP_LIGHTNESS.format(
+                prefix=self.topic_prefix, group_name=self._group_name
+            )
+            payload: Any = {"lightness": lightness}
+            if transition_time is not None:
+                payload["transition_time"] = transition_time
+            await self.mqtt_client.async_publish(topic, payload, qos=1)
+            optimistic: dict[str, Any] = {"onoff": 1, "lightness": lightness}
+        else:
+            # Same plain boolean payload as the device power command
+            await self.mqtt_client.async_publish(power_topic, True, qos=1)
+            optimistic = {"onoff": 1}
+        self._apply_to_members(optimistic, kwargs.get(ATTR_TRANSITION))
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn the group off with one multicast."""
+        transition_time = encode_transition_time(kwargs.get(ATTR_TRANSITION))
+        if transition_time:
+            # Power has no transition_time - fade out by dimming to 0
+            topic = TOPIC_SET_GROUP_LIGHTNESS.format(
+                prefix=self.topic_prefix, group_name=self._group_name
+            )
+            payload: Any = {"lightness": 0, "transition_time": transition_time}
+        else:
+            topic = TOPIC_SET_GROUP_POWER.format(
+                prefix=self.topic_prefix, group_name=self._group_name
+            )
+            payload = False
+        _LOGGER.info("%s turned off", self)
+        await self.mqtt_client.async_publish(topic, payload, qos=1)
+        self._apply_to_members({"onoff": 0}, kwargs.get(ATTR_TRANSITION))
+
+    def _apply_to_members(self, state: dict[str, Any], transition: float | None) -> None:
+        """Optimistically apply a group command to every member, then write all states.
+
+        All member data is updated before any state is written, so HA sees the
+        whole group change at once. Each member is polled at its floor interval
+        again (after the transition) to confirm.
+        """
+        members = self._member_coordinators()
+        for coordinator in members:
+            if coordinator.data:
+                coordinator.data.update(state)
+            else:
+                coordinator.data = dict(state)
+            coordinator.note_user_command(transition)
+        for coordinator in members:
+            # Members not added to HA yet have nothing to write
+            if coordinator.entity is not None and getattr(coordinator.entity, "hass", None):
+                coordinator.entity.async_write_ha_state()
+        self.async_write_ha_state()
@@ -0,0 +1,275 @@
+"""Group status ingestion and group sweep polling for Hafele Local MQTT."""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+import logging
+from typing import Any, Awaitable, Callable, Mapping
+
+from .const import TOPIC_GET_GROUP_LIGHTNESS
+from .grouplight import group_member_addrs
+from .mqtt_client import HafeleMQTTClient
+from .payload import GroupStatus, decode_group_status
+from .planner import plan_group_cover
+from .polling import WindowedPoller, async_poll_windowed
+from .rate_limiter import PublishPriority
+from .rawstatus import RawStatusTracker
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def group_status_to_light_data(status: GroupStatus) -> dict[str, Any]:
+    """Translate a groupStatus into the fields of a member's lightStatus."""
+    data: dict[str, Any] = {}
+    if status.lightness is not None:
+        data["lightness"] = status.lightness
+        # Same inference as for lightStatus: lightness 0 means off
+        data["onoff"] = 1 if status.lightness > 0 else 0
+    if status.on_off is not None:
+        data["onoff"] = 1 if status.on_off == "on" else 0
+    if status.temperature is not None:
+        data["temperature"] = status.temperature
+    return data
+
+
+class GroupStatusRouter:
+    """Apply every groups/{group}/status to the member lights' coordinators.
+
+    Listens on the client's shared groups/+/status subscription for each
+    discovered group. A member whose known state agrees with the group status
+    counts as freshly polled; members that disagree are reported back (see
+    async_poll_group) so only they need a GET of their own.
+    """
+
+    def __init__(
+        self,
+        mqtt_client: HafeleMQTTClient,
+        groups_provider: Callable[[], Mapping[int, dict[str, Any]]],
+        coordinators: Mapping[int, Any],
+        topic_prefix: str,
+    ) -> None:
+        """Initialize over the discovered groups and a (live) address -> coordinator mapping."""
+        self.mqtt_client = mqtt_client
+        self._groups_provider = groups_provider
+        self._coordinators = coordinators
+        self.topic_prefix = topic_prefix
+        # group_addr -> (group name, listener removal)
+        self._listeners: dict[int, tuple[str, Callable[[], Awaitable[None]]]] = {}
+        self._members: dict[int, frozenset[int]] = {}
+        self._waiters: defaultdict[int, list[asyncio.Future[list[int]]]] = defaultdict(list)
+        self._cover: tuple[list[int], set[int]] | None = None
+
+    async def async_sync(self) -> None:
+        """Follow the currently discovered groups (call again when discovery changes)."""
+        groups = {
+            group_addr: group_info
+            for group_addr, group_info in self._groups_provider().items()
+            if group_info.get("group_name")
+        }
+        for group_addr in [g for g in self._listeners if g not in groups]:
+            _, remove = self._listeners.pop(group_addr)
+            self._members.pop(group_addr, None)
+            await remove()
+        for group_addr, group_info in groups.items():
+            group_name = group_info["group_name"]
+            self._members[group_addr] = frozenset(group_member_addrs(group_info))
+            listener = self._listeners.get(group_addr)
+            if listener is not None and listener[0] == group_name:
+                continue
+            if listener is not None:
+                await listener[1]()
+            remove = await self.mqtt_client.async_add_group_status_listener(
+                group_name, self._group_status_callback(group_addr)
+            )
+            self._listeners[group_addr] = (group_name, remove)
+        self._cover = None
+
+    async def async_stop(self) -> None:
+        """Stop listening for group status."""
+        listeners, self._listeners = self._listeners, {}
+        for _, remove in listeners.values():
+            await remove()
+        for waiters in self._waiters.values():
+            for future in waiters:
+                future.cancel()
+        self._waiters.clear()
+
+    def _group_status_callback(self, group_addr: int) -> Callable[[str, Any], None]:
+        def _on_group_status(topic: str, payload: Any) -> None:
+            self._on_group_status(group_addr, payload)
+
+        return _on_group_status
+
+    def _on_group_status(self, group_addr: int, payload: Any) -> None:
+        """Fan a group status out to the members set up as lights."""
+        try:
+            status = (
+                payload if isinstance(payload, GroupStatus) else decode_group_status(payload)
+            )
+        except (ValueError, TypeError) as err:
+            _LOGGER.error("Error parsing status of group %s: %s", group_addr, err)
+            return
+        data = group_status_to_light_data(status)
+        if not data:
+            return
+        disagreeing = []
+        coordinators = self._coordinators
+        for addr in self._members.get(group_addr, ()):
+            coordinator = coordinators.get(addr)
+            if coordinator is not None and not coordinator.apply_group_status(data):
+                disagreeing.append(addr)
+        _LOGGER.debug(
+            "Group %s status %s applied to %d members, %d disagreed",
+            group_addr,
+            data,
+            len(self._members.get(group_addr, ())),
+            len(disagreeing),
+        )
+        for future in self._waiters.pop(group_addr, ()):
+            if not future.done():
+                future.set_result(disagreeing)
+
+    def cover(self) -> tuple[list[int], set[int]]:
+        """Return the groups covering the lights best, and the lights no group covers."""
+        if self._cover is None:
+            device_groups: defaultdict[int, list[int]] = defaultdict(list)
+            for group_addr, members in self._members.items():
+                for addr in members:
+                    device_groups[addr].append(group_addr)
+            self._cover = plan_group_cover(set(self._coordinators), device_groups, self._members)
+        chosen, leftovers = self._cover
+        covered = set().union(*(self._members[g] for g in chosen))
+        # Lights set up since the cover was computed are polled on their own
+        return chosen, leftovers | (set(self._coordinators) - covered)
+
+    def members(self, group_addr: int) -> frozenset[int]:
+        """Return a group's member addresses."""
+        return self._members.get(group_addr, frozenset())
+
+    async def async_poll_group(self, group_addr: int, timeout: float) -> list[int] | None:
+        """Send one group GET; return the members that disagreed, or None on timeout."""
+        listener = self._listeners.get(group_addr)
+        if listener is None:
+            return None
+        future: asyncio.Future[list[int]] = asyncio.get_running_loop().create_future()
+        self._waiters[group_addr].append(future)
+        topic = TOPIC_GET_GROUP_LIGHTNESS.format(prefix=self.topic_prefix, group_name=listener[0])
+        try:
+            if not await self.mqtt_client.async_publish(
+                topic, {}, qos=1, priority=PublishPriority.POLL
+            ):
+                return None
+            async with asyncio.timeout(timeout):
+                return await future
+        except TimeoutError:
+            _LOGGER.debug("No status for group %s within %.1fs", group_addr, timeout)
+            return None
+        finally:
+            waiters = self._waiters.get(group_addr)
+            if waiters and future in waiters:
+                waiters.remove(future)
+
+
+class GroupSweepPoller(WindowedPoller):
+    """Windowed sweeps that poll rooms by group instead of light by light.
+
+    Each sweep sends one group GET per covering group with a member due, and a
+    device GET only for due members that disagreed with the group status (or
+    all of them if the group didn't answer). Lights no group covers
+    are polled on their own. At most `window` group or device polls are in flight.
+
+    With a raw status tracker, a group whose members are all due is refreshed
+    with one Light Lightness Get to its group address instead, and only the
+    members that don't answer it are polled on their own.
+    """
+
+    def __init__(
+        self,
+        coordinators: Mapping[Any, Any],
+        router: GroupStatusRouter,
+        window: int,
+        polling_interval: float,
+        group_timeout: float,
+        wait_connected: Callable[[], Awaitable[None]] | None = None,
+        raw_tracker: RawStatusTracker | None = None,
+    ) -> None:
+        """Initialize the poller."""
+        super().__init__(coordinators, window, polling_interval, wait_connected)
+        self.router = router
+        self.group_timeout = group_timeout
+        self.raw_tracker = raw_tracker
+        self.group_polls = 0
+        self.device_polls = 0
+
+    async def async_run_sweep(self) -> float:
+        """Poll due lights, by group where possible; return the duration."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        coordinators = self._coordinators
+        slack = self.due_slack
+        due = {
+            addr
+            for addr, c in list(coordinators.items())
+            if c.entity is not None and c.is_poll_due(slack)
+        }
+        chosen, leftovers = self.router.cover()
+        jobs: list[Callable[[], Awaitable[None]]] = [
+            self._group_job(group_addr, due)
+            for group_addr in chosen
+            if self.router.members(group_addr) & due
+        ]
+        jobs.extend(self._device_job([addr]) for addr in leftovers if addr in due)
+        pending = iter(jobs)
+
+        async def _worker() -> None:
+            for job in pending:
+                await job()
+
+        if jobs:
+            await asyncio.gather(*(_worker() for _ in range(min(self.window, len(jobs)))))
+
+        duration = loop.time() - started
+        self.sweep_count += 1
+        self.last_sweep_duration = duration
+        self.last_sweep_size = len(due)
+        _LOGGER.debug(
+            "Group sweep of %d lights took %.2fs (%d group polls, %d device polls so far)",
+            len(due),
+            duration,
+            self.group_polls,
+            self.device_polls,
+        )
+        return duration
+
+    def _group_job(self, group_addr: int, due: set[int]) -> Callable[[], Awaitable[None]]:
+        async def _job() -> None:
+            self.group_polls += 1
+            members = self.router.members(group_addr)
+            if self.raw_tracker is not None and members <= due:
+                # The whole room is due - every member answers one multicast Get
+                coordinators = self._coordinators
+                missing = await self.raw_tracker.async_refresh_group(
+                    group_addr,
+                    [coordinators[addr] for addr in members if addr in coordinators],
+                    self.group_timeout,
+                )
+                await self._device_job([c.device_addr for c in missing])()
+                return
+            disagreeing = await self.router.async_poll_group(group_addr, self.group_timeout)
+            if disagreeing is None:
+                # No answer - fall back to the members' own polls
+                disagreeing = self.router.members(group_addr)
+            # Members not due (held by a transition, freshly pushed, backing off
+            # while unreachable) keep waiting for their own turn
+            await self._device_job([a for a in disagreeing if a in due])()
+
+        return _job
+
+    def _device_job(self, addrs: list[int]) -> Callable[[], Awaitable[None]]:
+        async def _job() -> None:
+            coordinators = self._coordinators
+            polled = [coordinators[addr] for addr in addrs if addr in coordinators]
+            self.device_polls += len(polled)
+            await async_poll_windowed(polled, 1)
+
+        return _job
@@ -7,18 +7,21 @@ import json
 import logging
 import math
 from datetime import timedelta
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
     ColorMode,
     LightEntity,
     ATTR_COLOR_TEMP_KELVIN,
+    ATTR_TRANSITION,
+    LightEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import (
@@ -38,12 +41,34 @@ from .const import (
     TOPIC_SET_DEVICE_LIGHTNESS,
     TOPIC_SET_DEVICE_POWER,
     TOPIC_DEVICE_STATUS,
+    TOPIC_LIGHTS,
     DEFAULT_POLLING_MODE,
+    DEFAULT_MAX_POLLING_INTERVAL,
+    DEFAULT_MAX_POLLING_TIMEOUT,
+    DEFAULT_MIN_POLLING_TIMEOUT,
+    DEFAULT_POLLING_WINDOW,
+    GROUP_PLANNER_WINDOW,
     POLLING_MODE_NORMAL,
     POLLING_MODE_ROTATIONAL,
+    POLLING_MODE_WINDOWED,
+    POLLING_MODE_GROUP_SWEEP,
+    PUSH_HEARTBEAT_INTERVAL,
+    PUSH_RELIABLE_CHANGES,
+    UNREACHABLE_AFTER_TIMEOUTS,
+    UNREACHABLE_MAX_POLL_INTERVAL,
+    SINGLE_MESSAGE_VERIFY_TIMEOUT,
+    VERIFY_DEFAULT_DELAY,
+    VERIFY_SETTLE_DELAY,
 )
-from .discovery import HafeleDiscovery
+from .discovery import DeviceDelta, HafeleDiscovery
 from .mqtt_client import HafeleMQTTClient
+from .grouplight import HafeleGroupLightEntity
+from .groupstatus import GroupStatusRouter, GroupSweepPoller
+from .payload import LightStatus, encode_transition_time
+from .planner import GroupCommandPlanner
+from .polling import AdaptiveInterval, RotationalScheduler, RttEstimator, WindowedPoller
+from .rate_limiter import PublishPriority
+from .rawstatus import RawStatusTracker
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -62,6 +87,12 @@ class HafeleLightCoordinator(DataUpdateCoordinator):
         polling_timeout: int,
         polling_mode: str,
         device_types: list,
+        max_polling_interval: int = 0,
+        polling_timeout_bounds: tuple[float, float] = (
+            DEFAULT_MIN_POLLING_TIMEOUT,
+            DEFAULT_MAX_POLLING_TIMEOUT,
+        ),
+        unreachable_devices: set[int] | None = None,
     ) -> None:
         """Initialize the coordinator."""
         self.mqtt_client = mqtt_client
@@ -71,13 +102,39 @@ class HafeleLightCoordinator(DataUpdateCoordinator):
         self.polling_timeout = polling_timeout
         self.polling_mode = polling_mode
         self._status_data: dict[str, Any] = {}
-        self._status_received = False
+        # Stretches this light's polling interval while its status stays unchanged
+        # and drops to a heartbeat if it reliably pushes its changes
+        self.adaptive_interval = AdaptiveInterval(
+            polling_interval,
+            max_polling_interval,
+            heartbeat=PUSH_HEARTBEAT_INTERVAL,
+            reliable_pushes=PUSH_RELIABLE_CHANGES,
+            backoff_ceiling=UNREACHABLE_MAX_POLL_INTERVAL,
+        )
+        # Unreachable after UNREACHABLE_AFTER_TIMEOUTS missed polls in a row; shared
+        # set of unreachable addresses across the entry's coordinators
+        self.consecutive_timeouts = 0
+        self.unreachable = False
+        self._unreachable_devices = unreachable_devices if unreachable_devices is not None else set()
+        self._status_changed = False
+        # Per-light timeout from measured response times (polling_timeout until measured)
+        self.rtt = RttEstimator(polling_timeout, *polling_timeout_bounds)
+        # Resolved by _on_status_message with the arrival time of the response
+        self._status_waiter: asyncio.Future[float] | None = None
+        # Loop time the last unanswered GET went out; a status arriving within the
+        # longest possible timeout after it is that GET's late answer, not a push
+        self._poll_sent_at: float | None = None
+        # (expected fields, future) pairs of async_wait_for_status callers
+        self._status_matchers: list[tuple[dict[str, Any], asyncio.Future[None]]] = []
+        # Round-trip time of the last answered poll, in milliseconds
+        self.last_poll_latency: float | None = None
         self._unsubscribers: list = []
         self.entity: HafeleLightEntity | None = None  # HaefeleLightEntity
         # Store is_multiwhite from device_info directly (don't wait for entity)
         self.is_multiwhite = any(t.lower() == "multiwhite" for t in device_types)
 
-        # Subscribe to device-specific status topic (use device name as-is, no encoding)
+        # Device-specific status topic (use device name as-is, no encoding)
+        # Delivered through the MQTT client's wildcard status router
         status_topic = TOPIC_DEVICE_STATUS.format(
             prefix=topic_prefix, device_name=device_name
         )
@@ -111,16 +168,15 @@ class HafeleLightCoordinator(DataUpdateCoordinator):
         )
 
     async def _async_setup_subscriptions(self) -> None:
-        """Set up MQTT subscriptions for status responses."""
-        for topic in self.response_topics:
-            unsub = await self.mqtt_client.async_subscribe(
-                topic, self._on_status_message
-            )
-            if unsub:
-                self._unsubscribers.append(unsub)
+        """Register for status responses on the client's shared lights/+/status subscription."""
+        unsub = await self.mqtt_client.async_add_device_status_listener(
+            self._device_name, self._on_status_message
+        )
+        if unsub:
+            self._unsubscribers.append(unsub)
 
-    async def _async_shutdown(self) -> None:
-        """Clean up subscriptions."""
+    async def async_release(self) -> None:
+        """Drop the light's status listener (when the light goes away or is renamed)."""
         for unsub in self._unsubscribers:
             if callable(unsub):
                 # Handle both sync and async unsubscribe functions
@@ -129,13 +185,37 @@ class HafeleLightCoordinator(DataUpdateCoordinator):
                 else:
                     unsub()
         self._unsubscribers.clear()
+
+    async def _async_shutdown(self) -> None:
+        """Clean up subscriptions."""
+        await self.async_release()
         await super()._async_shutdown()
 
+    async def async_update_device(self, device_name: str, device_types: list) -> None:
+        """Follow a change of the light's discovery info, listening under a new name."""
+        self.is_multiwhite = any(t.lower() == "multiwhite" for t in device_types)
+        if device_name == self._device_name:
+            return
+        await self.async_release()
+        self.device_name = self._device_name = device_name
+        self.response_topics = [
+            TOPIC_DEVICE_STATUS.format(prefix=self.topic_prefix, device_name=device_name)
+        ]
+        await self._async_setup_subscriptions()
+
     @callback
     def _on_status_message(self, topic: str, payload: Any) -> None:
         """Handle status response message."""
         try:
-            if isinstance(payload, str):
+            # The client hands us a decoded LightStatus; dicts/strings are still accepted
+            if self.unreachable:
+                # Any status, polled or pushed, proves the light is back
+                self._mark_reachable()
+            else:
+                self.consecutive_timeouts = 0
+            if isinstance(payload, LightStatus):
+                data = payload.as_dict()
+            elif isinstance(payload, str):
                 data = json.loads(payload)
             else:
                 data = payload
@@ -152,13 +232,26 @@ class HafeleLightCoordinator(DataUpdateCoordinator):
             # Status responses may not include all fields, so we preserve existing values
             if isinstance(data, dict) and isinstance(self._status_data, dict):
                 # Update only the fields that are present in the new status
+                changed = any(self._status_data.get(k) != v for k, v in data.items())
                 self._status_data.update(data)
                 merged_data = self._status_data
             else:
                 # If existing data isn't a dict, just use the new data
+                changed = data != self._status_data
                 self._status_data = data
                 merged_data = data
-            self._status_received = True
+            if changed:
+                self._status_changed = True
+            if self._status_waiter is None and not self._take_late_poll_reply():
+                # Pushed status (no poll pending) - fresh data, next poll can wait
+                self.adaptive_interval.record_push(changed)
+                self._apply_poll_interval()
+            if self._status_matchers and isinstance(data, dict):
+                self._resolve_status_matchers(data)
+            waiter = self._status_waiter
+            if waiter is not None and not waiter.done():
+                # Wake the pending poll - one loop wakeup per response
+                waiter.set_result(waiter.get_loop().time())
             _LOGGER.debug(
                 "Received status for device %s (name: %s): %s (merged: %s)",
                 self.device_addr,
@@ -176,8 +269,190 @@ class HafeleLightCoordinator(DataUpdateCoordinator):
                 err,
             )
 
+    def _take_late_poll_reply(self) -> bool:
+        """Return True if a status is the late answer to the last (timed-out) poll.
+
+        Its response time is sampled - no newer GET is outstanding, so it is
+        unambiguous - instead of counting it as a push, which would let a slow
+        light pass as a reliable pusher.
+        """
+        sent_at = self._poll_sent_at
+        if sent_at is None:
+            return False
+        self._poll_sent_at = None
+        rtt = asyncio.get_running_loop().time() - sent_at
+        if rtt > self.rtt.max_timeout:
+            return False
+        self.rtt.record_sample(rtt)
+        self.last_poll_latency = rtt * 1000
+        _LOGGER.debug(
+            "Device %s answered poll late, in %.1f ms", self.device_addr, self.last_poll_latency
+        )
+        return True
+
+    @callback
+    def apply_mesh_status(self, status: LightStatus) -> None:
+        """Apply a status the light sent on the mesh (seen in the rawMessage stream)."""
+        self._on_status_message(self.response_topics[0], status)
+
+    @callback
+    def apply_group_status(self, data: dict[str, Any]) -> bool:
+        """Apply the status of a group this light is a member of.
+
+        Returns True if the light's known state agreed with the group status (or
+        was unknown) - it then counts as freshly heard from. A light that
+        disagrees takes the group's state too, but needs a poll of its own to
+        confirm it; an unreachable light is left alone. Waiters for the light's
+        own status are not woken.
+        """
+        if self.unreachable:
+            return False
+        if not isinstance(self._status_data, dict):
+            self._status_data = {}
+        agreed = not self._status_data or _status_matches(self._status_data, data)
+        changed = any(self._status_data.get(k) != v for k, v in data.items())
+        self._status_data.update(data)
+        if agreed:
+            self.adaptive_interval.record_push(False)
+        if changed:
+            self.async_set_updated_data(self._status_data)
+        return agreed
+
+    @property
+    def unreachable_count(self) -> int:
+        """Return the number of unreachable lights of this config entry."""
+        return len(self._unreachable_devices)
+
+    def _record_timeout(self) -> None:
+        """Count a missed poll; mark the light unreachable after too many in a row."""
+        self.consecutive_timeouts += 1
+        if self.unreachable:
+            # Poll a dead light less and less often
+            self.adaptive_interval.record_timeout()
+            self._apply_poll_interval()
+        elif self.consecutive_timeouts >= UNREACHABLE_AFTER_TIMEOUTS:
+            self.unreachable = True
+            self._unreachable_devices.add(self.device_addr)
+            _LOGGER.warning(
+                "Device %s (name: %s) unreachable after %d missed polls, backing off "
+                "(%d unreachable devices)",
+                self.device_addr,
+                self.device_name,
+                self.consecutive_timeouts,
+                self.unreachable_count,
+            )
+            self.adaptive_interval.record_timeout()
+            self._apply_poll_interval()
+
+    def _mark_reachable(self) -> None:
+        """The light answered or pushed again - back to normal polling."""
+        self.unreachable = False
+        self.consecutive_timeouts = 0
+        self._unreachable_devices.discard(self.device_addr)
+        self.adaptive_interval.reset()
+        self._apply_poll_interval()
+        _LOGGER.info(
+            "Device %s (name: %s) is reachable again (%d unreachable devices)",
+            self.device_addr,
+            self.device_name,
+            self.unreachable_count,
+        )
+
+    def _resolve_status_matchers(self, reported: dict[str, Any]) -> None:
+        """Wake async_wait_for_status callers whose expected state was just reported."""
+        for expected, future in self._status_matchers:
+            if not future.done() and _status_matches(reported, expected):
+                future.set_result(reported)
+
+    async def async_wait_for_status(
+        self, expected: dict[str, Any], timeout: float
+    ) -> dict[str, Any] | None:
+        """Wait up to timeout for a status message reporting the expected fields.
+
+        Only fields the light itself reports count - optimistic updates of
+        coordinator.data don't. Returns the reported fields, or None on timeout;
+        an empty expected dict matches the next status message.
+        """
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        matcher = (expected, future)
+        self._status_matchers.append(matcher)
+        try:
+            async with asyncio.timeout(timeout):
+                return await future
+        except TimeoutError:
+            return None
+        finally:
+            self._status_matchers.remove(matcher)
+
+    async def async_collect_poll_response(
+        self, timeout: float, sent: asyncio.Future[None] | None = None
+    ) -> bool:
+        """Wait for the answer to a GET sent on the light's behalf (e.g. a group multicast).
+
+        The light is armed at once; with `sent`, the timeout only starts once that
+        future is done, i.e. the GET actually went out. An answer counts like an
+        answered poll of the light's own; a miss is not counted against the light,
+        its own poll follows. Returns True if it answered.
+        """
+        if self._status_waiter is not None:
+            # The light's own poll is in flight and takes the answer
+            return False
+        waiter = self._status_waiter = asyncio.get_running_loop().create_future()
+        self._status_changed = False
+        try:
+            if sent is not None:
+                # The GET may wait for mesh airtime first
+                await asyncio.wait((waiter, sent), return_when=asyncio.FIRST_COMPLETED)
+            async with asyncio.timeout(timeout):
+                await waiter
+        except TimeoutError:
+            return False
+        finally:
+            if self._status_waiter is waiter:
+                self._status_waiter = None
+        self.adaptive_interval.mark_polled()
+        self.adaptive_interval.record_poll(self._status_changed)
+        self._apply_poll_interval()
+        return True
+
+    def is_poll_due(self, slack: float = 0.0) -> bool:
+        """Return True if this light's (adaptive) polling interval has elapsed (less slack)."""
+        return self.adaptive_interval.is_due(slack)
+
+    def note_user_command(self, transition: float | None = None) -> None:
+        """A command was sent to the light - poll it at the floor interval again.
+
+        Polls are held back while a requested transition runs; they would only
+        report intermediate values.
+        """
+        self.adaptive_interval.reset(command=True)
+        if transition:
+            self.adaptive_interval.hold(transition)
+        self._apply_poll_interval()
+
+    def _apply_poll_interval(self) -> None:
+        """Reschedule normal-mode polling at the current adaptive interval."""
+        if self.polling_mode == POLLING_MODE_NORMAL:
+            self.update_interval = timedelta(seconds=self.adaptive_interval.interval)
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch status from device via MQTT polling."""
+        if not self.mqtt_client.connected:
+            # Broker connection is down (client is reconnecting) - don't burn
+            # polling_timeout waiting for a response that can't arrive
+            _LOGGER.debug("Skipping poll for device %s, MQTT disconnected", self.device_addr)
+            return self._status_data.copy() if isinstance(self._status_data, dict) else {}
+
+        if self.adaptive_interval.push_defers_poll():
+            # The device told us its status recently - no need to ask
+            _LOGGER.debug("Skipping poll for device %s, fresh pushed status", self.device_addr)
+            return self._status_data.copy() if isinstance(self._status_data, dict) else {}
+
+        if self.adaptive_interval.is_held():
+            # A commanded transition is still running - its verification follows it
+            _LOGGER.debug("Skipping poll for device %s, transition running", self.device_addr)
+            return self._status_data.copy() if isinstance(self._status_data, dict) else {}
+
         # Request status using getDeviceLightness operation only
         # Power state is inferred from lightness (lightness > 0 = on)
         # Default to monochrome if entity not yet assigned
@@ -196,29 +471,57 @@ class HafeleLightCoordinator(DataUpdateCoordinator):
             "Requesting lightness status for %s device %s (name: %s) on topic: %s", _type,
             self.device_addr, self.device_name, get_lightness_topic)
 
-        # Reset status received flag
-        self._status_received = False
         # Keep a copy of existing data to preserve it if no response comes
         old_data = self._status_data.copy() if isinstance(self._status_data, dict) else {}
 
-        # Request only lightness status (power inferred from lightness)
-        await self.mqtt_client.async_publish(get_lightness_topic, {}, qos=1)
-
-        # Wait for response (with timeout)
-        # Note: We wait for at least one status update, which may contain partial data
-        timeout = self.polling_timeout
-        elapsed = 0
-        while not self._status_received and elapsed < timeout:
-            await asyncio.sleep(0.1)
-            elapsed += 0.1
-
-        if not self._status_received:
-            _LOGGER.warning(
-                "Timeout waiting for status response from device %s",
-                self.device_addr,
+        # Armed before publishing so a fast response can't slip past us
+        loop = asyncio.get_running_loop()
+        waiter = self._status_waiter = loop.create_future()
+        try:
+            # Request only lightness status (power inferred from lightness)
+            # Background polls have the lowest mesh priority and are shed under backlog
+            sent = await self.mqtt_client.async_publish(
+                get_lightness_topic, {}, qos=1, priority=PublishPriority.POLL
             )
-            # Return existing data (preserves all fields even if no new update)
-            return old_data if old_data else {}
+            if sent is False:
+                _LOGGER.debug(
+                    "Poll for device %s shed, mesh airtime budget exhausted", self.device_addr
+                )
+                return old_data
+            sent_at = self._poll_sent_at = loop.time()
+            self.adaptive_interval.mark_polled()
+            self._status_changed = False
+
+            # Wait for response (with timeout)
+            # Note: We wait for at least one status update, which may contain partial data
+            try:
+                async with asyncio.timeout(self.rtt.timeout):
+                    received_at = await waiter
+            except TimeoutError:
+                # Once a light is known to be unreachable, its timeouts are expected
+                _LOGGER.log(
+                    logging.DEBUG if self.unreachable else logging.WARNING,
+                    "Timeout waiting for status response from device %s (after %.2fs)",
+                    self.device_addr,
+                    self.rtt.timeout,
+                )
+                self.rtt.record_timeout()
+                self._record_timeout()
+                # Return existing data (preserves all fields even if no new update)
+                return old_data if old_data else {}
+        finally:
+            if self._status_waiter is waiter:
+                self._status_waiter = None
+
+        self._poll_sent_at = None
+        rtt = max(0.0, received_at - sent_at)
+        self.rtt.record_sample(rtt)
+        self.last_poll_latency = rtt * 1000
+        self.adaptive_interval.record_poll(self._status_changed)
+        self._apply_poll_interval()
+        _LOGGER.debug(
+            "Device %s answered poll in %.1f ms", self.device_addr, self.last_poll_latency
+        )
 
         # Return merged status data (includes both old and new fields)
         return self._status_data if isinstance(self._status_data, dict) else {}
@@ -237,6 +540,15 @@ async def async_setup_entry(
     polling_interval = data["polling_interval"]
     polling_timeout = data["polling_timeout"]
     polling_mode = data.get("polling_mode", DEFAULT_POLLING_MODE)
+    polling_window = data.get("polling_window", DEFAULT_POLLING_WINDOW)
+    max_polling_interval = data.get("max_polling_interval", DEFAULT_MAX_POLLING_INTERVAL)
+    polling_timeout_bounds = data.get(
+        "polling_timeout_bounds", (DEFAULT_MIN_POLLING_TIMEOUT, DEFAULT_MAX_POLLING_TIMEOUT)
+    )
+    unreachable_devices: set[int] = data.setdefault("unreachable_devices", set())
+    single_message_turn_on = data.get("single_message_turn_on", False)
+    enable_groups = data.get("enable_groups", True)
+    raw_message_tracking = data.get("raw_message_tracking", False)
     _LOGGER.debug(f"async_setup_entry: topic_prefix {topic_prefix}, polling mode: {polling_mode},"
                   f" polling interval {polling_interval}")
 
@@ -244,14 +556,40 @@ async def async_setup_entry(
     created_entities: set[int] = set()
     
     # Track coordinators for startup status requests
-    coordinators: dict[int, HafeleLightCoordinator] = {}
+    coordinators: dict[int, HafeleLightCoordinator] = data.setdefault("coordinators", {})
+    # Group light entities by group main address
+    group_entities: dict[int, HafeleGroupLightEntity] = {}
+    # Multi-light service calls are sent as group commands where groups cover them
+    planner = (
+        GroupCommandPlanner(
+            discovery.get_all_groups, mqtt_client, topic_prefix, GROUP_PLANNER_WINDOW
+        )
+        if enable_groups
+        else None
+    )
+    # Group status reports are applied to every member light
+    group_router = (
+        GroupStatusRouter(mqtt_client, discovery.get_all_groups, coordinators, topic_prefix)
+        if enable_groups
+        else None
+    )
+    if group_router is not None:
+        entry.async_on_unload(group_router.async_stop)
+
+    # Rotational mode: ring of entities plus queue of HIGH-priority requests
+    scheduler = (
+        RotationalScheduler() if polling_mode == POLLING_MODE_ROTATIONAL else None
+    )
     
     # Get entity registry to check for existing entities
     entity_registry = er.async_get(hass)
 
-    async def _create_entities_for_devices() -> None:
-        """Create entities for all discovered light devices."""
-        devices = discovery.get_all_devices()
+    async def _create_entities_for_devices(
+        devices: dict[int, dict[str, Any]] | None = None,
+    ) -> None:
+        """Create entities for the given (default: all) discovered light devices."""
+        if devices is None:
+            devices = discovery.get_all_devices()
         new_entities = []
 
         for device_addr, device_info in devices.items():
@@ -280,8 +618,7 @@ async def async_setup_entry(
             # But check device_types if it exists to be safe
             device_types = device_info.get("device_types", [])
 
-            # Treat "Light" and "Multiwhite" as light devices
-            if device_types and not any(t.lower() in ("light", "multiwhite") for t in device_types):
+            if not _is_light(device_info):
                 _LOGGER.debug(
                     "Skipping device %s (addr: %s) - not a light type",
                     device_info.get("device_name"),
@@ -309,6 +646,9 @@ async def async_setup_entry(
                 polling_timeout,
                 polling_mode,
                 device_types,
+                max_polling_interval,
+                polling_timeout_bounds,
+                unreachable_devices,
             )
 
             # Set up subscriptions to device status topic
@@ -324,12 +664,21 @@ async def async_setup_entry(
 
             # Create entity
             entity = HafeleLightEntity(
-                coordinator, device_addr, device_info, mqtt_client, topic_prefix
+                coordinator,
+                device_addr,
+                device_info,
+                mqtt_client,
+                topic_prefix,
+                single_message_turn_on=single_message_turn_on,
             )
 
             # Store coordinator reference for startup status tracking
             coordinator.entity = entity
             coordinators[device_addr] = coordinator
+            if scheduler is not None:
+                entity.scheduler = scheduler
+                scheduler.add(device_addr, entity)
+            entity.planner = planner
 
             new_entities.append(entity)
             created_entities.add(device_addr)
@@ -361,84 +710,149 @@ async def async_setup_entry(
             async_add_entities(new_entities, update_before_add=False)
             _LOGGER.info("Finished adding %d light entities", len(new_entities))
 
+        if enable_groups:
+            _create_group_entities()
+        if group_router is not None:
+            await group_router.async_sync()
+
+    def _create_group_entities() -> None:
+        """Create a group light for every discovered group not set up yet."""
+        new_groups = []
+        for group_addr, group_info in discovery.get_all_groups().items():
+            group = group_entities.get(group_addr)
+            if group is not None:
+                # Follow members whose lights were set up after the group
+                if group.hass is not None:
+                    group.follow_members()
+                continue
+            group = HafeleGroupLightEntity(
+                group_addr, group_info, coordinators, mqtt_client, topic_prefix
+            )
+            group_entities[group_addr] = group
+            new_groups.append(group)
+        if new_groups:
+            _LOGGER.info("Adding %d group light entities", len(new_groups))
+            async_add_entities(new_groups, update_before_add=False)
+
+    async def _async_remove_light(device_addr: int) -> None:
+        """Tear down a light the gateway no longer lists: entity, coordinator, subscriptions.
+
+        The registry entry is kept, so a light missing from one (possibly
+        truncated) list keeps its entity ID, name and area when it's listed again.
+        """
+        created_entities.discard(device_addr)
+        coordinator = coordinators.pop(device_addr, None)
+        if coordinator is None:
+            return
+        if scheduler is not None:
+            scheduler.remove(device_addr)
+        unreachable_devices.discard(device_addr)
+        # Drops the status listener on the shared lights/+/status subscription
+        await coordinator.async_release()
+        entity = coordinator.entity
+        coordinator.entity = None
+        if entity is None:
+            return
+        if entity.hass is not None:
+            # Left in the registry, so HA shows it unavailable until it's back
+            await entity.async_remove()
+        _LOGGER.info(
+            "Removed light entity for device: %s (addr: %s)", entity.device_name, device_addr
+        )
+
+    async def _async_update_light(device_addr: int, device_info: dict[str, Any]) -> bool:
+        """Apply changed discovery info to a light in place; False if it isn't set up."""
+        coordinator = coordinators.get(device_addr)
+        if coordinator is None or coordinator.entity is None:
+            return False
+        # Renamed lights report under their new name
+        await coordinator.async_update_device(
+            device_info.get("device_name", f"device_{device_addr}"),
+            device_info.get("device_types", []),
+        )
+        coordinator.entity.update_device_info(device_info)
+        _LOGGER.info(
+            "Updated light entity for device: %s (addr: %s)",
+            device_info.get("device_name"),
+            device_addr,
+        )
+        return True
+
+    # Deltas and discovery events are applied one at a time, in order
+    entities_lock = asyncio.Lock()
+
+    async def _async_apply_devices_delta(delta: DeviceDelta) -> None:
+        """Set up added lights, update changed ones in place and tear down removed ones."""
+        async with entities_lock:
+            new_devices = dict(delta.added)
+            for device_addr in delta.removed:
+                await _async_remove_light(device_addr)
+            for device_addr, device_info in delta.changed.items():
+                if not _is_light(device_info):
+                    await _async_remove_light(device_addr)
+                elif not await _async_update_light(device_addr, device_info):
+                    new_devices[device_addr] = device_info
+            # Also re-attaches group lights to their members' current coordinators
+            await _create_entities_for_devices(new_devices)
+
+    async def _async_create_all_entities() -> None:
+        """Create entities for every discovered light not set up yet."""
+        async with entities_lock:
+            await _create_entities_for_devices()
+
+    @callback
+    def _on_devices_delta(delta: DeviceDelta) -> None:
+        """Handle the lights discovery delta of this entry."""
+        hass.async_create_task(_async_apply_devices_delta(delta))
+
     @callback
     def _on_devices_updated(event) -> None:
-        """Handle device discovery update event."""
-        hass.async_create_task(_create_entities_for_devices())
+        """Handle group/scene discovery update event."""
+        if planner is not None:
+            planner.invalidate()
+        hass.async_create_task(_async_create_all_entities())
 
     # Listen for device discovery updates
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, discovery.devices_signal, _on_devices_delta)
+    )
     entry.async_on_unload(
         hass.bus.async_listen(EVENT_DEVICES_UPDATED, _on_devices_updated)
     )
 
+    # Take the shared lights/+/status subscription up front, so registering
+    # hundreds of coordinators below costs no further subscribe round-trips
+    await mqtt_client.async_ensure_status_subscriptions((TOPIC_LIGHTS,))
+
     # Create entities for any devices already discovered
-    await _create_entities_for_devices()
+    await _async_create_all_entities()
+
+    raw_tracker: RawStatusTracker | None = None
+    if raw_message_tracking:
+        # Status messages lights send on the mesh update them without a poll
+        raw_tracker = RawStatusTracker(mqtt_client, discovery, coordinators, topic_prefix)
+        await raw_tracker.async_start()
+        data["raw_tracker"] = raw_tracker
+        entry.async_on_unload(raw_tracker.async_stop)
 
     # Start rotational polling only if polling_mode is rotational
     # Normal mode uses per-device automatic polling via update_interval
     if polling_mode == POLLING_MODE_ROTATIONAL:
         async def _rotational_polling_loop() -> None:
             """Rotational Polling with Fine-Grained PollPriority and sleep after each update.
-                Each iteration finds and polls one entity:
-                - If any HIGH priority entity exists, poll the first one found (and reset it)
-                - Else, poll the next normal entity via round-robin (rr_index)
+                Each cycle polls the HIGH priority requests queued on the scheduler,
+                then the next normal entity of the ring (see run_one_rotational_polling_cycle)
             """
-            rr_index = 0  # Round-Robin index for normal entities
             _LOGGER.debug("Starting rational polling loop")
             await hass.async_block_till_done() # otherwise startup of HA is blocked
             _LOGGER.info("Homeassistant started - we start polling")
             while True:
                 try:
-                    entity = None
-                    is_high = False
-                    normal_entities = []
-
-                    # Single pass: find first high-priority, or collect normals for round-robin
-                    for c in coordinators.values():
-                        e = c.entity
-                        if e is None:
-                            continue
-                        if e.priority == PollPriority.HIGH:
-                            entity = e
-                            is_high = True
-                            break
-                        normal_entities.append(e)
-
-                    if entity is None and normal_entities:
-                        entity = normal_entities[rr_index % len(normal_entities)]
-
-                    if entity is None:
+                    # Pause polling while the broker connection is down
+                    await mqtt_client.async_wait_connected()
+                    if not len(scheduler):
                         _LOGGER.warning("No entities found to poll")
-                        await asyncio.sleep(polling_interval)
-                        continue
-
-                    # Poll the chosen entity
-                    try:
-                        if is_high:
-                            _LOGGER.debug(
-                                "Updating HIGH priority entity: %s (%s)",
-                                entity.device_name,
-                                entity.device_addr,
-                            )
-                            await entity.coordinator.async_request_refresh()
-                            entity.reset_priority()
-                        else:
-                            _LOGGER.debug(
-                                "Updating NORMAL priority entity: %s (%s)",
-                                entity.device_name,
-                                entity.device_addr,
-                            )
-                            await entity.coordinator.async_request_refresh()
-                            rr_index += 1
-                    except Exception as e:
-                        _LOGGER.exception(
-                            "Error updating %s entity %s: %s",
-                            "HIGH" if is_high else "normal",
-                            entity.device_name,
-                            e,
-                        )
-                    await asyncio.sleep(polling_interval)
-
+                    await run_one_rotational_polling_cycle(scheduler, polling_interval)
                 except Exception as cycle_error:
                     _LOGGER.exception(f"Critical error in polling cycle: {cycle_error}")
                     await asyncio.sleep(polling_interval)
@@ -452,9 +866,69 @@ async def async_setup_entry(
             hass.async_create_task(_rotational_polling_loop())
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _start_rotational_polling)
         _LOGGER.info("Rotational polling mode enabled - polling one device at a time")
+    elif polling_mode in (POLLING_MODE_WINDOWED, POLLING_MODE_GROUP_SWEEP):
+        # Sweeps all lights with up to polling_window GETs in flight; sweep
+        # statistics are kept on the poller for tuning
+        if group_router is not None and polling_mode == POLLING_MODE_GROUP_SWEEP:
+            # One group GET per room, device GETs only for lights that disagree
+            poller = GroupSweepPoller(
+                coordinators,
+                group_router,
+                polling_window,
+                polling_interval,
+                polling_timeout,
+                wait_connected=mqtt_client.async_wait_connected,
+                # Whole rooms are refreshed with one multicast Get when replies can be seen
+                raw_tracker=raw_tracker,
+            )
+        else:
+            if polling_mode == POLLING_MODE_GROUP_SWEEP:
+                _LOGGER.warning("Group sweep polling needs groups enabled - sweeping per light")
+            poller = WindowedPoller(
+                coordinators,
+                polling_window,
+                polling_interval,
+                wait_connected=mqtt_client.async_wait_connected,
+            )
+        data["poller"] = poller
+        entry.async_on_unload(poller.async_stop)
+
+        @callback
+        def _start_windowed_polling(event):
+            poller.start()
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _start_windowed_polling)
+        _LOGGER.info(
+            "Windowed polling mode enabled - up to %d status requests in flight",
+            polling_window,
+        )
     else:
         _LOGGER.info("Normal polling mode enabled - each device polls independently")
 
+
+def _is_light(device_info: dict[str, Any]) -> bool:
+    """Return True unless the device's types say it isn't a light.
+
+    Treat "Light" and "Multiwhite" as light devices.
+    """
+    device_types = device_info.get("device_types", [])
+    return not device_types or any(t.lower() in ("light", "multiwhite") for t in device_types)
+
+
+def _status_matches(reported: dict[str, Any], expected: dict[str, Any]) -> bool:
+    """Return True if reported carries every expected field with (about) the same value."""
+    for key, value in expected.items():
+        if key not in reported:
+            return False
+        actual = reported[key]
+        if isinstance(value, (int, float)) and isinstance(actual, (int, float)):
+            # Lightness comes back quantized by the mesh (e.g. 0.5 -> 0.50196)
+            if not math.isclose(actual, value, rel_tol=0.02, abs_tol=0.01):
+                return False
+        elif actual != value:
+            return False
+    return True
+
+
 class PollPriority:
     """Polling Update Priority, the lower the priority, the faster it gets updadatet"""
     NORMAL = 5  # default priority
@@ -462,29 +936,27 @@ class PollPriority:
 
 
 async def run_one_rotational_polling_cycle(
-    coordinators: dict[int, "HafeleLightCoordinator"],
-    rr_index: int,
+    scheduler: RotationalScheduler,
     polling_interval: int,
-) -> int:
-    """Run one cycle of rotational polling: HIGH priority entities first, then one NORMAL (round-robin).
-    Returns the updated rr_index for the next cycle.
+) -> None:
+    """Run one cycle of rotational polling: the HIGH priority requests queued when the
+    cycle starts, then the next NORMAL entity of the ring.
+    Requests queued during the cycle wait for the next one, so NORMAL entities can't starve.
     Used by the rotational polling loop and by tests.
     """
-    high_priority_entities: list[HafeleLightEntity] = []
-    normal_entities: list[HafeleLightEntity] = []
-    for c in coordinators.values():
-        entity = c.entity
-        if entity is None:
-            continue
-        if entity.priority == PollPriority.HIGH:
-            high_priority_entities.append(entity)
-        else:
-            normal_entities.append(entity)
-    if not high_priority_entities and not normal_entities:
+    if not len(scheduler):
         await asyncio.sleep(polling_interval)
-        return rr_index
-    for entity in high_priority_entities:
+        return
+    for _ in range(scheduler.pending_high):
+        entity = scheduler.pop_high()
+        if entity is None:
+            break
         try:
+            _LOGGER.debug(
+                "Updating HIGH priority entity: %s (%s)",
+                entity.device_name,
+                entity.device_addr,
+            )
             await entity.coordinator.async_request_refresh()
             entity.reset_priority()
         except Exception as e:
@@ -494,18 +966,22 @@ async def run_one_rotational_polling_cycle(
             )
         await asyncio.sleep(polling_interval)
     # Round-robin for normal entities (after processing high-priority entities)
-    if normal_entities:
-        entity = normal_entities[rr_index % len(normal_entities)]
+    # Lights with a stretched (adaptive) interval sit out the turns they aren't due for
+    entity = scheduler.next_normal(lambda e: e.coordinator.is_poll_due())
+    if entity is not None:
         try:
+            _LOGGER.debug(
+                "Updating NORMAL priority entity: %s (%s)",
+                entity.device_name,
+                entity.device_addr,
+            )
             await entity.coordinator.async_request_refresh()
-            rr_index += 1
         except Exception as e:
             _LOGGER.exception(
                 "Error updating normal entity %s: %s",
                 entity.device_name, e,
             )
         await asyncio.sleep(polling_interval)
-    return rr_index
 
 
 class HafeleLightEntity(CoordinatorEntity, LightEntity):
@@ -518,6 +994,7 @@ class HafeleLightEntity(CoordinatorEntity, LightEntity):
         device_info: dict[str, Any],
         mqtt_client: HafeleMQTTClient,
         topic_prefix: str,
+        single_message_turn_on: bool = False,
     ) -> None:
         """Initialize the light."""
         super().__init__(coordinator)
@@ -526,6 +1003,33 @@ class HafeleLightEntity(CoordinatorEntity, LightEntity):
         self.mqtt_client = mqtt_client
         self.topic_prefix = topic_prefix
         self._attr_unique_id = f"{device_addr}_mqtt"
+        self._apply_device_info(device_info)
+        # Fades run on the gateway: one command with a transition_time instead of
+        # HA stepping through brightness values
+        self._attr_supported_features = LightEntityFeature.TRANSITION
+
+        # Store last known lightness value (0-1 scale, as used by API)
+        self._last_known_lightness: float | None = None
+        self._last_known_color_temp: int = 2700
+        # Opt-in: turn_on with a known brightness sends lightness only (no power message).
+        # None while on trial, True once the light turned on that way, False if it didn't.
+        self._single_message_turn_on = single_message_turn_on
+        self._single_message_verified: bool | None = None
+
+        self._priority = PollPriority.NORMAL  # update priority for rational polling
+        # Pending post-command verification; a newer command replaces it
+        self._verify_task: asyncio.Task | None = None
+        # Set by the platform in rotational mode; HIGH priority requests are queued on it
+        self.scheduler: RotationalScheduler | None = None
+        # Set by the platform when groups are enabled; batches commands into group commands
+        self.planner: GroupCommandPlanner | None = None
+
+        _LOGGER.info(f"initiated {self} - multiwhite: {self._is_multiwhite}")
+
+    def _apply_device_info(self, device_info: dict[str, Any]) -> None:
+        """Set name, light type and device info from the light's discovery info."""
+        device_addr = self.device_addr
+        self.device_info = device_info
         self._attr_name = device_info.get("device_name", f"Hafele Light {device_addr}")
 
         device_types = device_info.get("device_types", [])
@@ -543,14 +1047,7 @@ class HafeleLightEntity(CoordinatorEntity, LightEntity):
             }
 
         # Store device name (use as-is, no encoding)
-        device_name = device_info.get("device_name", f"device_{device_addr}")
-        self._device_name = device_name
-        
-        # Store last known lightness value (0-1 scale, as used by API)
-        self._last_known_lightness: float | None = None
-        self._last_known_color_temp: int = 2700
-
-        self._priority = PollPriority.NORMAL  # update priority for rational polling
+        self._device_name = device_info.get("device_name", f"device_{device_addr}")
 
         # Device info
         location = device_info.get("location", "Unknown")
@@ -562,15 +1059,31 @@ class HafeleLightEntity(CoordinatorEntity, LightEntity):
             model="Local MQTT Light",
             suggested_area=location,
         )
-        _LOGGER.info(f"initiated {self} - multiwhite: {self._is_multiwhite}")
+
+    def update_device_info(self, device_info: dict[str, Any]) -> None:
+        """Take changed discovery info in place, keeping the entity and its registry entry."""
+        self._apply_device_info(device_info)
+        if self.hass is not None:
+            self.async_write_ha_state()
+
     @property
     def device_name(self) -> str:
         return self._device_name
 
+    @property
+    def available(self) -> bool:
+        """Return False while the light doesn't answer polls."""
+        return not self.coordinator.unreachable
+
     @property
     def is_multiwhite(self) -> bool:
         return self._is_multiwhite
 
+    @property
+    def turns_on_from_lightness(self) -> bool:
+        """Return True once a lightness-only turn_on was seen switching this light on."""
+        return self._single_message_verified is True
+
     @property
     def priority(self) -> int:
         """Return current priority of this entity"""
@@ -581,6 +1094,8 @@ class HafeleLightEntity(CoordinatorEntity, LightEntity):
         Async-safe: simple assignment in single-threaded HA event loop.
         """
         self._priority = PollPriority.HIGH
+        if self.scheduler is not None:
+            self.scheduler.request_high(self.device_addr)
 
     def reset_priority(self):
         """Reset priority to NORMAL.
@@ -728,6 +1243,9 @@ class HafeleLightEntity(CoordinatorEntity, LightEntity):
                 "lightness" : lightness,
                 "temperature": self._last_known_color_temp,
             }
+            transition_time = encode_transition_time(kwargs.get(ATTR_TRANSITION))
+            if transition_time is not None:
+                payload_ctl["transition_time"] = transition_time
             topic_ctl = TOPIC_SET_DEVICE_CTL.format(
                 prefix=self.topic_prefix, device_name=self._device_name
             )
@@ -751,7 +1269,10 @@ class HafeleLightEntity(CoordinatorEntity, LightEntity):
 
             self._attr_color_mode = ColorMode.COLOR_TEMP
             self.async_write_ha_state()
-            self.coordinator.hass.async_create_task(self.force_manual_update())
+            self._schedule_verification(
+                {"lightness": lightness, "temperature": self._last_known_color_temp},
+                kwargs.get(ATTR_TRANSITION),
+            )
             return
 
         _LOGGER.info(f"Monochrome {self} turned on")
@@ -765,6 +1286,7 @@ class HafeleLightEntity(CoordinatorEntity, LightEntity):
         power_command = True
 
         # Add brightness if specified, otherwise use last known lightness
+        lightness_value: float | None = None
         if ATTR_BRIGHTNESS in kwargs:
             brightness = kwargs[ATTR_BRIGHTNESS]
             # Convert to 0-1 scale (API uses 0-1 for lightness)
@@ -775,70 +1297,161 @@ class HafeleLightEntity(CoordinatorEntity, LightEntity):
 
             # Store as last known lightness
             self._last_known_lightness = lightness_value
+        elif self._last_known_lightness is not None:
+            # No brightness specified - use last known lightness
+            lightness_value = math.ceil(self._last_known_lightness * 100) / 100.0
 
-            # Set power first
-            # Todo: check if setting the brightness is enough - auto turn on if lightness > 0 ??
-            await self.mqtt_client.async_publish(power_topic, power_command, qos=1)
+        transition_time = encode_transition_time(kwargs.get(ATTR_TRANSITION))
+        single_message = self._use_single_message_turn_on(lightness_value, transition_time)
 
-            # Then set brightness using device-specific lightness topic
+        async def _send() -> None:
+            if not lightness_value:
+                # No known lightness (or 0, which would switch it off again) - just turn on
+                # without setting brightness
+                await self.mqtt_client.async_publish(power_topic, power_command, qos=1)
+                return
+            if not single_message:
+                # Set power first
+                await self.mqtt_client.async_publish(power_topic, power_command, qos=1)
+            # lightness > 0 turns the light on by itself - in single-message mode
+            # this is the only message sent
             lightness_topic = TOPIC_SET_DEVICE_LIGHTNESS.format(
                 prefix=self.topic_prefix, device_name=self._device_name
             )
             lightness_command = {"lightness": lightness_value}
+            if transition_time is not None:
+                lightness_command["transition_time"] = transition_time
             await self.mqtt_client.async_publish(lightness_topic, lightness_command, qos=1)
 
-            # Optimistically update state with both power and lightness values we just set
-            if self.coordinator.data:
-                self.coordinator.data.update({"onoff": 1, "lightness": lightness_value})
-            else:
-                self.coordinator.data = {"onoff": 1, "lightness": lightness_value}
+        if ATTR_BRIGHTNESS in kwargs and lightness_value:
+            # A group can set the same lightness on all its members
+            # Members not known to turn on from lightness alone get group power first
+            await self._async_send_command(
+                ("lightness", lightness_value, transition_time, self.turns_on_from_lightness),
+                _send,
+            )
+        elif transition_time is None:
+            # A group power-on brings every member back to its own last lightness
+            await self._async_send_command(("on", None), _send)
         else:
-            # No brightness specified - use last known lightness if available
-            if self._last_known_lightness is not None:
-                lightness_value = self._last_known_lightness
-                # Round to 2 decimal places, rounding up
-                lightness_value = math.ceil(lightness_value * 100) / 100.0
-                
-                # Set power first
-                await self.mqtt_client.async_publish(power_topic, power_command, qos=1)
-                
-                # Then set brightness using device-specific lightness topic
-                lightness_topic = TOPIC_SET_DEVICE_LIGHTNESS.format(
-                    prefix=self.topic_prefix, device_name=self._device_name
-                )
-                lightness_command = {"lightness": lightness_value}
-                await self.mqtt_client.async_publish(lightness_topic, lightness_command, qos=1)
-                
-                # Optimistically update state with both power and lightness values we just set
-                if self.coordinator.data:
-                    self.coordinator.data.update({"onoff": 1, "lightness": lightness_value})
-                else:
-                    self.coordinator.data = {"onoff": 1, "lightness": lightness_value}
-            else:
-                # No last known lightness - just turn on without setting brightness
-                await self.mqtt_client.async_publish(power_topic, power_command, qos=1)
-                
-                # Optimistically update state with power value we just set
-                if self.coordinator.data:
-                    self.coordinator.data.update({"onoff": 1})
-                else:
-                    self.coordinator.data = {"onoff": 1}
+            await _send()
+        if lightness_value:
+            optimistic: dict[str, Any] = {"onoff": 1, "lightness": lightness_value}
+        else:
+            optimistic = {"onoff": 1}
+
+        # Optimistically update state with the values we just set
+        if self.coordinator.data:
+            self.coordinator.data.update(optimistic)
+        else:
+            self.coordinator.data = optimistic
 
         self.async_write_ha_state()
-        self.coordinator.hass.async_create_task(self.force_manual_update())
+        expected: dict[str, Any] = {"onoff": 1}
+        if lightness_value:
+            # After a power-only turn_on (e.g. following a fade-off to 0) the light
+            # restores a lightness of its own choosing - only onoff can be expected
+            expected["lightness"] = lightness_value
+        self._schedule_verification(expected, kwargs.get(ATTR_TRANSITION), single_message)
+
+    async def _async_send_command(
+        self, key: tuple[Any, ...], send: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Publish a command, through the group planner if there is one.
 
-    async def force_manual_update(self) -> None:
+        The planner may send it as part of a group command together with the same
+        command for other lights of the same service call.
+        """
+        if self.planner is None:
+            await send()
+        else:
+            await self.planner.async_submit(self.device_addr, key, send)
+
+    def _use_single_message_turn_on(
+        self, lightness: float | None, transition_time: int | None = None
+    ) -> bool:
+        """Return True if turn_on may send lightness alone, without power.
+
+        Also done for fades when not opted in: power has no transition_time and
+        would switch the light on at once.
+        """
+        return (
+            (self._single_message_turn_on or bool(transition_time))
+            and self._single_message_verified is not False
+            and bool(lightness)
+        )
+
+    def _schedule_verification(
+        self,
+        expected: dict[str, Any],
+        transition: float | None = None,
+        single_message: bool = False,
+    ) -> None:
+        """Verify the commanded state later, replacing any verification still pending."""
+        task = self._verify_task
+        if task is not None and not task.done():
+            task.cancel()
+        self._verify_task = self.coordinator.hass.async_create_task(
+            self.force_manual_update(expected, transition, single_message)
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop a pending verification with the entity."""
+        task = self._verify_task
+        if task is not None and not task.done():
+            task.cancel()
+        await super().async_will_remove_from_hass()
+
+    async def force_manual_update(
+        self,
+        expected: dict[str, Any] | None = None,
+        transition: float | None = None,
+        single_message: bool = False,
+    ) -> None:
         """
         After a change - try requesting actual value either per forced mqtt update or via PollPriority
+        Waits for the transition (ramping) to finish first; if the light reports the
+        expected state on its own meanwhile, no request is needed at all.
+        With single_message, the answer also tells whether lightness alone turns this
+        light on (see _check_single_message_turn_on).
         :return:
         """
-        await asyncio.sleep(1.0)
-        # next polling cycle is >3s (this 1s + 2s Relationpolling min cycle)
+        # Poll the light at the floor interval again for a while
+        self.coordinator.note_user_command(transition)
+        delay = (
+            VERIFY_DEFAULT_DELAY if transition is None else transition + VERIFY_SETTLE_DELAY
+        )
+        if expected:
+            if await self.coordinator.async_wait_for_status(expected, delay) is not None:
+                _LOGGER.debug("%s reported the commanded state, skipping verification", self)
+                if single_message:
+                    self._single_message_verified = True
+                return
+        else:
+            await asyncio.sleep(delay)
+        if single_message:
+            # Wait for the answer to the request below, whatever it reports
+            answer = self.coordinator.hass.async_create_task(
+                self.coordinator.async_wait_for_status({}, SINGLE_MESSAGE_VERIFY_TIMEOUT)
+            )
+        try:
+            await self._async_request_verification()
+            if single_message:
+                await self._check_single_message_turn_on(await answer)
+        finally:
+            if single_message and not answer.done():
+                answer.cancel()
+
+    async def _async_request_verification(self) -> None:
+        """Ask for the light's status now, by GET or by HIGH polling priority.
+
+        Only the rotational poller takes HIGH requests; every other mode sends
+        the GET right away.
+        """
         self.set_high_priority()
-        if self.coordinator.polling_mode == POLLING_MODE_NORMAL:
-            # Schedule a lightnessGet request 5 seconds after setting to get final value after ramping
+        if self.coordinator.polling_mode != POLLING_MODE_ROTATIONAL:
+            # Request lightness after the ramping to get the final value
             # Power state is inferred from lightness, so no need to poll power separately
-            await asyncio.sleep(4.0)  # Wait 5 seconds for ramping to complete
             if self._is_multiwhite:
                 _type = "Multiwhite"
                 get_lightness_topic = TOPIC_GET_DEVICE_CTL.format(
@@ -849,11 +1462,40 @@ class HafeleLightEntity(CoordinatorEntity, LightEntity):
                 get_lightness_topic = TOPIC_GET_DEVICE_LIGHTNESS.format(
                     prefix=self.topic_prefix, device_name=self._device_name
                 )
-            _LOGGER.info(f"requesting manual update for {_type} {self._device_name} with Normal Polling")
-            await self.mqtt_client.async_publish(get_lightness_topic, {}, qos=1)
+            _LOGGER.info(
+                f"requesting manual update for {_type} {self._device_name} "
+                f"with {self.coordinator.polling_mode} polling"
+            )
+            await self.mqtt_client.async_publish(
+                get_lightness_topic, {}, qos=1, priority=PublishPriority.VERIFY
+            )
         else:
             _LOGGER.info(f"requesting manual update for {self._device_name} via RationalPolling")
 
+    async def _check_single_message_turn_on(self, reported: dict[str, Any] | None) -> None:
+        """Judge single-message turn_on by the light's answer after a lightness-only turn_on.
+
+        A light that stayed off needs the power message; it's sent now and for every
+        later turn_on. Without an answer the mode stays on trial.
+        """
+        if reported is None or "onoff" not in reported:
+            return
+        if reported["onoff"]:
+            if not self._single_message_verified:
+                _LOGGER.debug("%s turns on from lightness alone", self)
+            self._single_message_verified = True
+            return
+        _LOGGER.warning(
+            "%s did not turn on from a lightness message alone, "
+            "sending power with lightness from now on",
+            self,
+        )
+        self._single_message_verified = False
+        power_topic = TOPIC_SET_DEVICE_POWER.format(
+            prefix=self.topic_prefix, device_name=self._device_name
+        )
+        await self.mqtt_client.async_publish(power_topic, True, qos=1)
+
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the light off."""
         # Use device-specific topic: {gateway_topic}/lights/{device_name}/power
@@ -864,7 +1506,22 @@ class HafeleLightEntity(CoordinatorEntity, LightEntity):
         # API expects boolean true/false directly, not a JSON object
         power_command = False
 
-        await self.mqtt_client.async_publish(power_topic, power_command, qos=1)
+        transition_time = encode_transition_time(kwargs.get(ATTR_TRANSITION))
+
+        async def _send() -> None:
+            if transition_time:
+                # Power has no transition_time - fade out by dimming to 0, which
+                # switches the light off at the end
+                lightness_topic = TOPIC_SET_DEVICE_LIGHTNESS.format(
+                    prefix=self.topic_prefix, device_name=self._device_name
+                )
+                await self.mqtt_client.async_publish(
+                    lightness_topic, {"lightness": 0, "transition_time": transition_time}, qos=1
+                )
+            else:
+                await self.mqtt_client.async_publish(power_topic, power_command, qos=1)
+
+        await self._async_send_command(("off", transition_time or None), _send)
 
         # Optimistically update state with power value we just set
         if self.coordinator.data:
@@ -873,4 +1530,4 @@ class HafeleLightEntity(CoordinatorEntity, LightEntity):
             self.coordinator.data = {"onoff": 0}
 
         self.async_write_ha_state()
-        self.coordinator.hass.async_create_task(self.force_manual_update())
+        self._schedule_verification({"onoff": 0}, kwargs.get(ATTR_TRANSITION))
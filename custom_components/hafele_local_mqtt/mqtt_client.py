@@ -2,13 +2,37 @@
 from __future__ import annotations
 
 import asyncio
+from dataclasses import dataclass, field
 import json
 import logging
-from typing import Any, Callable
+import random
+from typing import Any, Callable, Iterable
 
 from homeassistant.components import mqtt
 from homeassistant.core import HomeAssistant
 
+from .const import (
+    COALESCED_COMMAND_TOPICS,
+    DEFAULT_COMMAND_COALESCE_WINDOW,
+    DEFAULT_MESH_BACKLOG_LIMIT,
+    DEFAULT_MESH_MESSAGE_RATE,
+    MQTT_RECONNECT_MAX_DELAY,
+    MQTT_RECONNECT_MIN_DELAY,
+    TOPIC_ALL_DEVICE_STATUS,
+    TOPIC_ALL_GROUP_STATUS,
+    TOPIC_GROUPS,
+    TOPIC_LIGHTS,
+)
+from .payload import (
+    PayloadDecodeError,
+    PayloadDecoder,
+    decode_group_status,
+    decode_json,
+    decode_light_status,
+)
+from .rate_limiter import MeshAirtimeBudget, PublishPriority
+from .topic_matcher import TopicMatcher
+
 _LOGGER = logging.getLogger(__name__)
 
 try:
@@ -21,6 +45,49 @@ except ImportError:
     _LOGGER.warning("aiomqtt not available, direct MQTT connections disabled")
 
 
+@dataclass(slots=True, eq=False)
+class _Handler:
+    """A subscriber callback together with the decoder it wants applied."""
+
+    callback: Callable[[str, Any], None]
+    decoder: PayloadDecoder | None
+
+
+def _decode(handler: _Handler, raw: Any, cache: dict[Any, Any]) -> Any:
+    """Decode raw for handler, reusing a result already produced by the same decoder."""
+    decoder = handler.decoder
+    if decoder is None:
+        return raw
+    if decoder not in cache:
+        cache[decoder] = decoder(raw)
+    return cache[decoder]
+
+
+def _dispatch(topic: str, handlers: Iterable[_Handler], raw: Any) -> None:
+    """Decode raw for each handler (once per decoder) and invoke its callback."""
+    decoded: dict[Any, Any] = {}
+    for handler in handlers:
+        try:
+            data = _decode(handler, raw, decoded)
+        except PayloadDecodeError as err:
+            _LOGGER.debug("Ignoring undecodable message on %s: %s", topic, err)
+            continue
+        try:
+            handler.callback(topic, data)
+        except Exception as err:
+            _LOGGER.error("Error processing MQTT message on %s: %s", topic, err)
+
+
+@dataclass(slots=True, eq=False)
+class _Subscription:
+    """One broker subscription (topic filter) shared by every handler registered on it."""
+
+    qos: int
+    handlers: list[_Handler] = field(default_factory=list)
+    # HA MQTT mode: releases the subscription made through Home Assistant
+    ha_unsubscribe: Callable[[], None] | None = None
+
+
 class HafeleMQTTClient:
     """MQTT client for Hafele Local MQTT devices."""
 
@@ -32,20 +99,59 @@ class HafeleMQTTClient:
         port: int = 1883,
         username: str | None = None,
         password: str | None = None,
+        coalesce_window: float = DEFAULT_COMMAND_COALESCE_WINDOW,
+        mesh_message_rate: float = DEFAULT_MESH_MESSAGE_RATE,
+        client_id: str | None = None,
+        persistent_session: bool = False,
     ) -> None:
         """Initialize the MQTT client."""
         self.hass = hass
         self.topic_prefix = topic_prefix
-        self._subscriptions: dict[str, Callable] = {}
+        # Registry: topic filter -> handlers sharing its single broker subscription.
+        # The broker subscription is released with the last handler.
+        self._subscriptions: dict[str, _Subscription] = {}
+        # Wildcard-aware dispatch for the direct aiomqtt listener
+        self._topic_matcher = TopicMatcher()
         self._use_ha_mqtt = broker is None
         self._broker = broker
         self._port = port
         self._username = username
         self._password = password
+        self._client_id = client_id
+        # A persistent session needs a stable client id for the broker to find it again
+        self._persistent_session = persistent_session and client_id is not None
         self._mqtt_client: MQTTClient | None = None
         self._connected = False
+        self._connected_event = asyncio.Event()
+        # Supervises the direct connection: listens, reconnects and resubscribes
         self._message_listener_task: asyncio.Task | None = None
-        self._unsubscribers: dict[str, Callable[[], None]] = {}
+        # Status routing: one wildcard broker subscription per kind ("lights"/"groups"),
+        # messages are dispatched in-process via name -> callback index
+        self._status_filters = {
+            TOPIC_LIGHTS: TOPIC_ALL_DEVICE_STATUS.format(prefix=topic_prefix),
+            TOPIC_GROUPS: TOPIC_ALL_GROUP_STATUS.format(prefix=topic_prefix),
+        }
+        self._status_routes: dict[str, dict[str, Callable[[str, Any], None]]] = {
+            TOPIC_LIGHTS: {},
+            TOPIC_GROUPS: {},
+        }
+        self._status_unsubscribers: dict[str, Callable] = {}
+        self._status_lock = asyncio.Lock()
+        self._status_decoders: dict[str, PayloadDecoder] = {
+            TOPIC_LIGHTS: decode_light_status,
+            TOPIC_GROUPS: decode_group_status,
+        }
+        # Outbound command coalescing, keyed by "{prefix}/lights/{device}".
+        # A key present in _pending_commands means its window is open; the inner
+        # dict keeps the latest (payload, qos, retain) per topic in send order.
+        self._coalesce_window = coalesce_window
+        self._pending_commands: dict[str, dict[str, tuple[Any, int, bool]]] = {}
+        self._coalesce_timers: dict[str, asyncio.TimerHandle] = {}
+        self._flush_tasks: set[asyncio.Task] = set()
+        # Global messages/sec budget for everything we publish towards the mesh
+        self.airtime_budget = MeshAirtimeBudget(
+            mesh_message_rate, max_backlog=DEFAULT_MESH_BACKLOG_LIMIT
+        )
 
     async def async_connect(self) -> None:
         """Connect to MQTT broker."""
@@ -64,30 +170,119 @@ class HafeleMQTTClient:
                 )
 
             try:
-                self._mqtt_client = MQTTClient(
-                    hostname=self._broker,
-                    port=self._port,
-                    username=self._username,
-                    password=self._password,
-                )
-                await self._mqtt_client.__aenter__()
-                self._connected = True
-                
-                # Start message listener task
-                self._message_listener_task = asyncio.create_task(self._message_listener())
-                
-                _LOGGER.info(
-                    "MQTT client connected directly to %s:%s", self._broker, self._port
-                )
+                await self._async_open_connection()
             except MqttError as err:
                 _LOGGER.error("Failed to connect to MQTT broker: %s", err)
                 raise ConnectionError(f"Failed to connect to MQTT broker: {err}") from err
 
+            # Start the supervised listener (reconnects on connection loss)
+            self._message_listener_task = asyncio.create_task(self._connection_supervisor())
+
+            _LOGGER.info(
+                "MQTT client connected directly to %s:%s", self._broker, self._port
+            )
+
+    @property
+    def connected(self) -> bool:
+        """Return True if messages can currently be exchanged with the broker."""
+        if self._use_ha_mqtt:
+            return mqtt.is_connected(self.hass)
+        return self._connected
+
+    async def async_wait_connected(self) -> None:
+        """Wait until the direct connection is up (returns at once for HA MQTT)."""
+        if not self._use_ha_mqtt:
+            await self._connected_event.wait()
+
+    async def _async_open_connection(self) -> None:
+        """Open the direct aiomqtt connection."""
+        self._mqtt_client = MQTTClient(
+            hostname=self._broker,
+            port=self._port,
+            username=self._username,
+            password=self._password,
+            identifier=self._client_id,
+            clean_session=not self._persistent_session,
+        )
+        await self._mqtt_client.__aenter__()
+        self._connected = True
+        self._connected_event.set()
+
+    def _set_disconnected(self) -> None:
+        self._connected = False
+        self._connected_event.clear()
+
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        """Exponential reconnect delay with jitter (half fixed, half random)."""
+        cap = min(MQTT_RECONNECT_MAX_DELAY, MQTT_RECONNECT_MIN_DELAY * 2**attempt)
+        return cap / 2 + random.uniform(0, cap / 2)
+
+    async def _connection_supervisor(self) -> None:
+        """Run the listener; on connection loss reconnect with backoff and resubscribe."""
+        while True:
+            await self._message_listener()
+            self._set_disconnected()
+            stale_client, self._mqtt_client = self._mqtt_client, None
+            if stale_client is not None:
+                try:
+                    await stale_client.__aexit__(None, None, None)
+                except Exception:  # connection is already gone
+                    pass
+
+            attempt = 0
+            while True:
+                delay = self._backoff_delay(attempt)
+                _LOGGER.warning(
+                    "MQTT connection to %s:%s lost, reconnecting in %.1fs (attempt %d)",
+                    self._broker,
+                    self._port,
+                    delay,
+                    attempt + 1,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+                try:
+                    await self._async_open_connection()
+                except MqttError as err:
+                    _LOGGER.debug("Reconnect to MQTT broker failed: %s", err)
+                    continue
+                break
+
+            _LOGGER.info("MQTT connection to %s:%s re-established", self._broker, self._port)
+            await self._async_resubscribe()
+
+    async def _async_resubscribe(self) -> None:
+        """Restore every subscription with a single SUBSCRIBE packet."""
+        if not self._subscriptions or self._mqtt_client is None:
+            return
+        try:
+            await self._mqtt_client.subscribe(
+                [(topic, sub.qos) for topic, sub in self._subscriptions.items()]
+            )
+            _LOGGER.debug("Resubscribed to %d topics", len(self._subscriptions))
+        except MqttError as err:
+            # The listener will notice the broken connection and start over
+            _LOGGER.error("Failed to resubscribe after reconnect: %s", err)
+
     async def async_disconnect(self) -> None:
         """Disconnect from MQTT broker."""
+        # Drop coalesced commands that haven't been sent yet
+        for timer in self._coalesce_timers.values():
+            timer.cancel()
+        self._coalesce_timers.clear()
+        self._pending_commands.clear()
+        for task in list(self._flush_tasks):
+            task.cancel()
+        self.airtime_budget.cancel()
+
+        # Drop status routes and their wildcard subscriptions
+        for kind in list(self._status_unsubscribers):
+            self._status_routes[kind].clear()
+            await self._async_release_status_subscription(kind)
+
         # Unsubscribe from all topics
-        for topic in list(self._subscriptions.keys()):
-            await self.async_unsubscribe(topic)
+        await self.async_unsubscribe_many(list(self._subscriptions))
 
         if not self._use_ha_mqtt:
             # Cancel message listener task
@@ -102,70 +297,347 @@ class HafeleMQTTClient:
             if self._mqtt_client:
                 try:
                     await self._mqtt_client.__aexit__(None, None, None)
-                    self._connected = False
+                    self._set_disconnected()
                 except Exception as err:
                     _LOGGER.error("Error disconnecting from MQTT broker: %s", err)
 
         _LOGGER.info("MQTT client disconnected")
 
     async def async_subscribe(
-        self, topic: str, callback: Callable[[str, Any], None], qos: int = 0
+        self,
+        topic: str,
+        callback: Callable[[str, Any], None],
+        qos: int = 0,
+        decoder: PayloadDecoder | None = decode_json,
     ) -> Callable[[], None]:
-        """Subscribe to an MQTT topic."""
-        _LOGGER.debug("Subscribing to topic: %s", topic)
+        """Subscribe to an MQTT topic.
+
+        The payload is run through decoder before callback sees it (JSON with a
+        text fallback by default). Pass decoder=None to receive the raw payload.
+        """
+        (unsubscribe,) = await self.async_subscribe_many(
+            [(topic, callback)], qos=qos, decoder=decoder
+        )
+        return unsubscribe
+
+    async def async_subscribe_many(
+        self,
+        subscriptions: Iterable[
+            tuple[str, Callable[[str, Any], None]]
+            | tuple[str, Callable[[str, Any], None], PayloadDecoder | None]
+        ],
+        qos: int = 0,
+        decoder: PayloadDecoder | None = decode_json,
+    ) -> list[Callable[[], Any]]:
+        """Subscribe to several (topic, callback[, decoder]) entries at once.
 
+        Direct mode sends a single SUBSCRIBE packet carrying every topic filter.
+        HA MQTT mode issues the subscriptions concurrently so Home Assistant's
+        client can batch them into one packet as well. Entries without their own
+        decoder use decoder. Returns one unsubscribe function per entry, in order.
+        """
+        handlers = [
+            (topic, _Handler(callback, entry_decoder[0] if entry_decoder else decoder))
+            for topic, callback, *entry_decoder in subscriptions
+        ]
+        if not handlers:
+            return []
+
+        # Only filters new to the registry (or needing a higher QoS) reach the broker
+        broker_topics: dict[str, _Subscription] = {}
+        for topic, handler in handlers:
+            sub = self._subscriptions.get(topic)
+            if sub is None:
+                sub = self._subscriptions[topic] = _Subscription(qos)
+                broker_topics[topic] = sub
+            elif qos > sub.qos:
+                sub.qos = qos
+                broker_topics[topic] = sub
+            sub.handlers.append(handler)
+            if not self._use_ha_mqtt:
+                self._topic_matcher.add(topic, handler)
+
+        if broker_topics:
+            _LOGGER.debug("Subscribing to topics: %s", list(broker_topics))
+            try:
+                await self._async_broker_subscribe(broker_topics)
+            except BaseException:
+                self._release_ha(self._forget_handlers(handlers))
+                raise
+
+        return [self._make_unsubscribe(topic, handler) for topic, handler in handlers]
+
+    async def _async_broker_subscribe(self, subscriptions: dict[str, _Subscription]) -> None:
+        """Take (or upgrade) the broker subscription of each registry entry."""
         if self._use_ha_mqtt:
-            # Use Home Assistant's MQTT integration
-            async def message_received(msg: mqtt.ReceiveMessage) -> None:
-                """Handle received MQTT message."""
-                try:
-                    payload = msg.payload
-                    # Try to parse as JSON, fallback to string
-                    try:
-                        data = json.loads(payload)
-                    except (json.JSONDecodeError, TypeError):
-                        data = payload.decode("utf-8") if isinstance(payload, bytes) else payload
-
-                    callback(topic, data)
-                except Exception as err:
-                    _LOGGER.error("Error processing MQTT message on %s: %s", topic, err)
+            # Issued concurrently so Home Assistant's client can batch them
+            await asyncio.gather(
+                *(self._async_subscribe_ha(topic, sub) for topic, sub in subscriptions.items())
+            )
+            return
 
-            unsubscribe = await mqtt.async_subscribe(
-                self.hass, topic, message_received, qos=qos
+        # Use direct MQTT connection, one SUBSCRIBE packet for the whole batch
+        if self._mqtt_client and self._connected:
+            await self._mqtt_client.subscribe(
+                [(topic, sub.qos) for topic, sub in subscriptions.items()]
             )
-            self._subscriptions[topic] = callback
-            return unsubscribe
-        else:
-            # Use direct MQTT connection
-            if not self._mqtt_client or not self._connected:
-                raise ConnectionError("MQTT client not connected")
+        elif self._message_listener_task is None:
+            raise ConnectionError("MQTT client not connected")
+        # else: reconnecting - sent with the batched resubscribe
+
+    async def _async_subscribe_ha(self, topic: str, sub: _Subscription) -> None:
+        """Subscribe a registry entry through Home Assistant's MQTT integration."""
+
+        async def message_received(msg: mqtt.ReceiveMessage) -> None:
+            """Handle received MQTT message."""
+            # Pass the concrete topic so wildcard subscribers can route on it
+            _dispatch(msg.topic, list(sub.handlers), msg.payload)
 
-            await self._mqtt_client.subscribe(topic, qos=qos)
-            self._subscriptions[topic] = callback
+        # encoding=None: hand us the raw bytes, decoding happens once in _decode
+        unsubscribe = await mqtt.async_subscribe(
+            self.hass, topic, message_received, qos=sub.qos, encoding=None
+        )
+        previous, sub.ha_unsubscribe = sub.ha_unsubscribe, unsubscribe
+        if previous is not None:
+            # QoS upgrade - the new subscription replaces the old one
+            previous()
+        if self._subscriptions.get(topic) is not sub:
+            # Every handler left while we were subscribing
+            sub.ha_unsubscribe = None
+            unsubscribe()
 
-            # Return unsubscribe function
-            async def unsubscribe():
-                if topic in self._subscriptions:
-                    await self._mqtt_client.unsubscribe(topic)
-                    del self._subscriptions[topic]
+    def _make_unsubscribe(self, topic: str, handler: _Handler) -> Callable[[], Any]:
+        """Return the function removing handler from topic (safe to call twice)."""
 
-            self._unsubscribers[topic] = unsubscribe
-            return unsubscribe
+        async def unsubscribe() -> None:
+            await self._async_remove_handlers([(topic, handler)])
+
+        return unsubscribe
+
+    def _forget_handlers(
+        self, handlers: Iterable[tuple[str, _Handler]]
+    ) -> dict[str, _Subscription]:
+        """Drop handlers from the registry, returning the entries left without any."""
+        released: dict[str, _Subscription] = {}
+        for topic, handler in handlers:
+            sub = self._subscriptions.get(topic)
+            if sub is None or handler not in sub.handlers:
+                continue
+            sub.handlers.remove(handler)
+            if not self._use_ha_mqtt:
+                self._topic_matcher.remove(topic, handler)
+            if not sub.handlers:
+                del self._subscriptions[topic]
+                released[topic] = sub
+        return released
+
+    def _release_ha(self, released: dict[str, _Subscription]) -> list[str]:
+        """Release HA subscriptions of released entries; return the direct-mode topics."""
+        if not self._use_ha_mqtt:
+            return list(released)
+        for sub in released.values():
+            if sub.ha_unsubscribe is not None:
+                sub.ha_unsubscribe()
+                sub.ha_unsubscribe = None
+        return []
+
+    async def _async_remove_handlers(self, handlers: Iterable[tuple[str, _Handler]]) -> None:
+        """Remove handlers, releasing broker subscriptions nobody uses anymore."""
+        topics = self._release_ha(self._forget_handlers(handlers))
+        if not topics:
+            return
+        _LOGGER.debug("Unsubscribing from topics: %s", topics)
+        if self._mqtt_client and self._connected:
+            await self._mqtt_client.unsubscribe(topics)
 
     async def async_unsubscribe(self, topic: str) -> None:
-        """Unsubscribe from an MQTT topic."""
-        if topic in self._unsubscribers:
-            await self._unsubscribers[topic]()
-            del self._unsubscribers[topic]
-        elif topic in self._subscriptions:
-            # For HA MQTT, the unsubscribe is handled by the returned function
-            del self._subscriptions[topic]
-            _LOGGER.debug("Unsubscribed from topic: %s", topic)
+        """Unsubscribe every handler of an MQTT topic."""
+        await self.async_unsubscribe_many([topic])
 
-    async def async_publish(
-        self, topic: str, payload: str | dict[str, Any] | bool, qos: int = 0, retain: bool = False
+    async def async_unsubscribe_many(self, topics: Iterable[str]) -> None:
+        """Unsubscribe every handler of several topics, with a single UNSUBSCRIBE in direct mode."""
+        await self._async_remove_handlers(
+            [
+                (topic, handler)
+                for topic in topics
+                if topic in self._subscriptions
+                for handler in list(self._subscriptions[topic].handlers)
+            ]
+        )
+
+    @property
+    def subscription_count(self) -> int:
+        """Return the number of live broker subscriptions (topic filters)."""
+        return len(self._subscriptions)
+
+    async def async_add_device_status_listener(
+        self, device_name: str, callback: Callable[[str, Any], None]
+    ) -> Callable[[], Any]:
+        """Route {prefix}/lights/{device_name}/status to callback via the shared subscription."""
+        return await self._async_add_status_listener(TOPIC_LIGHTS, device_name, callback)
+
+    async def async_add_group_status_listener(
+        self, group_name: str, callback: Callable[[str, Any], None]
+    ) -> Callable[[], Any]:
+        """Route {prefix}/groups/{group_name}/status to callback via the shared subscription."""
+        return await self._async_add_status_listener(TOPIC_GROUPS, group_name, callback)
+
+    async def _async_add_status_listener(
+        self, kind: str, name: str, callback: Callable[[str, Any], None]
+    ) -> Callable[[], Any]:
+        """Register a status callback and take the wildcard subscription on first use."""
+        routes = self._status_routes[kind]
+        if name in routes and routes[name] is not callback:
+            _LOGGER.warning("Replacing status listener for %s/%s", kind, name)
+        routes[name] = callback
+        await self.async_ensure_status_subscriptions((kind,))
+
+        async def remove() -> None:
+            if routes.get(name) is callback:
+                del routes[name]
+            if not routes:
+                await self._async_release_status_subscription(kind)
+
+        return remove
+
+    async def async_ensure_status_subscriptions(
+        self, kinds: Iterable[str] = (TOPIC_LIGHTS, TOPIC_GROUPS)
     ) -> None:
-        """Publish a message to an MQTT topic."""
+        """Take the wildcard status subscriptions for kinds that don't have one yet.
+
+        Called once before bulk listener registration (e.g. light setup) so every
+        status filter goes out in a single subscribe round-trip.
+        """
+        async with self._status_lock:
+            missing = [kind for kind in kinds if kind not in self._status_unsubscribers]
+            if not missing:
+                return
+            unsubscribers = await self.async_subscribe_many(
+                [
+                    (
+                        self._status_filters[kind],
+                        self._status_router(kind),
+                        self._status_decoders[kind],
+                    )
+                    for kind in missing
+                ]
+            )
+            for kind, unsub in zip(missing, unsubscribers):
+                self._status_unsubscribers[kind] = unsub
+
+    def _status_router(self, kind: str) -> Callable[[str, Any], None]:
+        """Return the subscription callback dispatching status messages of kind."""
+
+        def _route(topic: str, payload: Any) -> None:
+            self._route_status_message(kind, topic, payload)
+
+        return _route
+
+    async def _async_release_status_subscription(self, kind: str) -> None:
+        """Drop the wildcard status subscription for kind."""
+        unsub = self._status_unsubscribers.pop(kind, None)
+        if unsub is None:
+            return
+        await unsub()
+
+    def _route_status_message(self, kind: str, topic: str, payload: Any) -> None:
+        """Dispatch a wildcard status message to the listener registered for its name."""
+        # topic is "{prefix}/{kind}/{name}/status"
+        name = topic[len(self.topic_prefix) + len(kind) + 2 : -len("/status")]
+        callback = self._status_routes[kind].get(name)
+        if callback is None:
+            _LOGGER.debug("No status listener for %s/%s", kind, name)
+            return
+        callback(topic, payload)
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of publishes waiting for mesh airtime."""
+        return self.airtime_budget.queue_depth
+
+    async def async_publish(
+        self,
+        topic: str,
+        payload: str | dict[str, Any] | bool,
+        qos: int = 0,
+        retain: bool = False,
+        priority: int = PublishPriority.COMMAND,
+    ) -> bool:
+        """Publish a message to an MQTT topic.
+
+        Every publish spends one token of the shared mesh airtime budget and
+        waits behind higher-priority traffic. Returns False if the publish was
+        shed because the backlog is full (never happens for commands).
+
+        Light command topics (power/lightness/ctl) are coalesced: the first
+        publish goes out immediately and opens a short window per device; later
+        publishes within it replace any pending value for the same topic and are
+        sent, in order, when the window closes.
+        """
+        key = self._coalesce_key(topic)
+        if key is not None:
+            pending = self._pending_commands.get(key)
+            if pending is not None:
+                # Window open - last write wins, re-inserted to keep command order
+                pending.pop(topic, None)
+                pending[topic] = (payload, qos, retain)
+                _LOGGER.debug("Coalescing publish to %s: %s", topic, payload)
+                return True
+            self._open_coalesce_window(key)
+
+        return await self._async_send(topic, payload, qos, retain, priority)
+
+    def _coalesce_key(self, topic: str) -> str | None:
+        """Return the per-device coalescing key for light command topics, else None."""
+        if self._coalesce_window <= 0:
+            return None
+        key, _, command = topic.rpartition("/")
+        if command not in COALESCED_COMMAND_TOPICS:
+            return None
+        if not key.startswith(f"{self.topic_prefix}/lights/"):
+            return None
+        return key
+
+    def _open_coalesce_window(self, key: str) -> None:
+        """Start collecting commands for key until the window elapses."""
+        self._pending_commands[key] = {}
+        self._coalesce_timers[key] = asyncio.get_running_loop().call_later(
+            self._coalesce_window, self._on_coalesce_window_closed, key
+        )
+
+    def _on_coalesce_window_closed(self, key: str) -> None:
+        """Flush what collected during the window, or close it if nothing did."""
+        self._coalesce_timers.pop(key, None)
+        pending = self._pending_commands.pop(key, None)
+        if not pending:
+            return
+        # Keep the window open while commands keep arriving (e.g. a slider drag)
+        self._open_coalesce_window(key)
+        task = asyncio.create_task(self._async_flush_commands(pending))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _async_flush_commands(self, pending: dict[str, tuple[Any, int, bool]]) -> None:
+        """Send the latest coalesced value of each pending topic."""
+        for topic, (payload, qos, retain) in pending.items():
+            try:
+                await self._async_send(topic, payload, qos, retain)
+            except Exception as err:
+                _LOGGER.error("Error publishing coalesced command to %s: %s", topic, err)
+
+    async def _async_send(
+        self,
+        topic: str,
+        payload: str | dict[str, Any] | bool,
+        qos: int,
+        retain: bool,
+        priority: int = PublishPriority.COMMAND,
+    ) -> bool:
+        """Wait for airtime, then serialize and publish a message to the broker."""
+        if not await self.airtime_budget.async_acquire(priority):
+            _LOGGER.debug("Dropped publish to %s, mesh backlog full", topic)
+            return False
+
         if isinstance(payload, dict):
             payload = json.dumps(payload)
         elif isinstance(payload, bool):
@@ -180,7 +652,8 @@ class HafeleMQTTClient:
             if not self._mqtt_client or not self._connected:
                 raise ConnectionError("MQTT client not connected")
             await self._mqtt_client.publish(topic, payload.encode(), qos=qos, retain=retain)
-    
+        return True
+
     async def _message_listener(self) -> None:
         """Background task to listen for MQTT messages."""
         if not self._mqtt_client:
@@ -189,23 +662,15 @@ class HafeleMQTTClient:
         try:
             async for msg in self._mqtt_client.messages:
                 topic = msg.topic.value
-                if topic in self._subscriptions:
-                    callback = self._subscriptions[topic]
-                    try:
-                        payload = msg.payload
-                        # Try to parse as JSON, fallback to string
-                        try:
-                            data = json.loads(payload)
-                        except (json.JSONDecodeError, TypeError):
-                            data = payload.decode("utf-8") if isinstance(payload, bytes) else payload
-                        
-                        # Call the callback directly (it's synchronous)
-                        # We're already in the HA event loop, so this is safe
-                        callback(topic, data)
-                    except Exception as err:
-                        _LOGGER.error("Error processing MQTT message on %s: %s", topic, err)
+                handlers = self._topic_matcher.match(topic)
+                if not handlers:
+                    continue
+                # Call the callbacks directly (they're synchronous)
+                # We're already in the HA event loop, so this is safe
+                _dispatch(topic, handlers, msg.payload)
         except asyncio.CancelledError:
             _LOGGER.debug("Message listener task cancelled")
+            raise
         except Exception as err:
             _LOGGER.error("Error in message listener: %s", err)
 
@@ -0,0 +1,241 @@
+"""Payload decoding for Hafele Local MQTT messages.
+
+Each inbound MQTT payload is decoded once, by the decoder the subscriber asked
+for, into either a generic JSON value or a compact typed record. Subscribers
+that pass ``decoder=None`` receive the raw payload untouched. Fields of outbound
+commands that need converting are encoded here as well.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from struct import error as StructError, unpack_from
+from typing import Any, Callable
+
+try:
+    # Ships with Home Assistant; noticeably faster than the stdlib parser
+    import orjson
+
+    _json_loads: Callable[[bytes | str], Any] = orjson.loads
+    _JSON_ERRORS: tuple[type[Exception], ...] = (orjson.JSONDecodeError, TypeError)
+except ImportError:  # pragma: no cover - stdlib fallback
+    _json_loads = json.loads
+    _JSON_ERRORS = (json.JSONDecodeError, TypeError, UnicodeDecodeError)
+
+from .const import (
+    MAX_TRANSITION_TIME,
+    OPCODE_GENERIC_ONOFF_STATUS,
+    OPCODE_LIGHT_CTL_STATUS,
+    OPCODE_LIGHT_LIGHTNESS_STATUS,
+)
+
+PayloadDecoder = Callable[[bytes | str], Any]
+
+
+class PayloadDecodeError(ValueError):
+    """Raised when a payload does not match the schema a decoder expects."""
+
+
+_NUMBER_TYPES = (int, float)
+
+
+def _number(value: Any) -> int | float | None:
+    """Return value if it is a real number (bools excluded), else None."""
+    # type() instead of isinstance() keeps bools out and is cheaper on the hot path
+    return value if type(value) in _NUMBER_TYPES else None
+
+
+@dataclass(slots=True)
+class LightStatus:
+    """Decoded lightStatus message ({prefix}/lights/{device_name}/status)."""
+
+    device_name: str | None = None
+    onoff: int | None = None
+    lightness: float | None = None
+    temperature: int | None = None
+    hue: int | None = None
+    saturation: float | None = None
+
+    @classmethod
+    def from_json(cls, obj: dict[str, Any]) -> LightStatus:
+        """Build a record from a decoded JSON object, ignoring unknown keys."""
+        get = obj.get
+        onoff = get("onoff")
+        if onoff is not None:
+            if type(onoff) in _NUMBER_TYPES or type(onoff) is bool:
+                onoff = int(onoff)
+            elif isinstance(onoff, str):
+                onoff = 1 if onoff.lower() in ("on", "1", "true") else 0
+            else:
+                onoff = None
+        device_name = get("device_name")
+        return cls(
+            device_name if type(device_name) is str else None,
+            onoff,
+            _number(get("lightness")),
+            _number(get("temperature")),
+            _number(get("hue")),
+            _number(get("saturation")),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the fields present in the message as a new dict."""
+        data: dict[str, Any] = {}
+        if self.device_name is not None:
+            data["device_name"] = self.device_name
+        if self.onoff is not None:
+            data["onoff"] = self.onoff
+        if self.lightness is not None:
+            data["lightness"] = self.lightness
+        if self.temperature is not None:
+            data["temperature"] = self.temperature
+        if self.hue is not None:
+            data["hue"] = self.hue
+        if self.saturation is not None:
+            data["saturation"] = self.saturation
+        return data
+
+
+@dataclass(slots=True)
+class GroupStatus:
+    """Decoded groupStatus message ({prefix}/groups/{group_name}/status)."""
+
+    group_name: str | None = None
+    on_off: str | None = None  # "on" / "off" - groupStatus uses camelCase strings
+    lightness: float | None = None
+    temperature: int | None = None
+
+    @classmethod
+    def from_json(cls, obj: dict[str, Any]) -> GroupStatus:
+        """Build a record from a decoded JSON object, ignoring unknown keys."""
+        group_name = obj.get("group_name")
+        on_off = obj.get("onOff", obj.get("onoff"))
+        if _number(on_off) is not None:
+            on_off = "on" if on_off else "off"
+        return cls(
+            group_name=group_name if isinstance(group_name, str) else None,
+            on_off=on_off.lower() if isinstance(on_off, str) else None,
+            lightness=_number(obj.get("lightness")),
+            temperature=_number(obj.get("temperature")),
+        )
+
+
+@dataclass(slots=True)
+class RawLightStatus:
+    """A light status decoded from a mesh access message ({prefix}/rawMessage)."""
+
+    source: int
+    opcode: int
+    status: LightStatus
+
+
+def _hex_int(value: Any) -> int | None:
+    """Parse a hex-encoded address/opcode ("0x8204" or "8204"); numbers pass through."""
+    if type(value) is str:
+        try:
+            return int(value, 16)
+        except ValueError:
+            return None
+    return value if type(value) is int else None
+
+
+# Status messages sent during a transition carry target state and remaining
+# time after the present state - the target is what the light is heading to
+def _parse_onoff_status(data: bytes) -> LightStatus:
+    return LightStatus(onoff=data[1] if len(data) >= 3 else data[0])
+
+
+def _parse_lightness_status(data: bytes) -> LightStatus:
+    (lightness,) = unpack_from("<H", data, 2 if len(data) >= 5 else 0)
+    return LightStatus(lightness=lightness / 65535)
+
+
+def _parse_ctl_status(data: bytes) -> LightStatus:
+    lightness, temperature = unpack_from("<HH", data, 4 if len(data) >= 9 else 0)
+    return LightStatus(lightness=lightness / 65535, temperature=temperature)
+
+
+_RAW_STATUS_PARSERS: dict[int, Callable[[bytes], LightStatus]] = {
+    OPCODE_GENERIC_ONOFF_STATUS: _parse_onoff_status,
+    OPCODE_LIGHT_LIGHTNESS_STATUS: _parse_lightness_status,
+    OPCODE_LIGHT_CTL_STATUS: _parse_ctl_status,
+}
+
+
+def decode_raw_status(raw: bytes | str) -> RawLightStatus | None:
+    """Decode a rawMessage carrying a Generic OnOff, Light Lightness or Light CTL status.
+
+    Every other mesh message returns None after only its opcode was looked at,
+    so the bulk of the raw stream costs one JSON parse.
+    """
+    obj = _decode_object(raw)
+    get = obj.get
+    opcode = _hex_int(get("opcode"))
+    parser = _RAW_STATUS_PARSERS.get(opcode)  # type: ignore[arg-type]
+    if parser is None:
+        return None
+    source = _hex_int(get("source"))
+    payload = get("payload")
+    if source is None or type(payload) is not str:
+        raise PayloadDecodeError(f"raw status without source or payload: {obj}")
+    try:
+        return RawLightStatus(
+            source, opcode, parser(bytes.fromhex(payload.removeprefix("0x")))  # type: ignore[arg-type]
+        )
+    except (ValueError, IndexError, StructError) as err:
+        raise PayloadDecodeError(f"invalid payload for opcode {opcode:#06x}: {err}") from err
+
+
+def decode_json(raw: bytes | str) -> Any:
+    """Decode JSON, falling back to UTF-8 text for non-JSON payloads.
+
+    Bytes that aren't valid UTF-8 are replaced, so a garbled payload still
+    decodes instead of raising.
+    """
+    try:
+        return _json_loads(raw)
+    except _JSON_ERRORS:
+        return raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else raw
+
+
+def _decode_object(raw: bytes | str) -> dict[str, Any]:
+    try:
+        obj = _json_loads(raw)
+    except _JSON_ERRORS as err:
+        raise PayloadDecodeError(f"invalid JSON: {err}") from err
+    if not isinstance(obj, dict):
+        raise PayloadDecodeError(f"expected JSON object, got {type(obj).__name__}")
+    return obj
+
+
+def decode_light_status(raw: bytes | str) -> LightStatus:
+    """Decode a lightStatus payload."""
+    return LightStatus.from_json(_decode_object(raw))
+
+
+def decode_group_status(raw: bytes | str) -> GroupStatus:
+    """Decode a groupStatus payload."""
+    return GroupStatus.from_json(_decode_object(raw))
+
+
+def decode_discovery_list(raw: bytes | str) -> list[dict[str, Any]]:
+    """Decode a lights/groups/scenes discovery payload into its list of entries.
+
+    Entries stay plain dicts - they are stored as device/group info and handed
+    to entities as-is. Non-object entries are dropped here so handlers don't
+    have to re-check them.
+    """
+    try:
+        obj = _json_loads(raw)
+    except _JSON_ERRORS as err:
+        raise PayloadDecodeError(f"invalid JSON: {err}") from err
+    if not isinstance(obj, list):
+        raise PayloadDecodeError(f"expected JSON array, got {type(obj).__name__}")
+    return [entry for entry in obj if isinstance(entry, dict)]
+
+
+def encode_transition_time(transition: float | None) -> int | None:
+    """Convert a transition in seconds to a command's transition_time (deciseconds)."""
+    if transition is None:
+        return None
+    return min(MAX_TRANSITION_TIME, max(0, round(transition * 10)))
@@ -0,0 +1,219 @@
+"""Group command planning for Hafele Local MQTT."""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+import logging
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Mapping
+
+from .const import TOPIC_SET_GROUP_LIGHTNESS, TOPIC_SET_GROUP_POWER
+from .grouplight import group_member_addrs
+from .mqtt_client import HafeleMQTTClient
+
+_LOGGER = logging.getLogger(__name__)
+
+# Command keys: ("off", transition_time), ("on", None),
+# ("lightness", value, transition_time, turns_on_from_lightness)
+CommandKey = tuple[Any, ...]
+DirectSend = Callable[[], Awaitable[None]]
+
+
+def plan_group_cover(
+    targets: set[int],
+    device_groups: Mapping[int, list[int]],
+    group_members: Mapping[int, frozenset[int]],
+) -> tuple[list[int], set[int]]:
+    """Cover targets with as few group commands as possible (greedy set cover).
+
+    Only groups whose members are all targeted qualify - a group command must not
+    touch lights outside the call. A group is only used while it covers at least
+    two lights not covered yet, so it always saves messages. Returns the chosen
+    groups and the targets left for device commands.
+    """
+    candidates = {
+        group_addr
+        for addr in targets
+        for group_addr in device_groups.get(addr, ())
+        if group_members[group_addr] <= targets
+    }
+    uncovered = set(targets)
+    chosen: list[int] = []
+    while candidates:
+        best = max(candidates, key=lambda g: (len(group_members[g] & uncovered), -g))
+        gain = len(group_members[best] & uncovered)
+        if gain < 2:
+            break
+        chosen.append(best)
+        uncovered -= group_members[best]
+        candidates.discard(best)
+    return chosen, uncovered
+
+
+class GroupCommandPlanner:
+    """Turn the per-entity commands of a multi-entity service call into group commands.
+
+    HA runs a service call on several lights as concurrent entity calls. Each
+    call submits its command here instead of publishing; commands arriving within
+    `window` seconds are collected, and each set of lights given the same command
+    is covered by the fewest discovered groups (see plan_group_cover). Lights no
+    group covers publish their own command as before.
+    """
+
+    def __init__(
+        self,
+        groups_provider: Callable[[], Mapping[int, dict[str, Any]]],
+        mqtt_client: HafeleMQTTClient,
+        topic_prefix: str,
+        window: float,
+    ) -> None:
+        """Initialize the planner; groups_provider returns the discovered groups."""
+        self._groups_provider = groups_provider
+        self.mqtt_client = mqtt_client
+        self.topic_prefix = topic_prefix
+        self.window = window
+        # Built on first use, rebuilt after invalidate() when discovery changes
+        self._index_stale = True
+        self._groups: dict[int, dict[str, Any]] = {}
+        self._group_members: dict[int, frozenset[int]] = {}
+        self._device_groups: dict[int, list[int]] = {}
+        self._pending: dict[Hashable, dict[int, tuple[DirectSend, asyncio.Future]]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+        # Messages saved so far, for diagnostics
+        self.saved_messages = 0
+
+    def invalidate(self) -> None:
+        """Rebuild the device -> groups index on next use."""
+        self._index_stale = True
+
+    def _ensure_index(self) -> None:
+        if not self._index_stale:
+            return
+        self._index_stale = False
+        self._groups = dict(self._groups_provider())
+        self._group_members = {}
+        device_groups: defaultdict[int, list[int]] = defaultdict(list)
+        for group_addr, group_info in self._groups.items():
+            members = frozenset(group_member_addrs(group_info))
+            if len(members) < 2 or not group_info.get("group_name"):
+                continue
+            self._group_members[group_addr] = members
+            for addr in members:
+                device_groups[addr].append(group_addr)
+        self._device_groups = dict(device_groups)
+
+    async def async_submit(self, device_addr: int, key: CommandKey, send: DirectSend) -> None:
+        """Queue a light's command; returns once it was sent (by group or directly)."""
+        if self.window <= 0:
+            await send()
+            return
+        self._ensure_index()
+        if device_addr not in self._device_groups:
+            # No group could ever cover this light
+            await send()
+            return
+        # A newer command of the same light replaces the one still waiting
+        for commands in self._pending.values():
+            previous = commands.pop(device_addr, None)
+            if previous is not None and not previous[1].done():
+                previous[1].set_result(None)
+        commands = self._pending.setdefault(key, {})
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        commands[device_addr] = (send, future)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.window, self._on_window_closed
+            )
+        await future
+
+    def _on_window_closed(self) -> None:
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        for key, commands in pending.items():
+            if not commands:
+                continue
+            task = asyncio.get_running_loop().create_task(self._async_flush(key, commands))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def _async_flush(
+        self, key: CommandKey, commands: dict[int, tuple[DirectSend, asyncio.Future]]
+    ) -> None:
+        """Send one key's commands: group commands first, then the leftovers.
+
+        A send that fails fails the futures of the lights it was meant for, so
+        their service calls raise just as a direct command's would.
+        """
+        try:
+            chosen, leftovers = plan_group_cover(
+                set(commands), self._device_groups, self._group_members
+            )
+            for group_addr in chosen:
+                members = self._group_members[group_addr]
+                try:
+                    await self._async_send_group(group_addr, key)
+                except Exception as err:  # noqa: BLE001 - raised by the members' calls
+                    _LOGGER.debug("Error sending %s to group %s: %s", key, group_addr, err)
+                    _fail(commands, members, err)
+                    continue
+                self.saved_messages += len(members) - 1
+            if chosen:
+                _LOGGER.debug(
+                    "Sent %s to %d lights as %d group and %d device commands",
+                    key,
+                    len(commands),
+                    len(chosen),
+                    len(leftovers),
+                )
+            for addr in leftovers:
+                try:
+                    await commands[addr][0]()
+                except Exception as err:  # noqa: BLE001 - raised by the light's call
+                    _fail(commands, (addr,), err)
+        finally:
+            for _, future in commands.values():
+                if not future.done():
+                    future.set_result(None)
+
+    async def _async_send_group(self, group_addr: int, key: CommandKey) -> None:
+        """Publish the group form of a command; raise ConnectionError if it wasn't sent."""
+        group_name = self._groups[group_addr]["group_name"]
+        kind = key[0]
+        if kind == "lightness":
+            _, lightness, transition_time, turns_on_from_lightness = key
+            if not turns_on_from_lightness:
+                # Not every member is known to turn on from lightness alone - power first
+                await self._async_publish(
+                    TOPIC_SET_GROUP_POWER.format(prefix=self.topic_prefix, group_name=group_name),
+                    True,
+                )
+            topic = TOPIC_SET_GROUP_LIGHTNESS.format(
+                prefix=self.topic_prefix, group_name=group_name
+            )
+            payload: Any = {"lightness": lightness}
+            if transition_time is not None:
+                payload["transition_time"] = transition_time
+        elif kind == "off" and key[1]:
+            # Power has no transition_time - fade out by dimming to 0
+            topic = TOPIC_SET_GROUP_LIGHTNESS.format(
+                prefix=self.topic_prefix, group_name=group_name
+            )
+            payload = {"lightness": 0, "transition_time": key[1]}
+        else:
+            topic = TOPIC_SET_GROUP_POWER.format(prefix=self.topic_prefix, group_name=group_name)
+            payload = kind == "on"
+        await self._async_publish(topic, payload)
+
+    async def _async_publish(self, topic: str, payload: Any) -> None:
+        if await self.mqtt_client.async_publish(topic, payload, qos=1) is False:
+            raise ConnectionError(f"Group command to {topic} was not sent")
+
+
+def _fail(
+    commands: dict[int, tuple[DirectSend, asyncio.Future]], addrs: Iterable[int], err: Exception
+) -> None:
+    """Fail the pending futures of the given lights with err."""
+    for addr in addrs:
+        future = commands[addr][1]
+        if not future.done():
+            future.set_exception(err)
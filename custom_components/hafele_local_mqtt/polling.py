@@ -0,0 +1,473 @@
+"""Polling engines for Hafele Local MQTT."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import logging
+import time
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Mapping
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def _async_poll(coordinator: Any) -> None:
+    """Poll one light; returns once it answered or timed out."""
+    try:
+        # async_refresh (not request_refresh) so the slot is held until the
+        # response or timeout - request_refresh is debounced and may return early
+        await coordinator.async_refresh()
+    except Exception as err:
+        _LOGGER.exception("Error polling device %s: %s", coordinator.device_name, err)
+
+
+async def async_poll_windowed(coordinators: list[Any], window: int) -> None:
+    """Poll every coordinator once, keeping at most `window` polls in flight."""
+    if not coordinators:
+        return
+    pending = iter(coordinators)
+
+    async def _worker() -> None:
+        # Workers pull from the shared iterator until all are polled
+        for coordinator in pending:
+            await _async_poll(coordinator)
+
+    await asyncio.gather(*(_worker() for _ in range(min(window, len(coordinators)))))
+
+
+class AdaptiveInterval:
+    """Per-device poll interval that stretches while the device's status stays stable.
+
+    Every poll answered without a status change multiplies the interval by
+    `factor`, up to `ceiling`. A status change (polled or pushed) or a user
+    command snaps it back to `floor`. A ceiling at or below the floor disables
+    stretching.
+
+    Pushed (unsolicited) status counts as fresh data: the device isn't due
+    until a full interval after the last push. A device whose last
+    `reliable_pushes` changes all arrived by push, with no poll finding a change
+    in between, is treated as a reliable pusher and polled only every
+    `heartbeat` seconds.
+
+    An unreachable device backs off: every further unanswered poll doubles its
+    interval, up to `backoff_ceiling` (the heartbeat by default).
+
+    While a commanded transition (fade) runs, the device can be held: it isn't
+    due until the hold ends, so polls don't catch it halfway. After a command,
+    pushes don't defer polling until a poll was answered - a push during the
+    transition may carry the old or an intermediate value.
+    """
+
+    def __init__(
+        self,
+        floor: float,
+        ceiling: float,
+        factor: float = 2.0,
+        heartbeat: float | None = None,
+        reliable_pushes: int = 3,
+        backoff_ceiling: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize at the floor interval."""
+        self.floor = floor
+        self.ceiling = max(floor, ceiling)
+        self.factor = factor
+        self.heartbeat = max(self.ceiling, heartbeat if heartbeat is not None else 0)
+        self.reliable_pushes = reliable_pushes
+        self.backoff_ceiling = max(
+            self.ceiling, backoff_ceiling if backoff_ceiling is not None else self.heartbeat
+        )
+        self._clock = clock
+        self.interval = floor
+        self.last_poll: float | None = None
+        self.last_push: float | None = None
+        self.hold_until: float | None = None
+        # A command awaits its confirming poll
+        self.command_pending = False
+        # Changes in a row that were pushed before any poll could find them
+        self.push_streak = 0
+        # Observed change rate, for diagnostics
+        self.observations = 0
+        self.changes = 0
+
+    @property
+    def push_reliable(self) -> bool:
+        """Return True if the device reliably pushes its status changes."""
+        return self.push_streak >= self.reliable_pushes
+
+    def has_fresh_push(self) -> bool:
+        """Return True if the device pushed its status within the current interval."""
+        return self.last_push is not None and self._clock() - self.last_push < self.interval
+
+    def push_defers_poll(self) -> bool:
+        """Return True if a fresh push makes a poll unnecessary (not after a command)."""
+        return not self.command_pending and self.has_fresh_push()
+
+    def is_held(self) -> bool:
+        """Return True while polls are held back, e.g. during a transition."""
+        return self.hold_until is not None and self._clock() < self.hold_until
+
+    def hold(self, duration: float) -> None:
+        """Hold back polls for duration seconds from now."""
+        self.hold_until = self._clock() + duration
+
+    def is_due(self, slack: float = 0.0) -> bool:
+        """Return True if the device has been neither polled nor heard from for an interval.
+
+        With slack, a poll up to slack seconds short of the interval counts as
+        due - e.g. the length of a sweep, whose GETs go out one after another.
+        """
+        if self.push_defers_poll() or self.is_held():
+            return False
+        return self.last_poll is None or self._clock() - self.last_poll >= self.interval - slack
+
+    def mark_polled(self) -> None:
+        """Record that a status GET was sent now."""
+        self.last_poll = self._clock()
+
+    def record_poll(self, changed: bool) -> None:
+        """Record a poll response; stretch the interval if nothing changed."""
+        self.observations += 1
+        self.command_pending = False
+        if changed:
+            # The device didn't tell us on its own
+            self.changes += 1
+            self.push_streak = 0
+            self.interval = self.floor
+        elif self.push_reliable:
+            self.interval = self.heartbeat
+        else:
+            self.interval = min(self.ceiling, self.interval * self.factor)
+
+    def record_timeout(self) -> None:
+        """Back off polling a device that stopped answering."""
+        self.interval = min(self.backoff_ceiling, self.interval * self.factor)
+
+    def record_push(self, changed: bool) -> None:
+        """Record a status the device pushed without being polled."""
+        self.last_push = self._clock()
+        self.observations += 1
+        if not changed:
+            return
+        self.changes += 1
+        self.push_streak += 1
+        # A reliable pusher will tell us about the next change as well
+        self.interval = self.heartbeat if self.push_reliable else self.floor
+
+    def reset(self, command: bool = False) -> None:
+        """Snap back to the floor, e.g. after a user command.
+
+        With command, the next poll is made however fresh later pushes are.
+        """
+        self.interval = self.floor
+        if command:
+            self.command_pending = True
+        # Pushes seen before the command say nothing about its outcome
+        self.last_push = None
+        self.hold_until = None
+
+
+class RttEstimator:
+    """Smoothed response time and retransmission-style timeout for one device.
+
+    Keeps an EWMA of the round-trip time and of its deviation (Jacobson/Karels,
+    as TCP does) and derives timeout = srtt + 4 * rttvar, clamped to
+    [min_timeout, max_timeout]. A timeout doubles the current value (backoff).
+    A late response to a timed-out request is only sampled while no newer
+    request is outstanding, so it can't be mistaken for another one's (Karn).
+    """
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+
+    def __init__(self, initial: float, min_timeout: float, max_timeout: float) -> None:
+        """Initialize with the configured timeout until the first sample."""
+        self.min_timeout = min_timeout
+        self.max_timeout = max(min_timeout, max_timeout)
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.timeout = self._clamp(initial)
+
+    def _clamp(self, value: float) -> float:
+        return min(self.max_timeout, max(self.min_timeout, value))
+
+    def record_sample(self, rtt: float) -> None:
+        """Fold a measured response time (seconds) into the estimate."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        self.timeout = self._clamp(self.srtt + 4 * self.rttvar)
+
+    def record_timeout(self) -> None:
+        """Back off after a request went unanswered."""
+        self.timeout = self._clamp(self.timeout * 2)
+
+
+class RotationalScheduler:
+    """Stable round-robin ring of lights plus a FIFO of HIGH-priority requests.
+
+    Selection, HIGH requests and membership changes are all O(1) (removal is
+    lazy: a removed light drops out of the ring when its turn comes). New lights
+    join at the back of the ring, after every light already in the rotation. A
+    light just polled through a HIGH request gives up its next ring turn.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty scheduler."""
+        self._members: dict[Hashable, Any] = {}
+        self._ring: deque[Hashable] = deque()
+        self._in_ring: set[Hashable] = set()
+        self._high: deque[Hashable] = deque()
+        self._high_pending: set[Hashable] = set()
+        # Polled via HIGH since their last ring turn
+        self._fresh: set[Hashable] = set()
+
+    def __len__(self) -> int:
+        """Return the number of lights in the rotation."""
+        return len(self._members)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return True if key is in the rotation."""
+        return key in self._members
+
+    @property
+    def pending_high(self) -> int:
+        """Return the number of queued HIGH-priority requests."""
+        return len(self._high)
+
+    def add(self, key: Hashable, item: Any) -> None:
+        """Add (or replace) a light in the rotation."""
+        self._members[key] = item
+        if key not in self._in_ring:
+            self._in_ring.add(key)
+            self._ring.append(key)
+
+    def remove(self, key: Hashable) -> None:
+        """Remove a light from the rotation and drop its pending HIGH request."""
+        self._members.pop(key, None)
+        self._high_pending.discard(key)
+        self._fresh.discard(key)
+
+    def request_high(self, key: Hashable) -> None:
+        """Queue a HIGH-priority poll for key (once, however often it's requested)."""
+        if key in self._members and key not in self._high_pending:
+            self._high_pending.add(key)
+            self._high.append(key)
+
+    def pop_high(self) -> Any | None:
+        """Return the oldest HIGH-priority request, or None."""
+        while self._high:
+            key = self._high.popleft()
+            if key in self._high_pending:
+                self._high_pending.discard(key)
+                self._fresh.add(key)
+                return self._members[key]
+        return None
+
+    def next_normal(self, is_due: Callable[[Any], bool] | None = None) -> Any | None:
+        """Return the next light in round-robin order, or None if the ring is empty.
+
+        With is_due, lights that aren't due are passed over for this rotation;
+        None is returned if no light is due.
+        """
+        ring = self._ring
+        skipped = 0
+        while ring:
+            key = ring.popleft()
+            item = self._members.get(key)
+            if item is None:
+                # Removed since its last turn
+                self._in_ring.discard(key)
+                continue
+            ring.append(key)
+            if key in self._fresh:
+                # Skipped once - each skip shrinks _fresh, so this terminates
+                self._fresh.discard(key)
+                continue
+            if is_due is not None and not is_due(item):
+                skipped += 1
+                if skipped >= len(ring):
+                    return None
+                continue
+            return item
+        return None
+
+
+class WindowedPoller:
+    """Sweep all lights keeping at most `window` status GETs in flight.
+
+    Each sweep polls every coordinator once. `window` workers share one iterator
+    over the sweep, so a new GET starts as soon as a response or timeout frees a
+    slot. A sweep starts every `polling_interval` seconds, or right after the
+    previous one if that took longer. Lights are judged due with one sweep
+    length of slack: a light polled late in the previous sweep is polled again
+    in this one, not skipped until the next.
+    """
+
+    def __init__(
+        self,
+        coordinators: Mapping[Any, Any],
+        window: int,
+        polling_interval: float,
+        wait_connected: Callable[[], Awaitable[None]] | None = None,
+    ) -> None:
+        """Initialize the poller over a (live) address -> coordinator mapping."""
+        self._coordinators = coordinators
+        self.window = max(1, window)
+        self.polling_interval = polling_interval
+        self._wait_connected = wait_connected
+        self._task: asyncio.Task | None = None
+        self._warned_slow = False
+        # Sweep statistics, for tuning window and polling_interval
+        self.sweep_count = 0
+        self.last_sweep_duration: float | None = None
+        self.last_sweep_size = 0
+
+    def start(self) -> None:
+        """Start sweeping in the background."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._async_run())
+
+    async def async_stop(self) -> None:
+        """Stop sweeping, abandoning the polls in flight."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _async_run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                if self._wait_connected is not None:
+                    # Pause polling while the broker connection is down
+                    await self._wait_connected()
+                started = loop.time()
+                await self.async_run_sweep()
+                await asyncio.sleep(max(0.0, self.polling_interval - (loop.time() - started)))
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                _LOGGER.exception("Critical error in windowed polling sweep: %s", err)
+                await asyncio.sleep(self.polling_interval)
+
+    @property
+    def due_slack(self) -> float:
+        """Return how much short of its interval a light may be and still be polled.
+
+        A sweep's GETs go out one after another, so a light was last polled up
+        to one sweep length after that sweep started.
+        """
+        return min(self.last_sweep_duration or 0.0, self.polling_interval)
+
+    async def async_run_sweep(self) -> float:
+        """Poll every light once with up to `window` polls in flight; return the duration."""
+        # Lights with a stretched (adaptive) interval sit out the sweeps they aren't due for
+        slack = self.due_slack
+        sweep = [
+            c
+            for c in list(self._coordinators.values())
+            if c.entity is not None and c.is_poll_due(slack)
+        ]
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await async_poll_windowed(sweep, self.window)
+
+        duration = loop.time() - started
+        self.sweep_count += 1
+        self.last_sweep_duration = duration
+        self.last_sweep_size = len(sweep)
+        _LOGGER.debug(
+            "Windowed sweep of %d lights (window %d) took %.2fs",
+            len(sweep),
+            self.window,
+            duration,
+        )
+        if duration > self.polling_interval and not self._warned_slow:
+            self._warned_slow = True
+            _LOGGER.info(
+                "Windowed sweep of %d lights took %.1fs, longer than the %ss polling "
+                "interval - consider a larger polling window or interval",
+                len(sweep),
+                duration,
+                self.polling_interval,
+            )
+        return duration
+
+
+class RefreshSweep:
+    """Refresh a set of lights once, after they settled, as one rate-limited sweep.
+
+    Used after commands that change many lights at once (scene recalls). Lights
+    requested before the sweep starts are merged, so each is polled once however
+    often it was requested; a later request postpones the start to its own
+    settle time. At most `window` polls are in flight, and every poll spends
+    mesh airtime at polling priority. Lights requested while a sweep runs get
+    the next one.
+    """
+
+    def __init__(self, coordinators: Mapping[Any, Any], window: int) -> None:
+        """Initialize over a (live) address -> coordinator mapping."""
+        self._coordinators = coordinators
+        self.window = max(1, window)
+        self._pending: set[Any] = set()
+        self._start_at: float | None = None
+        self._task: asyncio.Task | None = None
+        self.sweep_count = 0
+
+    @property
+    def pending(self) -> int:
+        """Return the number of lights waiting for the next sweep."""
+        return len(self._pending)
+
+    def request(self, addrs: Iterable[Any], delay: float) -> None:
+        """Refresh addrs in a sweep starting no earlier than delay seconds from now."""
+        addrs = [addr for addr in addrs if addr in self._coordinators]
+        if not addrs:
+            return
+        loop = asyncio.get_running_loop()
+        self._pending.update(addrs)
+        start_at = loop.time() + delay
+        if self._start_at is None or start_at > self._start_at:
+            self._start_at = start_at
+        if self._task is None:
+            self._task = loop.create_task(self._async_run())
+
+    async def async_stop(self) -> None:
+        """Drop pending refreshes and stop a running sweep."""
+        task, self._task = self._task, None
+        self._pending.clear()
+        self._start_at = None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _async_run(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while self._pending:
+                delay = self._start_at - loop.time()
+                if delay > 0:
+                    # Re-checked after sleeping: a newer request may have postponed it
+                    await asyncio.sleep(delay)
+                    continue
+                batch, self._pending = self._pending, set()
+                self._start_at = None
+                coordinators = self._coordinators
+                sweep = [coordinators[addr] for addr in batch if addr in coordinators]
+                _LOGGER.debug("Refreshing %d lights (window %d)", len(sweep), self.window)
+                await async_poll_windowed(sweep, self.window)
+                self.sweep_count += 1
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
@@ -0,0 +1,136 @@
+"""Mesh airtime budget for Hafele Local MQTT publishes."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import logging
+import time
+from typing import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PublishPriority:
+    """Publish priority classes, the lower the value, the sooner it is sent."""
+    COMMAND = 0  # user commands (turn_on/turn_off, scenes)
+    VERIFY = 1   # GETs verifying a command or requested by the user (ping)
+    POLL = 2     # background status polling
+
+    ALL = (COMMAND, VERIFY, POLL)
+
+
+class MeshAirtimeBudget:
+    """Token bucket shared by every gateway publish, with strict priority queueing.
+
+    Tokens refill at `rate` per second up to `burst`. A publish that finds no
+    token waits in the queue of its priority class; the queues are served
+    highest priority first. When the backlog reaches `max_backlog`, waiting
+    lower-priority requests are shed to make room, and new VERIFY/POLL requests
+    are shed outright. Commands are never shed.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int | None = None,
+        max_backlog: int = 50,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the budget; rate <= 0 disables limiting."""
+        self.rate = rate
+        self.burst = max(1, burst if burst is not None else round(rate))
+        self.max_backlog = max_backlog
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._last_refill = clock()
+        self._waiters: dict[int, deque[asyncio.Future]] = {
+            priority: deque() for priority in PublishPriority.ALL
+        }
+        self._wakeup: asyncio.TimerHandle | None = None
+        self.shed_count = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of publishes waiting for airtime."""
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def queue_depths(self) -> dict[int, int]:
+        """Return the number of waiting publishes per priority class."""
+        return {priority: len(waiters) for priority, waiters in self._waiters.items()}
+
+    async def async_acquire(self, priority: int = PublishPriority.COMMAND) -> bool:
+        """Wait for a token. Returns False if the request was shed."""
+        if self.rate <= 0:
+            return True
+        self._refill()
+        ahead = any(self._waiters[p] for p in PublishPriority.ALL if p <= priority)
+        if not ahead and self._tokens >= 1:
+            self._tokens -= 1
+            return True
+
+        if self.queue_depth >= self.max_backlog and not self._shed_below(priority):
+            # Nothing lower to drop - commands queue anyway, everything else is shed
+            if priority != PublishPriority.COMMAND:
+                self.shed_count += 1
+                _LOGGER.debug("Mesh budget exhausted, shedding priority %s publish", priority)
+                return False
+
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(future)
+        self._schedule_wakeup()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future in self._waiters[priority]:
+                self._waiters[priority].remove(future)
+            raise
+
+    def cancel(self) -> None:
+        """Release every waiter (as shed) and stop the refill timer."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        for waiters in self._waiters.values():
+            while waiters:
+                future = waiters.popleft()
+                if not future.done():
+                    future.set_result(False)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _shed_below(self, priority: int) -> bool:
+        """Shed the newest waiter of a lower priority than priority, if any."""
+        for lower in reversed(PublishPriority.ALL):
+            if lower <= priority:
+                return False
+            waiters = self._waiters[lower]
+            while waiters:
+                future = waiters.pop()
+                if not future.done():
+                    future.set_result(False)
+                    self.shed_count += 1
+                    return True
+        return False
+
+    def _schedule_wakeup(self) -> None:
+        if self._wakeup is not None or not self.queue_depth:
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._on_wakeup)
+
+    def _on_wakeup(self) -> None:
+        """Hand out refilled tokens to the highest-priority waiters."""
+        self._wakeup = None
+        self._refill()
+        for priority in PublishPriority.ALL:
+            waiters = self._waiters[priority]
+            while waiters and self._tokens >= 1:
+                future = waiters.popleft()
+                if future.done():
+                    continue
+                self._tokens -= 1
+                future.set_result(True)
+        self._schedule_wakeup()
@@ -0,0 +1,133 @@
+"""Passive light state tracking from the gateway's rawMessage stream."""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+from typing import Any, Callable, Iterable, Mapping
+
+from .const import OPCODE_LIGHT_LIGHTNESS_GET, TOPIC_RAW_MESSAGE, TOPIC_RAW_MESSAGE_SEND
+from .discovery import HafeleDiscovery
+from .mqtt_client import HafeleMQTTClient
+from .payload import RawLightStatus, decode_raw_status
+from .rate_limiter import PublishPriority
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RawStatusTracker:
+    """Apply status messages seen on the mesh to the lights' coordinators.
+
+    The gateway publishes every mesh access message on {prefix}/rawMessage,
+    including the status messages lights send when any controller (wall switch,
+    app, another gateway) changes them. Those are decoded (see
+    decode_raw_status) and applied like a pushed lightStatus, so a light that
+    keeps reporting its changes this way drops to heartbeat polling. The same
+    stream collects the replies to group multicast Gets (async_refresh_group).
+    """
+
+    def __init__(
+        self,
+        mqtt_client: HafeleMQTTClient,
+        discovery: HafeleDiscovery,
+        coordinators: Mapping[int, Any],
+        topic_prefix: str,
+    ) -> None:
+        """Initialize over a (live) address -> coordinator mapping."""
+        self.mqtt_client = mqtt_client
+        self.discovery = discovery
+        self._coordinators = coordinators
+        self.topic = TOPIC_RAW_MESSAGE.format(prefix=topic_prefix)
+        self.send_topic = TOPIC_RAW_MESSAGE_SEND.format(prefix=topic_prefix)
+        self._unsubscribe: Callable[[], Any] | None = None
+        # Statistics, for diagnostics
+        self.applied = 0
+        self.ignored = 0
+        self.group_gets = 0
+        self.group_replies = 0
+
+    async def async_start(self) -> None:
+        """Subscribe to the raw message stream."""
+        if self._unsubscribe is None:
+            self._unsubscribe = await self.mqtt_client.async_subscribe(
+                self.topic, self._on_raw_status, decoder=decode_raw_status
+            )
+
+    async def async_stop(self) -> None:
+        """Unsubscribe from the raw message stream."""
+        unsub, self._unsubscribe = self._unsubscribe, None
+        if unsub is None:
+            return
+        if inspect.iscoroutinefunction(unsub):
+            await unsub()
+        else:
+            unsub()
+
+    def _on_raw_status(self, topic: str, record: RawLightStatus | None) -> None:
+        """Route a decoded light status to the coordinator of its source light."""
+        if record is None:
+            # Not a light status - the bulk of the stream
+            return
+        source = record.source
+        coordinator = self._coordinators.get(source)
+        if coordinator is None or self.discovery.get_device(source) is None:
+            # A light not set up here (or a sender we don't know)
+            self.ignored += 1
+            return
+        self.applied += 1
+        coordinator.apply_mesh_status(record.status)
+
+    async def async_refresh_group(
+        self, group_addr: int, members: Iterable[Any], window: float
+    ) -> list[Any]:
+        """Refresh a group's lights with one Light Lightness Get sent to the group address.
+
+        Every member answers the multicast with its own status on the mesh,
+        which the raw stream delivers to its coordinator. Replies are collected
+        for at most `window` seconds after the Get went out (it may first wait
+        for mesh airtime), finishing early once every member has answered.
+        Returns the member coordinators that did not answer.
+        """
+        members = list(members)
+        if self._unsubscribe is None or not members:
+            return members
+        # Arm every member before the Get goes out so no early reply slips past;
+        # their windows open once it has been published
+        sent: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        collectors = [
+            asyncio.ensure_future(coordinator.async_collect_poll_response(window, sent))
+            for coordinator in members
+        ]
+        await asyncio.sleep(0)
+        try:
+            published = await self.mqtt_client.async_publish(
+                self.send_topic,
+                {"destination": group_addr, "opcode": OPCODE_LIGHT_LIGHTNESS_GET, "payload": ""},
+                qos=1,
+                priority=PublishPriority.POLL,
+            )
+        except BaseException:
+            await _cancel(collectors)
+            raise
+        if published is False:
+            await _cancel(collectors)
+            return members
+        sent.set_result(None)
+        self.group_gets += 1
+        answered = await asyncio.gather(*collectors)
+        missing = [c for c, ok in zip(members, answered) if not ok]
+        self.group_replies += len(members) - len(missing)
+        _LOGGER.debug(
+            "Group %s multicast Get: %d of %d lights answered",
+            group_addr,
+            len(members) - len(missing),
+            len(members),
+        )
+        return missing
+
+
+async def _cancel(collectors: list[asyncio.Future[bool]]) -> None:
+    """Cancel reply collectors whose Get was never sent."""
+    for collector in collectors:
+        collector.cancel()
+    await asyncio.gather(*collectors, return_exceptions=True)
@@ -0,0 +1,126 @@
+"""Scene platform for Hafele Local MQTT."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.light import ATTR_TRANSITION
+from homeassistant.components.scene import Scene
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import (
+    DOMAIN,
+    EVENT_DEVICES_UPDATED,
+    TOPIC_SCENE_ACTIVATE,
+    VERIFY_DEFAULT_DELAY,
+    VERIFY_SETTLE_DELAY,
+)
+from .discovery import HafeleDiscovery, scene_display_name
+from .grouplight import group_member_addrs
+from .mqtt_client import HafeleMQTTClient
+from .payload import encode_transition_time
+from .polling import RefreshSweep
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Hafele scenes from a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    if not data.get("enable_scenes", True):
+        return
+    mqtt_client: HafeleMQTTClient = data["mqtt_client"]
+    discovery: HafeleDiscovery = data["discovery"]
+    topic_prefix = data["topic_prefix"]
+    refresh_sweep: RefreshSweep = data["refresh_sweep"]
+
+    # Track which scenes we've already created in this session
+    created_scenes: set[Any] = set()
+
+    @callback
+    def _create_scene_entities() -> None:
+        """Create entities for all discovered scenes."""
+        new_entities = []
+        for scene_id, scene_info in discovery.get_all_scenes().items():
+            if scene_id in created_scenes or not scene_display_name(scene_info):
+                continue
+            new_entities.append(
+                HafeleSceneEntity(
+                    scene_id, scene_info, discovery, mqtt_client, topic_prefix, refresh_sweep
+                )
+            )
+            created_scenes.add(scene_id)
+        if new_entities:
+            _LOGGER.info("Adding %d scene entities", len(new_entities))
+            async_add_entities(new_entities)
+
+    @callback
+    def _on_devices_updated(event) -> None:
+        """Handle discovery update event."""
+        _create_scene_entities()
+
+    entry.async_on_unload(
+        hass.bus.async_listen(EVENT_DEVICES_UPDATED, _on_devices_updated)
+    )
+    _create_scene_entities()
+
+
+class HafeleSceneEntity(Scene):
+    """A gateway scene, recalled with one publish."""
+
+    def __init__(
+        self,
+        scene_id: Any,
+        scene_info: dict[str, Any],
+        discovery: HafeleDiscovery,
+        mqtt_client: HafeleMQTTClient,
+        topic_prefix: str,
+        refresh_sweep: RefreshSweep,
+    ) -> None:
+        """Initialize the scene."""
+        self.scene_id = scene_id
+        self.scene_info = scene_info
+        self.discovery = discovery
+        self.mqtt_client = mqtt_client
+        self.topic_prefix = topic_prefix
+        self.refresh_sweep = refresh_sweep
+        self._scene_name = scene_display_name(scene_info)
+        self._attr_unique_id = f"scene_{scene_id}_mqtt"
+        self._attr_name = self._scene_name
+
+    def __str__(self) -> str:
+        return f"Scene {self._scene_name}"
+
+    @property
+    def member_addrs(self) -> set[int]:
+        """Return the addresses of the lights in the scene's groups."""
+        addrs: set[int] = set()
+        for group_addr in self.scene_info.get("groups") or ():
+            group = self.discovery.get_group(group_addr)
+            if group is not None:
+                addrs.update(group_member_addrs(group))
+        return addrs
+
+    async def async_activate(self, **kwargs: Any) -> None:
+        """Recall the scene on the gateway, then refresh its lights in one sweep."""
+        transition = kwargs.get(ATTR_TRANSITION)
+        payload: dict[str, Any] = {}
+        transition_time = encode_transition_time(transition)
+        if transition_time is not None:
+            payload["transition_time"] = transition_time
+        topic = TOPIC_SCENE_ACTIVATE.format(
+            prefix=self.topic_prefix, scene_name=self._scene_name
+        )
+        _LOGGER.info("%s activated", self)
+        await self.mqtt_client.async_publish(topic, payload, qos=1)
+
+        # The new state of the lights is only known to the mesh - read it back once
+        # the lights have settled, instead of verifying each light separately
+        delay = VERIFY_DEFAULT_DELAY if transition is None else transition + VERIFY_SETTLE_DELAY
+        self.refresh_sweep.request(self.member_addrs, delay)
@@ -0,0 +1,112 @@
+"""MQTT topic filter matching for Hafele Local MQTT."""
+from __future__ import annotations
+
+from typing import Any, Callable
+
+# Usually a callback, but any handler object can be stored and returned by match()
+TopicCallback = Callable[[str, Any], None] | Any
+
+
+class _Node:
+    """One topic level in the filter trie."""
+
+    __slots__ = ("children", "callbacks")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        # Callbacks of the filter that ends at this level
+        self.callbacks: list[TopicCallback] = []
+
+
+class TopicMatcher:
+    """Segment-keyed trie of MQTT topic filters supporting + and # wildcards.
+
+    Matching walks the trie level by level, so the cost grows with the depth
+    of the topic rather than with the number of registered filters.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty matcher."""
+        self._root = _Node()
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of registered (filter, callback) pairs."""
+        return self._count
+
+    def __contains__(self, topic_filter: str) -> bool:
+        """Return True if at least one callback is registered for topic_filter."""
+        node = self._root
+        for level in topic_filter.split("/"):
+            node = node.children.get(level)
+            if node is None:
+                return False
+        return bool(node.callbacks)
+
+    def add(self, topic_filter: str, callback: TopicCallback) -> None:
+        """Register callback for topic_filter (several callbacks per filter are allowed)."""
+        levels = topic_filter.split("/")
+        if "#" in levels[:-1]:
+            raise ValueError(f"'#' must be the last level of a topic filter: {topic_filter}")
+        node = self._root
+        for level in levels:
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _Node()
+            node = child
+        node.callbacks.append(callback)
+        self._count += 1
+
+    def remove(self, topic_filter: str, callback: TopicCallback) -> bool:
+        """Unregister callback from topic_filter, pruning empty levels.
+
+        Returns False if the callback was not registered for that filter.
+        """
+        path: list[tuple[_Node, str]] = []
+        node = self._root
+        for level in topic_filter.split("/"):
+            child = node.children.get(level)
+            if child is None:
+                return False
+            path.append((node, level))
+            node = child
+        try:
+            node.callbacks.remove(callback)
+        except ValueError:
+            return False
+        self._count -= 1
+        # Prune levels that no longer lead to any filter
+        for parent, level in reversed(path):
+            child = parent.children[level]
+            if child.callbacks or child.children:
+                break
+            del parent.children[level]
+        return True
+
+    def match(self, topic: str) -> list[TopicCallback]:
+        """Return all callbacks whose filter matches topic."""
+        levels = topic.split("/")
+        depth = len(levels)
+        matches: list[TopicCallback] = []
+        # Per MQTT spec, wildcards at the first level don't match $-topics
+        wildcards = not topic.startswith("$")
+        stack: list[tuple[_Node, int]] = [(self._root, 0)]
+        while stack:
+            node, index = stack.pop()
+            children = node.children
+            if wildcards or index > 0:
+                multi = children.get("#")
+                if multi is not None:
+                    # "a/#" also matches "a" itself
+                    matches.extend(multi.callbacks)
+            if index == depth:
+                matches.extend(node.callbacks)
+                continue
+            exact = children.get(levels[index])
+            if exact is not None:
+                stack.append((exact, index + 1))
+            if wildcards or index > 0:
+                single = children.get("+")
+                if single is not None:
+                    stack.append((single, index + 1))
+        return matches
@@ -41,6 +41,15 @@ def mock_mqtt_client():
     client.async_subscribe = AsyncMock(return_value=AsyncMock())
     client.async_publish = AsyncMock()
     client.async_unsubscribe = AsyncMock()
+    client.async_subscribe_many = AsyncMock(
+        side_effect=lambda subscriptions, **kwargs: [AsyncMock() for _ in subscriptions]
+    )
+    client.async_unsubscribe_many = AsyncMock()
+    client.async_ensure_status_subscriptions = AsyncMock()
+    client.async_add_device_status_listener = AsyncMock(return_value=AsyncMock())
+    client.async_add_group_status_listener = AsyncMock(return_value=AsyncMock())
+    client.connected = True
+    client.async_wait_connected = AsyncMock()
     client.topic_prefix = "hafele"
     return client
 
@@ -1,11 +1,15 @@
 """Tests for Hafele discovery."""
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 import json
 
-from custom_components.hafele_local_mqtt.discovery import HafeleDiscovery
+from custom_components.hafele_local_mqtt.discovery import (
+    DeviceDelta,
+    HafeleDiscovery,
+    diff_devices,
+)
+from custom_components.hafele_local_mqtt.payload import decode_discovery_list
 from custom_components.hafele_local_mqtt.const import (
-    EVENT_DEVICES_UPDATED,
     TOPIC_DISCOVERY_LIGHTS,
     TOPIC_DISCOVERY_GROUPS,
     TOPIC_DISCOVERY_SCENES,
@@ -19,8 +23,14 @@ async def test_discovery_start(mock_hass, mock_mqtt_client):
     
     await discovery.async_start()
     
-    # Verify subscriptions
-    assert mock_mqtt_client.async_subscribe.call_count == 3
+    # Verify all three discovery topics were subscribed in one batch
+    mock_mqtt_client.async_subscribe_many.assert_called_once()
+    subscriptions = mock_mqtt_client.async_subscribe_many.call_args[0][0]
+    assert [subscription[0] for subscription in subscriptions] == [
+        TOPIC_DISCOVERY_LIGHTS.format(prefix="hafele"),
+        TOPIC_DISCOVERY_GROUPS.format(prefix="hafele"),
+        TOPIC_DISCOVERY_SCENES.format(prefix="hafele"),
+    ]
     assert len(discovery._unsubscribers) == 3
 
 
@@ -45,7 +55,10 @@ def test_on_lights_message(mock_hass, mock_mqtt_client):
         {"device_addr": 456, "device_name": "Light 2", "device_types": ["Light"]},
     ]
     
-    discovery._on_lights_message("hafele/lights", lights_data)
+    with patch(
+        "custom_components.hafele_local_mqtt.discovery.async_dispatcher_send"
+    ) as dispatcher_send:
+        discovery._on_lights_message("hafele/lights", lights_data)
     
     # Verify devices were added
     assert len(discovery.devices) == 2
@@ -53,8 +66,12 @@ def test_on_lights_message(mock_hass, mock_mqtt_client):
     assert 456 in discovery.devices
     assert discovery.devices[123]["device_name"] == "Light 1"
     
-    # Verify event was fired
-    mock_hass.bus.async_fire.assert_called_once_with(EVENT_DEVICES_UPDATED)
+    # Verify the delta went to this entry's signal, not the global bus
+    dispatcher_send.assert_called_once()
+    hass, signal, delta = dispatcher_send.call_args[0]
+    assert signal == discovery.devices_signal
+    assert set(delta.added) == {123, 456}
+    mock_hass.bus.async_fire.assert_not_called()
 
 
 def test_on_lights_message_string_payload(mock_hass, mock_mqtt_client):
@@ -138,3 +155,45 @@ def test_get_all_devices(mock_hass, mock_mqtt_client):
     assert len(all_devices) == 2
     # Should return a copy
     assert all_devices is not discovery.devices
+
+
+def test_diff_devices():
+    """Test added, changed and removed lights are told apart."""
+    old = {1: {"device_name": "A"}, 2: {"device_name": "B"}, 3: {"device_name": "C"}}
+    new = {1: {"device_name": "A"}, 2: {"device_name": "B2"}, 4: {"device_name": "D"}}
+
+    delta = diff_devices(old, new)
+
+    assert delta == DeviceDelta(
+        added={4: {"device_name": "D"}},
+        changed={2: {"device_name": "B2"}},
+        removed={3: {"device_name": "C"}},
+    )
+    assert not diff_devices(new, dict(new))
+
+
+def test_on_lights_message_dispatches_only_deltas(mock_hass, mock_mqtt_client):
+    """Test republished lists are skipped and only real changes are dispatched."""
+    discovery = HafeleDiscovery(mock_hass, mock_mqtt_client, "hafele", "entry1")
+    first = json.dumps(
+        [{"device_addr": 1, "device_name": "A"}, {"device_addr": 2, "device_name": "B"}]
+    ).encode()
+    second = json.dumps([{"device_addr": 1, "device_name": "A"}]).encode()
+
+    with patch(
+        "custom_components.hafele_local_mqtt.discovery.async_dispatcher_send"
+    ) as dispatcher_send, patch(
+        "custom_components.hafele_local_mqtt.discovery.decode_discovery_list",
+        wraps=decode_discovery_list,
+    ) as decode:
+        discovery._on_lights_message("hafele/lights", first)
+        # The gateway republishes the identical list - not even decoded
+        discovery._on_lights_message("hafele/lights", first)
+        discovery._on_lights_message("hafele/lights", second)
+
+    assert decode.call_count == 2
+    assert dispatcher_send.call_count == 2
+    assert dispatcher_send.call_args_list[0][0][1] == "hafele_local_mqtt_devices_delta_entry1"
+    delta = dispatcher_send.call_args_list[1][0][2]
+    assert delta == DeviceDelta(removed={2: {"device_addr": 2, "device_name": "B"}})
+    assert list(discovery.devices) == [1]
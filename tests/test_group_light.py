@@ -0,0 +1,144 @@
+"""Tests for the Hafele group light entity."""
+import pytest
+from unittest.mock import MagicMock
+
+from custom_components.hafele_local_mqtt.grouplight import (
+    HafeleGroupLightEntity,
+    group_member_addrs,
+)
+
+
+def _member(data, unreachable=False, turns_on_from_lightness=True):
+    coordinator = MagicMock()
+    coordinator.data = data
+    coordinator.unreachable = unreachable
+    coordinator.entity = MagicMock()
+    coordinator.entity.turns_on_from_lightness = turns_on_from_lightness
+    return coordinator
+
+
+@pytest.fixture
+def room(mock_mqtt_client):
+    """A 40-light group, all lights on."""
+    coordinators = {addr: _member({"onoff": 1, "lightness": 0.5}) for addr in range(40)}
+    group = HafeleGroupLightEntity(
+        49152,
+        {"group_name": "Kitchen", "devices": list(range(40)), "group_main_addr": 49152},
+        coordinators,
+        mock_mqtt_client,
+        "hafele",
+    )
+    group.async_write_ha_state = MagicMock()
+    return group, coordinators
+
+
+def test_group_member_addrs_ignores_invalid_entries():
+    """Test only integer device addresses count as members."""
+    assert group_member_addrs({"devices": [1, "2", None, 3]}) == [1, 3]
+    assert group_member_addrs({}) == []
+
+
+@pytest.mark.asyncio
+async def test_group_turn_off_is_one_message(room, mock_mqtt_client):
+    """Test turning off a 40-light room costs one multicast and updates every member."""
+    group, coordinators = room
+
+    await group.async_turn_off()
+
+    mock_mqtt_client.async_publish.assert_called_once_with(
+        "hafele/groups/Kitchen/power", False, qos=1
+    )
+    assert all(c.data["onoff"] == 0 for c in coordinators.values())
+    assert all(c.entity.async_write_ha_state.call_count == 1 for c in coordinators.values())
+    group.async_write_ha_state.assert_called_once()
+    assert group.is_on is False
+
+
+@pytest.mark.asyncio
+async def test_group_turn_on_with_brightness_sends_lightness_only(room, mock_mqtt_client):
+    """Test a dimmed turn_on of verified members is a single lightness multicast."""
+    group, coordinators = room
+
+    await group.async_turn_on(brightness=255, transition=3)
+
+    mock_mqtt_client.async_publish.assert_called_once_with(
+        "hafele/groups/Kitchen/lightness",
+        {"lightness": 1.0, "transition_time": 30},
+        qos=1,
+    )
+    assert group.brightness == 255
+    for coordinator in coordinators.values():
+        coordinator.note_user_command.assert_called_once_with(3)
+
+
+@pytest.mark.asyncio
+async def test_group_turn_on_with_brightness_sends_power_unless_verified(
+    room, mock_mqtt_client
+):
+    """Test power goes first unless every member turns on from lightness alone."""
+    group, coordinators = room
+    coordinators[7].entity.turns_on_from_lightness = False
+
+    await group.async_turn_on(brightness=255)
+
+    assert [c[0][:2] for c in mock_mqtt_client.async_publish.call_args_list] == [
+        ("hafele/groups/Kitchen/power", True),
+        ("hafele/groups/Kitchen/lightness", {"lightness": 1.0}),
+    ]
+
+    # Members not set up yet are not known to turn on from lightness either
+    coordinators[7].entity.turns_on_from_lightness = True
+    del coordinators[39]
+    mock_mqtt_client.async_publish.reset_mock()
+    await group.async_turn_on(brightness=255)
+    assert mock_mqtt_client.async_publish.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_group_turn_off_with_transition_dims_to_zero(room, mock_mqtt_client):
+    """Test a group fade-out dims to 0 (power has no transition_time)."""
+    group, _ = room
+
+    await group.async_turn_off(transition=10)
+
+    mock_mqtt_client.async_publish.assert_called_once_with(
+        "hafele/groups/Kitchen/lightness", {"lightness": 0, "transition_time": 100}, qos=1
+    )
+
+
+def test_group_state_follows_members(room):
+    """Test the group is on if any member is on, with the mean brightness of those on."""
+    group, coordinators = room
+    for addr, coordinator in coordinators.items():
+        coordinator.data = {"onoff": 0, "lightness": 0.0}
+    assert group.is_on is False
+    assert group.brightness is None
+
+    coordinators[0].data = {"onoff": 1, "lightness": 0.2}
+    coordinators[1].data = {"onoff": 1, "lightness": 0.6}
+    assert group.is_on is True
+    assert group.brightness == int(0.4 * 255)
+
+    for coordinator in coordinators.values():
+        coordinator.unreachable = True
+    assert group.available is False
+
+
+def test_group_follows_members_set_up_again(room):
+    """Test the group drops removed members and moves to a re-created member's coordinator."""
+    group, coordinators = room
+    group.follow_members()
+    old_0, old_1 = coordinators[0], coordinators[1]
+    unsub_0 = old_0.async_add_listener.return_value
+    unsub_1 = old_1.async_add_listener.return_value
+
+    coordinators[0] = _member({"onoff": 1, "lightness": 0.5})
+    del coordinators[1]
+    group.follow_members()
+
+    unsub_0.assert_called_once()
+    unsub_1.assert_called_once()
+    coordinators[0].async_add_listener.assert_called_once_with(group.async_write_ha_state)
+    assert group._member_listeners[0][0] is coordinators[0]
+    assert 1 not in group._member_listeners
+    coordinators[2].async_add_listener.assert_called_once()
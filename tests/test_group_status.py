@@ -0,0 +1,166 @@
+"""Tests for group status fan-out and group sweep polling."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.hafele_local_mqtt.const import POLLING_MODE_WINDOWED
+from custom_components.hafele_local_mqtt.groupstatus import (
+    GroupStatusRouter,
+    GroupSweepPoller,
+    group_status_to_light_data,
+)
+from custom_components.hafele_local_mqtt.light import HafeleLightCoordinator
+from custom_components.hafele_local_mqtt.payload import GroupStatus
+
+
+GROUPS = {
+    100: {"group_name": "Kitchen", "devices": list(range(8))},
+    101: {"group_name": "Hall", "devices": [8]},
+}
+
+
+def _coordinator(mock_hass, mock_mqtt_client, addr, data=None):
+    coordinator = HafeleLightCoordinator(
+        mock_hass,
+        mock_mqtt_client,
+        addr,
+        f"Light {addr}",
+        "hafele",
+        30,
+        3,
+        POLLING_MODE_WINDOWED,
+        ["Light"],
+    )
+    coordinator.entity = MagicMock()
+    coordinator._status_data = dict(data or {})
+    coordinator.async_set_updated_data = MagicMock()
+    coordinator.async_refresh = AsyncMock()
+    return coordinator
+
+
+def _group_callback(mock_mqtt_client, group_name):
+    for call in mock_mqtt_client.async_add_group_status_listener.call_args_list:
+        if call[0][0] == group_name:
+            return call[0][1]
+    raise AssertionError(f"no listener for {group_name}")
+
+
+def test_group_status_to_light_data():
+    """Test group status fields map onto lightStatus fields."""
+    assert group_status_to_light_data(GroupStatus("Kitchen", "on", 0.5, None)) == {
+        "lightness": 0.5,
+        "onoff": 1,
+    }
+    assert group_status_to_light_data(GroupStatus("Kitchen", "off", None, 3000)) == {
+        "onoff": 0,
+        "temperature": 3000,
+    }
+    assert group_status_to_light_data(GroupStatus("Kitchen", None, None, None)) == {}
+
+
+@pytest.mark.asyncio
+async def test_group_status_fans_out_to_members(mock_hass, mock_mqtt_client):
+    """Test one group status updates every member light's coordinator."""
+    coordinators = {
+        addr: _coordinator(mock_hass, mock_mqtt_client, addr, {"onoff": 1, "lightness": 0.5})
+        for addr in range(8)
+    }
+    coordinators[3]._status_data = {"onoff": 0, "lightness": 0.0}
+    coordinators[4].unreachable = True
+    router = GroupStatusRouter(mock_mqtt_client, lambda: GROUPS, coordinators, "hafele")
+    await router.async_sync()
+
+    _group_callback(mock_mqtt_client, "Kitchen")(
+        "hafele/groups/Kitchen/status", GroupStatus("Kitchen", "on", 0.5, None)
+    )
+
+    for addr, coordinator in coordinators.items():
+        if addr == 4:
+            # Unreachable lights are left to their own (backed-off) polls
+            assert not coordinator.adaptive_interval.has_fresh_push()
+            continue
+        assert coordinator._status_data == {"onoff": 1, "lightness": 0.5}
+    # Agreeing members count as fresh, the one that disagreed does not
+    assert coordinators[0].adaptive_interval.has_fresh_push()
+    assert not coordinators[3].adaptive_interval.has_fresh_push()
+    coordinators[3].async_set_updated_data.assert_called_once()
+    coordinators[0].async_set_updated_data.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_group_sweep_polls_only_disagreeing_lights(mock_hass, mock_mqtt_client):
+    """Test a sweep is one group GET per room plus device GETs for lights that disagree."""
+    coordinators = {
+        addr: _coordinator(mock_hass, mock_mqtt_client, addr, {"onoff": 1, "lightness": 0.5})
+        for addr in range(8)
+    }
+    coordinators[3]._status_data = {"onoff": 0, "lightness": 0.0}
+    lone = coordinators[9] = _coordinator(mock_hass, mock_mqtt_client, 9)
+    router = GroupStatusRouter(mock_mqtt_client, lambda: GROUPS, coordinators, "hafele")
+    await router.async_sync()
+    kitchen = _group_callback(mock_mqtt_client, "Kitchen")
+
+    async def _respond(topic, payload, **kwargs):
+        # The gateway answers the group GET with one groupStatus
+        asyncio.get_running_loop().call_soon(
+            kitchen, "hafele/groups/Kitchen/status", GroupStatus("Kitchen", "on", 0.5, None)
+        )
+        return True
+
+    mock_mqtt_client.async_publish.side_effect = _respond
+    poller = GroupSweepPoller(coordinators, router, 4, 30, 1)
+
+    await poller.async_run_sweep()
+
+    mock_mqtt_client.async_publish.assert_called_once()
+    assert mock_mqtt_client.async_publish.call_args[0][0] == "hafele/groups/Kitchen/lightnessGet"
+    polled = {addr for addr, c in coordinators.items() if c.async_refresh.await_count}
+    # Light 3 disagreed; light 9 is in no multi-light group
+    assert polled == {3, 9}
+    assert (poller.group_polls, poller.device_polls) == (1, 2)
+    assert lone.async_refresh.await_count == 1
+
+    # Next sweep: the agreeing members are still fresh, nothing is due
+    mock_mqtt_client.async_publish.reset_mock()
+    for coordinator in coordinators.values():
+        coordinator.async_refresh.reset_mock()
+    coordinators[9].adaptive_interval.mark_polled()
+    coordinators[3].adaptive_interval.mark_polled()
+    await poller.async_run_sweep()
+    mock_mqtt_client.async_publish.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_group_sweep_falls_back_to_device_polls_without_answer(
+    mock_hass, mock_mqtt_client
+):
+    """Test members of a group that doesn't answer are polled on their own."""
+    coordinators = {addr: _coordinator(mock_hass, mock_mqtt_client, addr) for addr in range(8)}
+    router = GroupStatusRouter(mock_mqtt_client, lambda: GROUPS, coordinators, "hafele")
+    await router.async_sync()
+    poller = GroupSweepPoller(coordinators, router, 4, 30, 0.01)
+
+    await poller.async_run_sweep()
+
+    assert all(c.async_refresh.await_count == 1 for c in coordinators.values())
+
+
+@pytest.mark.asyncio
+async def test_group_sweep_multicasts_when_whole_group_is_due(mock_hass, mock_mqtt_client):
+    """Test a room whose lights are all due is refreshed with one raw multicast Get."""
+    coordinators = {addr: _coordinator(mock_hass, mock_mqtt_client, addr) for addr in range(8)}
+    router = GroupStatusRouter(mock_mqtt_client, lambda: GROUPS, coordinators, "hafele")
+    await router.async_sync()
+    raw_tracker = MagicMock()
+    # Light 5 misses the multicast
+    raw_tracker.async_refresh_group = AsyncMock(return_value=[coordinators[5]])
+    poller = GroupSweepPoller(coordinators, router, 4, 30, 1, raw_tracker=raw_tracker)
+
+    await poller.async_run_sweep()
+
+    raw_tracker.async_refresh_group.assert_awaited_once()
+    assert raw_tracker.async_refresh_group.call_args[0][0] == 100
+    mock_mqtt_client.async_publish.assert_not_called()
+    polled = {addr for addr, c in coordinators.items() if c.async_refresh.await_count}
+    assert polled == {5}
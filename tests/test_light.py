@@ -1,4 +1,5 @@
 """Tests for the Hafele light platform."""
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -8,11 +9,18 @@ from custom_components.hafele_local_mqtt.light import (
     HafeleLightEntity,
     HafeleLightCoordinator,
     PollPriority,
+    async_setup_entry as light_async_setup_entry,
     run_one_rotational_polling_cycle,
 )
+from custom_components.hafele_local_mqtt.discovery import DeviceDelta
+from custom_components.hafele_local_mqtt.polling import RotationalScheduler
+from custom_components.hafele_local_mqtt.rate_limiter import PublishPriority
 from custom_components.hafele_local_mqtt.const import (
+    DOMAIN,
+    POLLING_MODE_GROUP_SWEEP,
     POLLING_MODE_NORMAL,
     POLLING_MODE_ROTATIONAL,
+    POLLING_MODE_WINDOWED,
     TOPIC_GET_DEVICE_LIGHTNESS,
     TOPIC_GET_DEVICE_CTL,
 )
@@ -25,6 +33,7 @@ def mock_coordinator():
     coordinator.data = {"onoff": 1, "lightness": 0.5, "temperature": 3000}
     coordinator.async_request_refresh = AsyncMock()
     coordinator.polling_mode = POLLING_MODE_NORMAL
+    coordinator.unreachable = False
     coordinator.hass = MagicMock()
     coordinator.hass.async_create_task = AsyncMock()
     return coordinator
@@ -213,6 +222,29 @@ async def test_force_manual_update_rotational_mode(mock_coordinator, sample_devi
     
     # Should only set priority, not publish
     assert entity.priority == PollPriority.HIGH
+    assert not mock_mqtt_client.async_publish.called
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("polling_mode", [POLLING_MODE_WINDOWED, POLLING_MODE_GROUP_SWEEP])
+async def test_force_manual_update_windowed_modes(
+    mock_coordinator, sample_device_info, mock_mqtt_client, polling_mode
+):
+    """Test the sweeping modes, which take no HIGH requests, verify with a GET."""
+    entity = HafeleLightEntity(
+        mock_coordinator, 123, sample_device_info, mock_mqtt_client, "hafele"
+    )
+    mock_coordinator.polling_mode = polling_mode
+
+    with patch("asyncio.sleep", new_callable=AsyncMock):
+        await entity.force_manual_update()
+
+    mock_mqtt_client.async_publish.assert_called_once()
+    topic = mock_mqtt_client.async_publish.call_args[0][0]
+    assert topic == TOPIC_GET_DEVICE_LIGHTNESS.format(
+        prefix="hafele", device_name=entity._device_name
+    )
+    assert mock_mqtt_client.async_publish.call_args[1]["priority"] == PublishPriority.VERIFY
 
 
 @pytest.mark.asyncio
@@ -227,6 +259,7 @@ async def test_coordinator_status_message(mock_hass, mock_mqtt_client):
         30,
         3,
         POLLING_MODE_NORMAL,
+        ["Light"],
     )
     
     # Simulate status message
@@ -250,6 +283,7 @@ async def test_coordinator_update_data(mock_hass, mock_mqtt_client):
         30,
         3,
         POLLING_MODE_NORMAL,
+        ["Light"],
     )
     
     # Mock entity
@@ -257,16 +291,25 @@ async def test_coordinator_update_data(mock_hass, mock_mqtt_client):
     entity.is_multiwhite = False
     coordinator.entity = entity
     
-    # Mock status response
-    coordinator._status_received = True
-    coordinator._status_data = {"lightness": 0.5, "onoff": 1}
-    
-    with patch("asyncio.sleep", new_callable=AsyncMock):
-        result = await coordinator._async_update_data()
+    # The device answers the GET request
+    async def _respond(*args, **kwargs):
+        asyncio.get_running_loop().call_soon(
+            coordinator._on_status_message,
+            "hafele/lights/Test Light/status",
+            {"lightness": 0.5},
+        )
+        return True
+
+    mock_mqtt_client.async_publish.side_effect = _respond
+
+    result = await coordinator._async_update_data()
     
     # Verify publish was called
     mock_mqtt_client.async_publish.assert_called_once()
     assert result["lightness"] == 0.5
+    assert result["onoff"] == 1
+    assert coordinator.last_poll_latency is not None
+    assert coordinator.last_poll_latency < 100
 
 
 @pytest.mark.asyncio
@@ -279,8 +322,9 @@ async def test_coordinator_update_data_timeout(mock_hass, mock_mqtt_client):
         "Test Light",
         "hafele",
         30,
-        1,  # Short timeout
+        0.05,  # Short timeout
         POLLING_MODE_NORMAL,
+        ["Light"],
     )
     
     entity = MagicMock()
@@ -289,13 +333,40 @@ async def test_coordinator_update_data_timeout(mock_hass, mock_mqtt_client):
     coordinator._status_data = {"lightness": 0.3}  # Old data
     
     # No response will come
-    coordinator._status_received = False
-    
-    with patch("asyncio.sleep", new_callable=AsyncMock):
-        result = await coordinator._async_update_data()
+    result = await coordinator._async_update_data()
     
     # Should return old data on timeout
     assert result == {"lightness": 0.3}
+    assert coordinator._status_waiter is None
+
+
+@pytest.mark.asyncio
+async def test_late_poll_reply_is_not_a_push(mock_hass, mock_mqtt_client):
+    """Test an answer arriving after the poll timed out is sampled, not counted as a push."""
+    coordinator = HafeleLightCoordinator(
+        mock_hass,
+        mock_mqtt_client,
+        123,
+        "Test Light",
+        "hafele",
+        30,
+        0.02,
+        POLLING_MODE_NORMAL,
+        ["Light"],
+        polling_timeout_bounds=(0.02, 1),
+    )
+
+    await coordinator._async_update_data()
+    timeout = coordinator.rtt.timeout
+    await asyncio.sleep(0.03)
+    coordinator._on_status_message("hafele/lights/Test Light/status", {"lightness": 0.3})
+
+    assert coordinator.adaptive_interval.last_push is None
+    assert coordinator.rtt.srtt == pytest.approx(0.05, abs=0.04)
+    assert coordinator.rtt.timeout > timeout
+    # Only one late answer per GET - the next status is a push again
+    coordinator._on_status_message("hafele/lights/Test Light/status", {"lightness": 0.4})
+    assert coordinator.adaptive_interval.last_push is not None
 
 
 @pytest.mark.asyncio
@@ -329,22 +400,555 @@ async def test_rotational_polling_high_and_normal_entities_both_polled():
     normal_entity2.coordinator = normal_co2
     normal_co2.entity = normal_entity2
 
-    coordinators = {1: high_co, 2: normal_co1, 3: normal_co2}
-    rr_index = 0
+    scheduler = RotationalScheduler()
+    scheduler.add(1, high_entity)
+    scheduler.add(2, normal_entity1)
+    scheduler.add(3, normal_entity2)
+    scheduler.request_high(1)
     polling_interval = 1
 
     with patch("asyncio.sleep", new_callable=AsyncMock):
-        new_rr_index = await run_one_rotational_polling_cycle(
-            coordinators, rr_index, polling_interval
-        )
+        await run_one_rotational_polling_cycle(scheduler, polling_interval)
 
     # HIGH entity was refreshed and reset
     high_co.async_request_refresh.assert_called_once()
     high_entity.reset_priority.assert_called_once()
 
-    # Exactly one NORMAL entity was refreshed (round-robin at index 0 -> first normal)
+    # Exactly one NORMAL entity was refreshed (the HIGH one gives up its ring turn)
     normal_co1.async_request_refresh.assert_called_once()
     normal_co2.async_request_refresh.assert_not_called()
+    assert scheduler.pending_high == 0
+
+
+@pytest.mark.asyncio
+async def test_coordinator_adaptive_interval(mock_hass, mock_mqtt_client):
+    """Test unchanged poll responses stretch the interval and a pushed change resets it."""
+    coordinator = HafeleLightCoordinator(
+        mock_hass,
+        mock_mqtt_client,
+        123,
+        "Test Light",
+        "hafele",
+        30,
+        1,
+        POLLING_MODE_NORMAL,
+        ["Light"],
+        max_polling_interval=600,
+    )
+
+    async def _respond(*args, **kwargs):
+        asyncio.get_running_loop().call_soon(
+            coordinator._on_status_message,
+            "hafele/lights/Test Light/status",
+            {"lightness": 0.5},
+        )
+        return True
+
+    mock_mqtt_client.async_publish.side_effect = _respond
+    # First response is a change (nothing known yet), then two unchanged ones
+    for _ in range(3):
+        await coordinator._async_update_data()
+    assert coordinator.update_interval.total_seconds() == 120
+
+    # A pushed change (e.g. a wall switch) snaps back to the floor
+    coordinator._on_status_message("hafele/lights/Test Light/status", {"lightness": 0.0})
+    assert coordinator.update_interval.total_seconds() == 30
+
+    # ...and makes the next scheduled poll unnecessary
+    result = await coordinator._async_update_data()
+    assert mock_mqtt_client.async_publish.call_count == 3
+    assert result["lightness"] == 0.0
+
+    # A command invalidates the pushed status
+    coordinator.note_user_command()
+    await coordinator._async_update_data()
+    assert mock_mqtt_client.async_publish.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_coordinator_marks_unreachable_and_revives_on_push(
+    mock_hass, mock_mqtt_client, sample_device_info
+):
+    """Test missed polls make a light unavailable and any status brings it back."""
+    unreachable_devices = set()
+    coordinator = HafeleLightCoordinator(
+        mock_hass,
+        mock_mqtt_client,
+        123,
+        "Test Light",
+        "hafele",
+        30,
+        0.01,
+        POLLING_MODE_NORMAL,
+        ["Light"],
+        max_polling_interval=600,
+        polling_timeout_bounds=(0.01, 0.01),
+        unreachable_devices=unreachable_devices,
+    )
+
+    for _ in range(2):
+        await coordinator._async_update_data()
+    assert not coordinator.unreachable
+    await coordinator._async_update_data()
+    assert coordinator.unreachable
+    assert unreachable_devices == {123}
+    assert coordinator.unreachable_count == 1
+
+    # Further misses back off exponentially
+    interval = coordinator.update_interval.total_seconds()
+    await coordinator._async_update_data()
+    assert coordinator.update_interval.total_seconds() == interval * 2
+
+    entity = HafeleLightEntity(
+        coordinator, 123, sample_device_info, mock_mqtt_client, "hafele"
+    )
+    assert entity.available is False
+
+    coordinator._on_status_message("hafele/lights/Test Light/status", {"lightness": 0.4})
+    assert not coordinator.unreachable
+    assert unreachable_devices == set()
+    assert coordinator.update_interval.total_seconds() == 30
+    assert entity.available is True
+
+
+def _verification_setup(
+    mock_hass, mock_mqtt_client, sample_device_info, single_message_turn_on=False
+):
+    coordinator = HafeleLightCoordinator(
+        mock_hass,
+        mock_mqtt_client,
+        123,
+        "Test Light",
+        "hafele",
+        30,
+        3,
+        POLLING_MODE_NORMAL,
+        ["Light"],
+    )
+    mock_hass.async_create_task = MagicMock(
+        side_effect=lambda coro: asyncio.get_running_loop().create_task(coro)
+    )
+    entity = HafeleLightEntity(
+        coordinator,
+        123,
+        sample_device_info,
+        mock_mqtt_client,
+        "hafele",
+        single_message_turn_on=single_message_turn_on,
+    )
+    return coordinator, entity
+
+
+def _get_requests(mock_mqtt_client):
+    return [
+        c for c in mock_mqtt_client.async_publish.call_args_list
+        if c[0][0].endswith("Get")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_verification_replaced_by_newer_command(
+    mock_hass, mock_mqtt_client, sample_device_info
+):
+    """Test ten quick commands leave a single verification and a single GET."""
+    coordinator, entity = _verification_setup(mock_hass, mock_mqtt_client, sample_device_info)
+
+    with patch("custom_components.hafele_local_mqtt.light.VERIFY_SETTLE_DELAY", 0.02):
+        for step in range(10):
+            await entity.async_turn_on(brightness=25 * (step + 1), transition=0)
+        pending = entity._verify_task
+        await asyncio.sleep(0.1)
+
+    assert pending.done() and not pending.cancelled()
+    assert len(_get_requests(mock_mqtt_client)) == 1
+    assert coordinator._status_matchers == []
+
+
+@pytest.mark.asyncio
+async def test_verification_skipped_when_light_reports_state(
+    mock_hass, mock_mqtt_client, sample_device_info
+):
+    """Test a matching status push makes the verification GET unnecessary."""
+    coordinator, entity = _verification_setup(mock_hass, mock_mqtt_client, sample_device_info)
+
+    with patch("custom_components.hafele_local_mqtt.light.VERIFY_SETTLE_DELAY", 0.05):
+        await entity.async_turn_on(brightness=128, transition=0)
+        await asyncio.sleep(0)
+        # Intermediate ramp value doesn't match, the final one does (mesh-quantized)
+        coordinator._on_status_message("hafele/lights/Test Light/status", {"lightness": 0.2})
+        coordinator._on_status_message("hafele/lights/Test Light/status", {"lightness": 0.502})
+        await entity._verify_task
+
+    assert _get_requests(mock_mqtt_client) == []
+
+
+@pytest.mark.asyncio
+async def test_verification_delay_follows_transition(
+    mock_hass, mock_mqtt_client, sample_device_info
+):
+    """Test the verification waits for the requested transition to finish."""
+    coordinator, entity = _verification_setup(mock_hass, mock_mqtt_client, sample_device_info)
+
+    with patch("custom_components.hafele_local_mqtt.light.VERIFY_SETTLE_DELAY", 0):
+        await entity.async_turn_off(transition=0.1)
+        await asyncio.sleep(0.05)
+        assert _get_requests(mock_mqtt_client) == []
+        await entity._verify_task
+
+    assert len(_get_requests(mock_mqtt_client)) == 1
+
+
+@pytest.mark.asyncio
+async def test_turn_on_after_fade_off_verifies_onoff_only(
+    mock_hass, mock_mqtt_client, sample_device_info
+):
+    """Test a power-only turn_on is confirmed by whatever lightness the light restores."""
+    coordinator, entity = _verification_setup(mock_hass, mock_mqtt_client, sample_device_info)
+    # The fade-off dimmed the light to 0
+    entity._last_known_lightness = 0.0
+
+    with patch("custom_components.hafele_local_mqtt.light.VERIFY_DEFAULT_DELAY", 0.05):
+        await entity.async_turn_on()
+        await asyncio.sleep(0)
+        coordinator._on_status_message("hafele/lights/Test Light/status", {"lightness": 0.7})
+        await entity._verify_task
+
+    assert _get_requests(mock_mqtt_client) == []
+
+
+async def _published_topics(mock_mqtt_client, service, **kwargs):
+    """Call an entity service and return the topics it published to, in order."""
+    mock_mqtt_client.async_publish.reset_mock()
+    await service(**kwargs)
+    return [c[0][0].rsplit("/", 1)[-1] for c in mock_mqtt_client.async_publish.call_args_list]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("single_message", "last_known_lightness", "kwargs", "expected"),
+    [
+        (False, None, {"brightness": 128}, ["power", "lightness"]),
+        (True, None, {"brightness": 128}, ["lightness"]),
+        (False, 0.4, {}, ["power", "lightness"]),
+        (True, 0.4, {}, ["lightness"]),
+        (False, None, {}, ["power"]),
+        (True, None, {}, ["power"]),
+        # Lightness 0 would switch the light off again
+        (False, 0.0, {}, ["power"]),
+        (True, 0.0, {}, ["power"]),
+    ],
+)
+async def test_turn_on_message_count(
+    mock_coordinator,
+    sample_device_info,
+    mock_mqtt_client,
+    single_message,
+    last_known_lightness,
+    kwargs,
+    expected,
+):
+    """Test the number of messages one monochrome turn_on publishes."""
+    # Only count the publishes of the service call itself, not of its verification
+    mock_coordinator.hass.async_create_task = MagicMock(side_effect=lambda coro: coro.close())
+    entity = HafeleLightEntity(
+        mock_coordinator,
+        123,
+        sample_device_info,
+        mock_mqtt_client,
+        "hafele",
+        single_message_turn_on=single_message,
+    )
+    entity._last_known_lightness = last_known_lightness
+
+    assert await _published_topics(mock_mqtt_client, entity.async_turn_on, **kwargs) == expected
+    assert mock_coordinator.data["onoff"] == 1
+    assert await _published_topics(mock_mqtt_client, entity.async_turn_off) == ["power"]
+
+
+@pytest.mark.asyncio
+async def test_single_message_turn_on_verified_by_status(
+    mock_hass, mock_mqtt_client, sample_device_info
+):
+    """Test a light reporting the commanded lightness confirms single-message mode."""
+    coordinator, entity = _verification_setup(
+        mock_hass, mock_mqtt_client, sample_device_info, single_message_turn_on=True
+    )
+
+    with patch("custom_components.hafele_local_mqtt.light.VERIFY_SETTLE_DELAY", 0.05):
+        await entity.async_turn_on(brightness=128, transition=0)
+        await asyncio.sleep(0)
+        coordinator._on_status_message("hafele/lights/Test Light/status", {"lightness": 0.502})
+        await entity._verify_task
+
+    assert entity._single_message_verified is True
+    assert await _published_topics(
+        mock_mqtt_client, entity.async_turn_on, brightness=200
+    ) == ["lightness"]
+
+
+@pytest.mark.asyncio
+async def test_single_message_turn_on_falls_back_to_power(
+    mock_hass, mock_mqtt_client, sample_device_info
+):
+    """Test a light that stays off after a lightness-only turn_on gets power again."""
+    coordinator, entity = _verification_setup(
+        mock_hass, mock_mqtt_client, sample_device_info, single_message_turn_on=True
+    )
+
+    with patch("custom_components.hafele_local_mqtt.light.VERIFY_SETTLE_DELAY", 0.02):
+        await entity.async_turn_on(brightness=128, transition=0)
+        await asyncio.sleep(0.05)
+        # The verification GET went out; the light answers it still being off
+        assert len(_get_requests(mock_mqtt_client)) == 1
+        coordinator._on_status_message("hafele/lights/Test Light/status", {"lightness": 0})
+        await entity._verify_task
+
+    assert entity._single_message_verified is False
+    assert mock_mqtt_client.async_publish.call_args[0][:2] == (
+        "hafele/lights/Test Light/power",
+        True,
+    )
+    assert coordinator._status_matchers == []
+    assert await _published_topics(
+        mock_mqtt_client, entity.async_turn_on, brightness=128
+    ) == ["power", "lightness"]
+
+
+@pytest.mark.asyncio
+async def test_turn_on_transition_is_one_gateway_message(
+    mock_coordinator, sample_device_info, sample_multiwhite_device_info, mock_mqtt_client
+):
+    """Test a fade is sent as one command carrying transition_time in deciseconds."""
+    mock_coordinator.hass.async_create_task = MagicMock(side_effect=lambda coro: coro.close())
+    entity = HafeleLightEntity(
+        mock_coordinator, 123, sample_device_info, mock_mqtt_client, "hafele"
+    )
+    assert await _published_topics(
+        mock_mqtt_client, entity.async_turn_on, brightness=128, transition=600
+    ) == ["lightness"]
+    assert mock_mqtt_client.async_publish.call_args[0][1] == {
+        "lightness": 0.51,
+        "transition_time": 6000,
+    }
+    assert mock_coordinator.data["onoff"] == 1
+
+    multiwhite = HafeleLightEntity(
+        mock_coordinator, 124, sample_multiwhite_device_info, mock_mqtt_client, "hafele"
+    )
+    # Clamped to the gateway's limit
+    assert await _published_topics(
+        mock_mqtt_client, multiwhite.async_turn_on, brightness=255, transition=100000
+    ) == ["ctl"]
+    assert mock_mqtt_client.async_publish.call_args[0][1]["transition_time"] == 372000
+
+
+@pytest.mark.asyncio
+async def test_turn_off_transition_dims_to_zero(
+    mock_coordinator, sample_device_info, mock_mqtt_client
+):
+    """Test a fade-out dims to 0 (power has no transition_time)."""
+    mock_coordinator.hass.async_create_task = MagicMock(side_effect=lambda coro: coro.close())
+    entity = HafeleLightEntity(
+        mock_coordinator, 123, sample_device_info, mock_mqtt_client, "hafele"
+    )
+
+    assert await _published_topics(
+        mock_mqtt_client, entity.async_turn_off, transition=2.5
+    ) == ["lightness"]
+    assert mock_mqtt_client.async_publish.call_args[0][1] == {
+        "lightness": 0,
+        "transition_time": 25,
+    }
+    assert mock_coordinator.data["onoff"] == 0
+    # Instant turn_off keeps using power
+    assert await _published_topics(
+        mock_mqtt_client, entity.async_turn_off, transition=0
+    ) == ["power"]
+
+
+@pytest.mark.asyncio
+async def test_coordinator_holds_polls_during_transition(mock_hass, mock_mqtt_client):
+    """Test no poll catches a light halfway through a commanded fade."""
+    coordinator = HafeleLightCoordinator(
+        mock_hass,
+        mock_mqtt_client,
+        123,
+        "Test Light",
+        "hafele",
+        30,
+        3,
+        POLLING_MODE_NORMAL,
+        ["Light"],
+    )
+
+    coordinator.note_user_command(transition=600)
+    assert not coordinator.is_poll_due()
+    await coordinator._async_update_data()
+    mock_mqtt_client.async_publish.assert_not_called()
+
+    coordinator.note_user_command()
+    assert coordinator.is_poll_due()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_push_mid_transition_doesnt_skip_command_poll(
+    mock_hass, mock_mqtt_client
+):
+    """Test a push with an intermediate value doesn't stand in for the post-command poll."""
+    coordinator = HafeleLightCoordinator(
+        mock_hass,
+        mock_mqtt_client,
+        123,
+        "Test Light",
+        "hafele",
+        30,
+        0.01,
+        POLLING_MODE_NORMAL,
+        ["Light"],
+    )
+    coordinator.async_set_updated_data = MagicMock()
+
+    coordinator.note_user_command(transition=600)
+    coordinator._on_status_message(
+        "hafele/lights/Test Light/status", {"onoff": 1, "lightness": 0.3}
+    )
+    coordinator.adaptive_interval.hold_until = None  # the fade ended
+
+    assert coordinator.adaptive_interval.has_fresh_push()
+    assert coordinator.is_poll_due()
+    await coordinator._async_update_data()
+    mock_mqtt_client.async_publish.assert_called_once()
+
+
+async def _setup_lights(mock_hass, mock_mqtt_client, mock_discovery, devices):
+    """Set up the light platform; return its data, delta handler, tasks and listeners."""
+    mock_discovery.get_all_devices.return_value = devices
+    mock_discovery.devices_signal = "hafele_local_mqtt_devices_delta_entry1"
+    status_listeners = {}
+
+    async def _add_listener(device_name, callback):
+        # Registering takes a loop iteration, like the real subscription router
+        await asyncio.sleep(0)
+        status_listeners[device_name] = AsyncMock()
+        return status_listeners[device_name]
+
+    mock_mqtt_client.async_add_device_status_listener = AsyncMock(side_effect=_add_listener)
+    data = mock_hass.data[DOMAIN]["entry1"] = {
+        "mqtt_client": mock_mqtt_client,
+        "discovery": mock_discovery,
+        "topic_prefix": "hafele",
+        "polling_interval": 30,
+        "polling_timeout": 3,
+        "polling_mode": POLLING_MODE_NORMAL,
+        "enable_groups": False,
+    }
+    entry = MagicMock(entry_id="entry1")
+    tasks = []
+    mock_hass.async_create_task = MagicMock(
+        side_effect=lambda coro: tasks.append(asyncio.ensure_future(coro))
+    )
+    add_entities = MagicMock()
+
+    with patch(
+        "custom_components.hafele_local_mqtt.light.async_dispatcher_connect"
+    ) as dispatcher_connect, patch("custom_components.hafele_local_mqtt.light.er") as er:
+        await light_async_setup_entry(mock_hass, entry, add_entities)
+    signal, on_delta = dispatcher_connect.call_args[0][1:]
+    assert signal == mock_discovery.devices_signal
+    registry = er.async_get.return_value
+    return data, on_delta, tasks, status_listeners, registry, add_entities
+
+
+def _lights(*addrs):
+    return {
+        addr: {"device_addr": addr, "device_name": f"Light {addr}", "device_types": ["Light"]}
+        for addr in addrs
+    }
+
+
+@pytest.mark.asyncio
+async def test_removed_light_is_torn_down(mock_hass, mock_mqtt_client, mock_discovery):
+    """Test a light dropped from discovery loses its entity, coordinator and listener."""
+    devices = _lights(1, 2)
+    data, on_delta, tasks, status_listeners, registry, _ = await _setup_lights(
+        mock_hass, mock_mqtt_client, mock_discovery, devices
+    )
+    coordinators = data["coordinators"]
+    assert set(coordinators) == {1, 2}
+    entity = coordinators[2].entity
+
+    on_delta(DeviceDelta(removed={2: devices[2]}))
+    await asyncio.gather(*tasks)
+
+    assert set(coordinators) == {1}
+    status_listeners["Light 2"].assert_awaited_once()
+    status_listeners["Light 1"].assert_not_awaited()
+    assert entity.coordinator.entity is None
+    # A light missing from one list keeps its registry entry (entity ID, name, area)
+    registry.async_remove.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_removed_light_entity_cleans_up(mock_hass, mock_mqtt_client, mock_discovery):
+    """Test a removed light's entity leaves HA, cancelling its pending verification."""
+    devices = _lights(1, 2)
+    data, on_delta, tasks, status_listeners, registry, _ = await _setup_lights(
+        mock_hass, mock_mqtt_client, mock_discovery, devices
+    )
+    entity = data["coordinators"][2].entity
+    entity.hass = mock_hass
+    # HA runs the entity's own cleanup when it's removed
+    entity.async_remove = AsyncMock(side_effect=entity.async_will_remove_from_hass)
+    verification = asyncio.ensure_future(asyncio.sleep(60))
+    entity._verify_task = verification
+
+    on_delta(DeviceDelta(removed={2: devices[2]}))
+    await asyncio.gather(*tasks)
+    await asyncio.sleep(0)
+
+    entity.async_remove.assert_awaited_once_with()
+    assert verification.cancelled()
+    status_listeners["Light 2"].assert_awaited_once()
+    registry.async_remove.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_changed_light_is_updated_in_place(mock_hass, mock_mqtt_client, mock_discovery):
+    """Test a renamed light keeps its entity and registry entry and listens under its new name."""
+    devices = _lights(1, 2)
+    data, on_delta, tasks, status_listeners, registry, add_entities = await _setup_lights(
+        mock_hass, mock_mqtt_client, mock_discovery, devices
+    )
+    coordinator = data["coordinators"][2]
+    entity = coordinator.entity
+
+    renamed = {**devices[2], "device_name": "Hall Light", "location": "Hall"}
+    on_delta(DeviceDelta(changed={2: renamed}))
+    await asyncio.gather(*tasks)
+
+    assert data["coordinators"][2] is coordinator
+    assert coordinator.entity is entity
+    assert entity.device_name == "Hall Light"
+    assert entity.device_info is renamed
+    status_listeners["Light 2"].assert_awaited_once()
+    assert "Hall Light" in status_listeners
+    assert coordinator.response_topics == ["hafele/lights/Hall Light/status"]
+    registry.async_remove.assert_not_called()
+    assert add_entities.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_devices_deltas_are_applied_in_order(mock_hass, mock_mqtt_client, mock_discovery):
+    """Test a light added and removed again by back-to-back deltas leaves nothing behind."""
+    devices = _lights(1)
+    data, on_delta, tasks, status_listeners, _, _ = await _setup_lights(
+        mock_hass, mock_mqtt_client, mock_discovery, devices
+    )
+    light = _lights(3)
+
+    on_delta(DeviceDelta(added=light))
+    on_delta(DeviceDelta(removed=light))
+    await asyncio.gather(*tasks)
 
-    # Round-robin index advanced by 1
-    assert new_rr_index == 1
+    assert set(data["coordinators"]) == {1}
+    status_listeners["Light 3"].assert_awaited_once()
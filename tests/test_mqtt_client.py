@@ -1,9 +1,12 @@
 """Tests for Hafele MQTT client."""
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
+import asyncio
 import json
 
 from custom_components.hafele_local_mqtt.mqtt_client import HafeleMQTTClient
+from custom_components.hafele_local_mqtt.discovery import HafeleDiscovery
+from custom_components.hafele_local_mqtt.payload import LightStatus
 
 
 @pytest.mark.asyncio
@@ -99,3 +102,317 @@ async def test_mqtt_client_subscribe(mock_hass):
         
         assert unsubscribe is not None
         assert "test/topic" in client._subscriptions
+
+
+@pytest.mark.asyncio
+async def test_device_status_listeners_share_one_subscription(mock_hass):
+    """Test that all device status listeners are served by one wildcard subscription."""
+    with patch("custom_components.hafele_local_mqtt.mqtt_client.mqtt") as mock_mqtt:
+        mock_mqtt.is_connected.return_value = True
+        mock_mqtt.async_subscribe = AsyncMock(return_value=MagicMock())
+
+        client = HafeleMQTTClient(mock_hass, "hafele")
+        await client.async_connect()
+
+        callbacks = {name: MagicMock() for name in ("Light 1", "Light 2", "Light 3")}
+        for name, callback in callbacks.items():
+            await client.async_add_device_status_listener(name, callback)
+
+        mock_mqtt.async_subscribe.assert_called_once()
+        assert mock_mqtt.async_subscribe.call_args[0][1] == "hafele/lights/+/status"
+
+        # Route a message through the HA MQTT message handler
+        message_received = mock_mqtt.async_subscribe.call_args[0][2]
+        msg = MagicMock()
+        msg.topic = "hafele/lights/Light 2/status"
+        msg.payload = json.dumps({"lightness": 0.4})
+        await message_received(msg)
+
+        callbacks["Light 2"].assert_called_once_with(
+            "hafele/lights/Light 2/status", LightStatus(lightness=0.4)
+        )
+        callbacks["Light 1"].assert_not_called()
+        callbacks["Light 3"].assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_device_status_subscription_released_with_last_listener(mock_hass):
+    """Test that the wildcard subscription is dropped when the last listener is removed."""
+    with patch("custom_components.hafele_local_mqtt.mqtt_client.mqtt") as mock_mqtt:
+        mock_mqtt.is_connected.return_value = True
+        ha_unsubscribe = MagicMock()
+        mock_mqtt.async_subscribe = AsyncMock(return_value=ha_unsubscribe)
+
+        client = HafeleMQTTClient(mock_hass, "hafele")
+        await client.async_connect()
+
+        remove_1 = await client.async_add_device_status_listener("Light 1", MagicMock())
+        remove_2 = await client.async_add_device_status_listener("Light 2", MagicMock())
+
+        await remove_1()
+        ha_unsubscribe.assert_not_called()
+        await remove_2()
+        ha_unsubscribe.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_direct_listener_dispatches_wildcard_subscriptions(mock_hass):
+    """Test the direct-broker listener fans out to wildcard and exact subscribers."""
+    client = HafeleMQTTClient(mock_hass, "hafele", broker="localhost")
+    client._mqtt_client = MagicMock()
+    client._mqtt_client.subscribe = AsyncMock()
+    client._connected = True
+
+    wildcard, exact = MagicMock(), MagicMock()
+    await client.async_subscribe("hafele/lights/+/status", wildcard)
+    await client.async_subscribe("hafele/lights/Light 1/status", exact)
+
+    async def _messages():
+        for topic in ("hafele/lights/Light 1/status", "hafele/lights/Light 2/status", "other"):
+            msg = MagicMock()
+            msg.topic.value = topic
+            msg.payload = b'{"lightness": 0.5}'
+            yield msg
+
+    client._mqtt_client.messages = _messages()
+    await client._message_listener()
+
+    assert wildcard.call_count == 2
+    exact.assert_called_once_with("hafele/lights/Light 1/status", {"lightness": 0.5})
+
+
+@pytest.mark.asyncio
+async def test_publish_coalesces_slider_storm(mock_hass):
+    """Test rapid lightness commands collapse to the first and the latest value."""
+    with patch("custom_components.hafele_local_mqtt.mqtt_client.mqtt") as mock_mqtt:
+        mock_mqtt.async_publish = AsyncMock()
+        client = HafeleMQTTClient(mock_hass, "hafele", coalesce_window=0.05)
+
+        topic = "hafele/lights/Light 1/lightness"
+        for step in range(1, 21):
+            await client.async_publish(topic, {"lightness": step / 20}, qos=1)
+        await asyncio.sleep(0.15)
+
+        payloads = [c[0][2] for c in mock_mqtt.async_publish.call_args_list]
+        assert payloads == [json.dumps({"lightness": 0.05}), json.dumps({"lightness": 1.0})]
+
+
+@pytest.mark.asyncio
+async def test_publish_coalescing_keeps_command_order(mock_hass):
+    """Test a later power command isn't overtaken by an earlier pending lightness."""
+    with patch("custom_components.hafele_local_mqtt.mqtt_client.mqtt") as mock_mqtt:
+        mock_mqtt.async_publish = AsyncMock()
+        client = HafeleMQTTClient(mock_hass, "hafele", coalesce_window=0.05)
+
+        await client.async_publish("hafele/lights/L/lightness", {"lightness": 0.5})
+        await client.async_publish("hafele/lights/L/lightness", {"lightness": 0.6})
+        await client.async_publish("hafele/lights/L/power", False)
+        await asyncio.sleep(0.15)
+
+        sent = [(c[0][1], c[0][2]) for c in mock_mqtt.async_publish.call_args_list]
+        assert sent == [
+            ("hafele/lights/L/lightness", json.dumps({"lightness": 0.5})),
+            ("hafele/lights/L/lightness", json.dumps({"lightness": 0.6})),
+            ("hafele/lights/L/power", "false"),
+        ]
+
+
+@pytest.mark.asyncio
+async def test_publish_does_not_coalesce_get_requests(mock_hass):
+    """Test status requests and other topics are never coalesced."""
+    with patch("custom_components.hafele_local_mqtt.mqtt_client.mqtt") as mock_mqtt:
+        mock_mqtt.async_publish = AsyncMock()
+        client = HafeleMQTTClient(mock_hass, "hafele", coalesce_window=0.05)
+
+        for _ in range(3):
+            await client.async_publish("hafele/lights/L/lightnessGet", {})
+
+        assert mock_mqtt.async_publish.call_count == 3
+
+
+class _FakeBrokerConnection:
+    """Minimal aiomqtt.Client stand-in whose message stream can fail."""
+
+    def __init__(self, messages, fail_after=False):
+        self._messages = messages
+        self._fail_after = fail_after
+        self.subscribe = AsyncMock()
+        self.unsubscribe = AsyncMock()
+        self.publish = AsyncMock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    @property
+    def messages(self):
+        async def _iterate():
+            for topic, payload in self._messages:
+                msg = MagicMock()
+                msg.topic.value = topic
+                msg.payload = payload
+                yield msg
+            if self._fail_after:
+                raise RuntimeError("connection lost")
+            await asyncio.Event().wait()
+
+        return _iterate()
+
+
+@pytest.mark.asyncio
+async def test_direct_connection_reconnects_and_resubscribes(mock_hass):
+    """Test a dropped direct connection is re-established and subscriptions restored."""
+    first = _FakeBrokerConnection([], fail_after=True)
+    second = _FakeBrokerConnection([("hafele/lights", b"[]")])
+    connections = iter([first, second])
+
+    with patch(
+        "custom_components.hafele_local_mqtt.mqtt_client.MQTTClient",
+        side_effect=lambda **kwargs: next(connections),
+    ), patch.object(HafeleMQTTClient, "_backoff_delay", return_value=0):
+        client = HafeleMQTTClient(mock_hass, "hafele", broker="localhost")
+        callback = MagicMock()
+        # Subscribe before the listener starts so the drop happens afterwards
+        client._mqtt_client = first
+        client._connected = True
+        await client.async_subscribe("hafele/lights", callback, qos=1)
+        client._message_listener_task = asyncio.create_task(client._connection_supervisor())
+
+        for _ in range(20):
+            await asyncio.sleep(0)
+        assert client.connected is True
+        assert client._mqtt_client is second
+        second.subscribe.assert_called_once_with([("hafele/lights", 1)])
+        callback.assert_called_once_with("hafele/lights", [])
+
+        await client.async_disconnect()
+        assert client.connected is False
+
+
+@pytest.mark.asyncio
+async def test_non_utf8_payload_keeps_direct_connection_up(mock_hass):
+    """Test a payload that is neither JSON nor UTF-8 doesn't end the broker session."""
+    broker = _FakeBrokerConnection(
+        [("hafele/lights", b"\xff\xfe"), ("hafele/lights", b"[]")]
+    )
+
+    with patch(
+        "custom_components.hafele_local_mqtt.mqtt_client.MQTTClient",
+        side_effect=AssertionError("reconnected"),
+    ):
+        client = HafeleMQTTClient(mock_hass, "hafele", broker="localhost")
+        callback = MagicMock()
+        client._mqtt_client = broker
+        client._connected = True
+        await client.async_subscribe("hafele/lights", callback, qos=1)
+        client._message_listener_task = asyncio.create_task(client._connection_supervisor())
+
+        for _ in range(20):
+            await asyncio.sleep(0)
+        assert client.connected is True
+        assert client._mqtt_client is broker
+        assert callback.call_args_list == [
+            call("hafele/lights", "\ufffd\ufffd"),
+            call("hafele/lights", []),
+        ]
+
+        await client.async_disconnect()
+
+
+@pytest.mark.asyncio
+async def test_subscribe_many_direct_sends_one_packet(mock_hass):
+    """Test bulk subscribe/unsubscribe use a single broker call in direct mode."""
+    client = HafeleMQTTClient(mock_hass, "hafele", broker="localhost")
+    client._mqtt_client = _FakeBrokerConnection([])
+    client._connected = True
+
+    topics = [f"hafele/lights/Light {i}/status" for i in range(100)]
+    unsubscribers = await client.async_subscribe_many(
+        [(topic, MagicMock()) for topic in topics], qos=1
+    )
+
+    assert len(unsubscribers) == 100
+    client._mqtt_client.subscribe.assert_called_once_with([(topic, 1) for topic in topics])
+
+    await client.async_unsubscribe_many(topics)
+    client._mqtt_client.unsubscribe.assert_called_once_with(topics)
+    assert client._subscriptions == {}
+    assert len(client._topic_matcher) == 0
+
+
+@pytest.mark.asyncio
+async def test_ensure_status_subscriptions_batches_filters(mock_hass):
+    """Test both wildcard status filters go out in one subscribe call."""
+    client = HafeleMQTTClient(mock_hass, "hafele", broker="localhost")
+    client._mqtt_client = _FakeBrokerConnection([])
+    client._connected = True
+
+    await client.async_ensure_status_subscriptions()
+    await client.async_add_device_status_listener("Light 1", MagicMock())
+
+    client._mqtt_client.subscribe.assert_called_once_with(
+        [("hafele/lights/+/status", 0), ("hafele/groups/+/status", 0)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_shared_topic_keeps_every_subscriber(mock_hass):
+    """Test two subscribers share one broker subscription, released with the last."""
+    with patch("custom_components.hafele_local_mqtt.mqtt_client.mqtt") as mock_mqtt:
+        ha_unsubscribe = MagicMock()
+        mock_mqtt.async_subscribe = AsyncMock(return_value=ha_unsubscribe)
+        client = HafeleMQTTClient(mock_hass, "hafele")
+
+        first, second = MagicMock(), MagicMock()
+        unsub_first = await client.async_subscribe("hafele/lights", first)
+        unsub_second = await client.async_subscribe("hafele/lights", second)
+        mock_mqtt.async_subscribe.assert_called_once()
+
+        message_received = mock_mqtt.async_subscribe.call_args[0][2]
+        msg = MagicMock()
+        msg.topic = "hafele/lights"
+        msg.payload = b"[]"
+        await message_received(msg)
+        first.assert_called_once_with("hafele/lights", [])
+        second.assert_called_once_with("hafele/lights", [])
+
+        await unsub_first()
+        await unsub_first()  # calling twice must not drop the other subscriber
+        ha_unsubscribe.assert_not_called()
+        await unsub_second()
+        ha_unsubscribe.assert_called_once()
+        assert client.subscription_count == 0
+
+
+@pytest.mark.asyncio
+async def test_reload_cycles_leak_no_subscriptions(mock_hass):
+    """Test 100 setup/unload cycles leave no live broker subscriptions behind."""
+    live = set()
+
+    async def fake_subscribe(hass, topic, msg_callback, qos=0, encoding=None):
+        token = object()
+        live.add(token)
+        return lambda: live.discard(token)
+
+    with patch("custom_components.hafele_local_mqtt.mqtt_client.mqtt") as mock_mqtt:
+        mock_mqtt.async_subscribe = fake_subscribe
+        for _ in range(100):
+            client = HafeleMQTTClient(mock_hass, "hafele")
+            discovery = HafeleDiscovery(mock_hass, client, "hafele")
+            await discovery.async_start()
+            removers = [
+                await client.async_add_device_status_listener(f"Light {i}", MagicMock())
+                for i in range(5)
+            ]
+            # Discovery topics plus the shared status wildcard
+            assert len(live) == 4
+
+            for remove in removers:
+                await remove()
+            await discovery.async_stop()
+            await client.async_disconnect()
+            assert client.subscription_count == 0
+
+    assert live == set()
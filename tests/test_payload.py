@@ -0,0 +1,115 @@
+"""Tests for Hafele payload decoding."""
+import json
+
+import pytest
+
+from custom_components.hafele_local_mqtt.payload import (
+    GroupStatus,
+    LightStatus,
+    PayloadDecodeError,
+    RawLightStatus,
+    decode_discovery_list,
+    decode_group_status,
+    decode_json,
+    decode_light_status,
+    decode_raw_status,
+)
+
+
+def _raw(opcode, payload, source="0x0012"):
+    return json.dumps(
+        {
+            "source": source,
+            "destination": "0x0001",
+            "opcode": opcode,
+            "payload": payload,
+            "sequence_number": 7,
+            "ttl": 5,
+            "rssi": -60,
+        }
+    ).encode()
+
+
+def test_decode_json_falls_back_to_text():
+    """Test generic decoding keeps the JSON-or-text behaviour."""
+    assert decode_json(b'{"a": 1}') == {"a": 1}
+    assert decode_json(b"true") is True
+    assert decode_json(b"not json") == "not json"
+    assert decode_json("plain") == "plain"
+    assert decode_json(b"\xff\xfe") == "\ufffd\ufffd"
+
+
+def test_decode_light_status():
+    """Test lightStatus decoding into a typed record."""
+    raw = json.dumps(
+        {"device_name": "Light 1", "onoff": 1, "lightness": 0.5, "unknown": "x"}
+    ).encode()
+    status = decode_light_status(raw)
+
+    assert status == LightStatus(device_name="Light 1", onoff=1, lightness=0.5)
+    assert status.as_dict() == {"device_name": "Light 1", "onoff": 1, "lightness": 0.5}
+
+
+def test_decode_light_status_normalizes_onoff_and_types():
+    """Test string/bool power states are normalized and bad values dropped."""
+    assert decode_light_status(b'{"onoff": "on"}').onoff == 1
+    assert decode_light_status(b'{"onoff": false}').onoff == 0
+    assert decode_light_status(b'{"lightness": "high"}').lightness is None
+
+
+def test_decode_light_status_rejects_non_objects():
+    """Test non-object payloads raise PayloadDecodeError."""
+    with pytest.raises(PayloadDecodeError):
+        decode_light_status(b"[1, 2]")
+    with pytest.raises(PayloadDecodeError):
+        decode_light_status(b"not json")
+
+
+def test_decode_group_status():
+    """Test groupStatus decoding normalizes onOff."""
+    status = decode_group_status(b'{"group_name": "Kitchen", "onOff": "ON", "lightness": 1}')
+    assert status == GroupStatus(group_name="Kitchen", on_off="on", lightness=1)
+
+
+def test_decode_discovery_list():
+    """Test discovery decoding returns only object entries."""
+    raw = b'[{"device_addr": 1}, "junk", {"device_addr": 2}]'
+    assert decode_discovery_list(raw) == [{"device_addr": 1}, {"device_addr": 2}]
+
+    with pytest.raises(PayloadDecodeError):
+        decode_discovery_list(b'{"device_addr": 1}')
+
+
+def test_decode_raw_status_light_opcodes():
+    """Test OnOff, Lightness and CTL status messages decode into light status."""
+    assert decode_raw_status(_raw("8204", "01")) == RawLightStatus(
+        0x12, 0x8204, LightStatus(onoff=1)
+    )
+    lightness = decode_raw_status(_raw("0x824E", "ff7f", source="0012"))
+    assert lightness.source == 0x12
+    assert lightness.status.lightness == pytest.approx(0.5, abs=1e-4)
+    ctl = decode_raw_status(_raw("8260", "ffff8c0a"))
+    assert ctl.status == LightStatus(lightness=1.0, temperature=2700)
+
+
+def test_decode_raw_status_prefers_transition_target():
+    """Test a status sent during a transition reports the target state."""
+    # present off, target on, remaining time
+    assert decode_raw_status(_raw("8204", "000105")).status.onoff == 1
+    # present 0, target 65535
+    assert decode_raw_status(_raw("824E", "0000ffff05")).status.lightness == 1.0
+    # present 0/2700, target 65535/5000
+    ctl = decode_raw_status(_raw("8260", "00008c0affff881305"))
+    assert ctl.status == LightStatus(lightness=1.0, temperature=5000)
+
+
+def test_decode_raw_status_ignores_other_opcodes_and_rejects_bad_payloads():
+    """Test other mesh messages are skipped and broken status payloads raise."""
+    assert decode_raw_status(_raw("8201", "01")) is None
+    assert decode_raw_status(_raw("junk", "01")) is None
+    with pytest.raises(PayloadDecodeError):
+        decode_raw_status(_raw("824E", "ff"))
+    with pytest.raises(PayloadDecodeError):
+        decode_raw_status(_raw("824E", "zz"))
+    with pytest.raises(PayloadDecodeError):
+        decode_raw_status(_raw("824E", "ffff", source="nope"))
@@ -0,0 +1,170 @@
+"""Tests for the group command planner."""
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from custom_components.hafele_local_mqtt.light import HafeleLightEntity
+from custom_components.hafele_local_mqtt.planner import (
+    GroupCommandPlanner,
+    plan_group_cover,
+)
+
+
+GROUPS = {
+    100: {"group_name": "Kitchen", "devices": [1, 2, 3, 4]},
+    101: {"group_name": "Kitchen Island", "devices": [3, 4]},
+    102: {"group_name": "Living", "devices": [5, 6, 7]},
+    103: {"group_name": "Downstairs", "devices": [1, 2, 3, 4, 5, 6, 7, 8]},
+}
+
+
+def _index(groups):
+    members = {g: frozenset(info["devices"]) for g, info in groups.items()}
+    device_groups = {}
+    for group_addr, addrs in members.items():
+        for addr in addrs:
+            device_groups.setdefault(addr, []).append(group_addr)
+    return device_groups, members
+
+
+def test_plan_group_cover_prefers_fewest_commands():
+    """Test the largest fully-targeted group wins and leftovers go to devices."""
+    device_groups, members = _index(GROUPS)
+
+    assert plan_group_cover(set(range(1, 9)), device_groups, members) == ([103], set())
+    assert plan_group_cover({1, 2, 3, 4, 5, 6, 7}, device_groups, members) == (
+        [100, 102],
+        set(),
+    )
+    # Groups with untargeted members are never used
+    assert plan_group_cover({1, 2, 3, 5}, device_groups, members) == ([], {1, 2, 3, 5})
+    assert plan_group_cover({3, 4, 9}, device_groups, members) == ([101], {9})
+
+
+@pytest.fixture
+def planner(mock_mqtt_client):
+    return GroupCommandPlanner(lambda: GROUPS, mock_mqtt_client, "hafele", 0.01)
+
+
+def _light(addr, planner, mock_mqtt_client, turns_on_from_lightness=False):
+    coordinator = MagicMock()
+    coordinator.data = {"onoff": 1, "lightness": 0.5}
+    coordinator.hass.async_create_task = MagicMock(side_effect=lambda coro: coro.close())
+    entity = HafeleLightEntity(
+        coordinator,
+        addr,
+        {"device_name": f"Light {addr}", "device_types": ["Light"]},
+        mock_mqtt_client,
+        "hafele",
+    )
+    entity.planner = planner
+    if turns_on_from_lightness:
+        entity._single_message_verified = True
+    return entity
+
+
+def _topics(mock_mqtt_client):
+    return sorted(c[0][0] for c in mock_mqtt_client.async_publish.call_args_list)
+
+
+@pytest.mark.asyncio
+async def test_service_call_turn_off_becomes_group_commands(planner, mock_mqtt_client):
+    """Test a light.turn_off on 8 lights (one service call) is a single group command."""
+    lights = [_light(addr, planner, mock_mqtt_client) for addr in range(1, 9)]
+
+    await asyncio.gather(*(light.async_turn_off() for light in lights))
+
+    mock_mqtt_client.async_publish.assert_called_once_with(
+        "hafele/groups/Downstairs/power", False, qos=1
+    )
+    assert all(light.coordinator.data["onoff"] == 0 for light in lights)
+    assert planner.saved_messages == 7
+
+
+@pytest.mark.asyncio
+async def test_service_call_brightness_mixes_group_and_device_commands(
+    planner, mock_mqtt_client
+):
+    """Test lights no group covers still get their own commands."""
+    lights = [_light(addr, planner, mock_mqtt_client) for addr in (1, 2, 3, 4, 5, 9)]
+
+    await asyncio.gather(*(light.async_turn_on(brightness=255) for light in lights))
+
+    assert _topics(mock_mqtt_client) == [
+        "hafele/groups/Kitchen/lightness",
+        "hafele/groups/Kitchen/power",
+        "hafele/lights/Light 5/lightness",
+        "hafele/lights/Light 5/power",
+        "hafele/lights/Light 9/lightness",
+        "hafele/lights/Light 9/power",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_service_call_brightness_lightness_only_for_verified_lights(
+    planner, mock_mqtt_client
+):
+    """Test a group gets lightness alone only if all its lights turn on from it."""
+    lights = [
+        _light(addr, planner, mock_mqtt_client, turns_on_from_lightness=True)
+        for addr in (1, 2, 3, 4)
+    ]
+
+    await asyncio.gather(*(light.async_turn_on(brightness=255) for light in lights))
+
+    mock_mqtt_client.async_publish.assert_called_once_with(
+        "hafele/groups/Kitchen/lightness", {"lightness": 1.0}, qos=1
+    )
+
+
+@pytest.mark.asyncio
+async def test_failed_group_command_fails_the_service_calls(planner, mock_mqtt_client):
+    """Test the lights of a group command that wasn't sent see the error."""
+    lights = [_light(addr, planner, mock_mqtt_client) for addr in (1, 2, 3, 4, 9)]
+
+    async def _publish(topic, payload, **kwargs):
+        if "groups" in topic:
+            raise ConnectionError("MQTT client not connected")
+        return True
+
+    mock_mqtt_client.async_publish.side_effect = _publish
+    results = await asyncio.gather(
+        *(light.async_turn_off() for light in lights), return_exceptions=True
+    )
+
+    assert all(isinstance(r, ConnectionError) for r in results[:4])
+    assert results[4] is None
+    assert planner.saved_messages == 0
+
+    # A shed publish fails them too
+    mock_mqtt_client.async_publish.side_effect = None
+    mock_mqtt_client.async_publish.return_value = False
+    results = await asyncio.gather(
+        *(light.async_turn_off() for light in lights[:4]), return_exceptions=True
+    )
+    assert all(isinstance(r, ConnectionError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_different_commands_are_not_merged(planner, mock_mqtt_client):
+    """Test lights only share a group command if they got the same command."""
+    lights = [_light(addr, planner, mock_mqtt_client) for addr in (3, 4)]
+
+    await asyncio.gather(
+        lights[0].async_turn_on(brightness=255),
+        lights[1].async_turn_on(brightness=128),
+    )
+
+    assert mock_mqtt_client.async_publish.call_count == 4
+    assert not any("groups" in topic for topic in _topics(mock_mqtt_client))
+
+
+@pytest.mark.asyncio
+async def test_single_light_command_is_sent_directly(planner, mock_mqtt_client):
+    """Test a light outside every group doesn't wait for the window."""
+    light = _light(9, planner, mock_mqtt_client)
+    planner.window = 60
+
+    await asyncio.wait_for(light.async_turn_off(), 1)
+
+    assert _topics(mock_mqtt_client) == ["hafele/lights/Light 9/power"]
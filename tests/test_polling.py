@@ -0,0 +1,444 @@
+"""Tests for Hafele polling engines."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.hafele_local_mqtt.light import run_one_rotational_polling_cycle
+from custom_components.hafele_local_mqtt.polling import (
+    AdaptiveInterval,
+    RefreshSweep,
+    RotationalScheduler,
+    RttEstimator,
+    WindowedPoller,
+)
+
+
+class _FakeCoordinator:
+    """Coordinator whose refresh takes `latency` seconds and tracks concurrency."""
+
+    in_flight = 0
+    peak = 0
+
+    def __init__(self, name, latency=0.02, fail=False):
+        self.device_name = name
+        self.entity = MagicMock()
+        self.latency = latency
+        self.fail = fail
+        self.polls = 0
+
+    def is_poll_due(self, slack=0.0):
+        self.slack = slack
+        return True
+
+    async def async_refresh(self):
+        cls = type(self)
+        cls.in_flight += 1
+        cls.peak = max(cls.peak, cls.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            self.polls += 1
+            if self.fail:
+                raise RuntimeError("boom")
+        finally:
+            cls.in_flight -= 1
+
+
+@pytest.fixture(autouse=True)
+def _reset_counters():
+    _FakeCoordinator.in_flight = 0
+    _FakeCoordinator.peak = 0
+
+
+@pytest.mark.asyncio
+async def test_windowed_sweep_limits_polls_in_flight():
+    """Test at most `window` polls run at once and every light is polled once."""
+    coordinators = {i: _FakeCoordinator(f"Light {i}") for i in range(10)}
+    poller = WindowedPoller(coordinators, window=3, polling_interval=30)
+
+    duration = await poller.async_run_sweep()
+
+    assert _FakeCoordinator.peak == 3
+    assert all(c.polls == 1 for c in coordinators.values())
+    # 10 polls through 3 slots is 4 rounds, not 10
+    assert duration < 10 * 0.02
+    assert poller.last_sweep_duration == duration
+    assert poller.last_sweep_size == 10
+    assert poller.sweep_count == 1
+
+
+@pytest.mark.asyncio
+async def test_windowed_sweep_refills_slot_as_soon_as_one_frees():
+    """Test a slow light doesn't hold up the rest of the window."""
+    slow = _FakeCoordinator("slow", latency=0.2)
+    fast = [_FakeCoordinator(f"fast {i}", latency=0.01) for i in range(10)]
+    coordinators = {0: slow, **{i + 1: c for i, c in enumerate(fast)}}
+    poller = WindowedPoller(coordinators, window=2, polling_interval=30)
+
+    duration = await poller.async_run_sweep()
+
+    # The second slot works through all fast lights while the slow one is pending
+    assert duration < 0.2 + 0.05
+    assert all(c.polls == 1 for c in fast)
+
+
+@pytest.mark.asyncio
+async def test_windowed_sweep_survives_errors_and_skips_lights_without_entity():
+    """Test a failing poll doesn't end the sweep and entity-less lights are skipped."""
+    failing = _FakeCoordinator("failing", fail=True)
+    pending = _FakeCoordinator("pending")
+    pending.entity = None
+    ok = _FakeCoordinator("ok")
+    poller = WindowedPoller({1: failing, 2: pending, 3: ok}, window=1, polling_interval=30)
+
+    await poller.async_run_sweep()
+
+    assert failing.polls == 1
+    assert ok.polls == 1
+    assert pending.polls == 0
+    assert poller.last_sweep_size == 2
+
+
+@pytest.mark.asyncio
+async def test_windowed_sweep_judges_lights_due_with_one_sweep_of_slack():
+    """Test lights polled late in the previous sweep aren't skipped by the next one."""
+    coordinators = {i: _FakeCoordinator(f"Light {i}") for i in range(4)}
+    poller = WindowedPoller(coordinators, window=1, polling_interval=30)
+
+    duration = await poller.async_run_sweep()
+    assert {c.slack for c in coordinators.values()} == {0.0}
+    await poller.async_run_sweep()
+
+    assert {c.slack for c in coordinators.values()} == {duration}
+    assert duration > 0
+    poller.last_sweep_duration = 90
+    assert poller.due_slack == 30
+
+
+@pytest.mark.asyncio
+async def test_windowed_poller_start_and_stop():
+    """Test the background loop sweeps and can be stopped."""
+    coordinators = {1: _FakeCoordinator("Light 1", latency=0)}
+    poller = WindowedPoller(coordinators, window=4, polling_interval=0.01)
+
+    poller.start()
+    await asyncio.sleep(0.05)
+    await poller.async_stop()
+
+    assert poller.sweep_count >= 2
+    assert coordinators[1].polls >= poller.sweep_count
+
+
+def _ring_order(scheduler, turns):
+    return [scheduler.next_normal() for _ in range(turns)]
+
+
+def test_rotational_scheduler_round_robin_is_fair():
+    """Test every light gets exactly one turn per rotation."""
+    scheduler = RotationalScheduler()
+    for name in "abcd":
+        scheduler.add(name, name)
+
+    assert _ring_order(scheduler, 8) == list("abcdabcd")
+
+
+def test_rotational_scheduler_add_and_remove_while_running():
+    """Test lights added mid-rotation wait their turn and removed ones drop out."""
+    scheduler = RotationalScheduler()
+    for name in "abc":
+        scheduler.add(name, name)
+
+    assert _ring_order(scheduler, 2) == ["a", "b"]
+    scheduler.add("d", "d")  # discovered mid-rotation
+    scheduler.remove("a")
+    # c finishes the rotation, then the new light, and nobody is polled twice
+    assert _ring_order(scheduler, 5) == ["c", "b", "d", "c", "b"]
+    assert len(scheduler) == 3
+    assert "a" not in scheduler
+
+    # Re-adding a removed light doesn't give it two slots in the ring
+    scheduler.add("a", "a")
+    order = _ring_order(scheduler, 8)
+    assert sorted(order[:4]) == ["a", "b", "c", "d"]
+    assert order[:4] == order[4:]
+
+
+def test_rotational_scheduler_high_requests_are_fifo_and_deduplicated():
+    """Test HIGH requests are served oldest first, once per request burst."""
+    scheduler = RotationalScheduler()
+    for name in "abc":
+        scheduler.add(name, name)
+
+    scheduler.request_high("c")
+    scheduler.request_high("a")
+    scheduler.request_high("c")
+    scheduler.request_high("unknown")
+
+    assert scheduler.pending_high == 2
+    assert scheduler.pop_high() == "c"
+    assert scheduler.pop_high() == "a"
+    assert scheduler.pop_high() is None
+    # Lights just polled via HIGH give up their next ring turn
+    assert _ring_order(scheduler, 3) == ["b", "a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_rotational_cycle_normal_lights_do_not_starve():
+    """Test normal lights keep rotating while HIGH requests keep arriving."""
+    polled = []
+
+    def _entity(name):
+        entity = MagicMock()
+        entity.device_name = name
+
+        async def _refresh():
+            polled.append(name)
+            # A light re-requesting HIGH on every poll must not monopolize the mesh
+            scheduler.request_high("hot")
+
+        entity.coordinator.async_request_refresh = _refresh
+        return entity
+
+    scheduler = RotationalScheduler()
+    for name in ("hot", "n1", "n2", "n3"):
+        scheduler.add(name, _entity(name))
+    scheduler.request_high("hot")
+
+    with patch("asyncio.sleep", new_callable=AsyncMock):
+        for _ in range(6):
+            await run_one_rotational_polling_cycle(scheduler, 1)
+
+    normal = [name for name in polled if name != "hot"]
+    assert normal[:3] == ["n1", "n2", "n3"]
+    assert polled.count("hot") <= 6 + 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_sweep_polls_each_light_once():
+    """Test overlapping requests merge into one windowed sweep after the last settle time."""
+    coordinators = {addr: _FakeCoordinator(f"light_{addr}", latency=0.01) for addr in range(10)}
+    sweep = RefreshSweep(coordinators, window=3)
+
+    sweep.request(range(6), delay=0.02)
+    sweep.request(range(4, 10), delay=0.05)
+    # Unknown addresses are ignored
+    sweep.request([99], delay=0)
+    await asyncio.sleep(0.04)
+    assert all(c.polls == 0 for c in coordinators.values())
+    assert sweep.pending == 10
+
+    await asyncio.sleep(0.1)
+    assert [c.polls for c in coordinators.values()] == [1] * 10
+    assert _FakeCoordinator.peak == 3
+    assert sweep.sweep_count == 1
+    await sweep.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_refresh_sweep_stop_drops_pending():
+    """Test stopping the sweep cancels refreshes not started yet."""
+    coordinators = {1: _FakeCoordinator("light_1")}
+    sweep = RefreshSweep(coordinators, window=1)
+    sweep.request([1], delay=10)
+
+    await sweep.async_stop()
+
+    assert sweep.pending == 0
+    assert coordinators[1].polls == 0
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_adaptive_interval_stretches_and_snaps_back():
+    """Test the interval doubles while stable, capped, and resets on change."""
+    clock = _Clock()
+    interval = AdaptiveInterval(30, 600, clock=clock)
+
+    for expected in (60, 120, 240, 480, 600, 600):
+        interval.record_poll(changed=False)
+        assert interval.interval == expected
+
+    interval.record_push(changed=True)
+    assert interval.interval == 30
+    interval.record_poll(changed=False)
+    interval.reset()
+    assert interval.interval == 30
+    assert (interval.observations, interval.changes) == (8, 1)
+
+    interval.mark_polled()
+    clock.now = 29
+    assert not interval.is_due()
+    clock.now = 30
+    assert interval.is_due()
+
+
+def test_adaptive_interval_disabled_by_low_ceiling():
+    """Test a ceiling at or below the floor keeps the interval fixed."""
+    interval = AdaptiveInterval(30, 0)
+    interval.record_poll(changed=False)
+    assert interval.interval == 30
+
+
+def test_adaptive_intervals_cut_get_rate_on_a_mostly_idle_mesh():
+    """Test 300 lights with a few active ones need an order of magnitude fewer GETs."""
+    clock = _Clock()
+    lights = [AdaptiveInterval(30, 600, clock=clock) for _ in range(300)]
+    active = set(range(5))  # these change between every poll
+    gets = 0
+    staleness = []
+    active_polls = dict.fromkeys(active, 0)
+    sweep_duration = 0.0
+    sweeps = range(0, 3 * 3600, 30)  # a sweep every floor interval
+    for started in sweeps:
+        # The sweep picks its lights up front, then publishes their GETs one by one
+        clock.now = started
+        due = [
+            (index, light)
+            for index, light in enumerate(lights)
+            if light.is_due(slack=sweep_duration)
+        ]
+        for index, light in due:
+            clock.now += 0.2  # waiting for airtime and a window slot
+            light.mark_polled()
+            gets += 1
+            light.record_poll(changed=index in active)
+            if index in active:
+                active_polls[index] += 1
+                staleness.append(light.interval)
+        sweep_duration = clock.now - started
+
+    fixed_gets = 300 * (3 * 3600 // 30)
+    assert gets * 10 <= fixed_gets
+    # Active lights are still polled every floor interval, in every sweep
+    assert set(staleness) == {30}
+    assert set(active_polls.values()) == {len(sweeps)}
+
+
+def test_adaptive_interval_fresh_push_defers_poll():
+    """Test a pushed status counts as fresh data for a full interval."""
+    clock = _Clock()
+    interval = AdaptiveInterval(30, 600, clock=clock)
+    interval.mark_polled()
+    clock.now = 25
+    interval.record_push(changed=True)
+
+    clock.now = 40
+    assert interval.has_fresh_push()
+    assert not interval.is_due()
+    clock.now = 55
+    assert interval.is_due()
+
+
+def test_adaptive_interval_hold_defers_poll_until_transition_ends():
+    """Test a held device isn't due before the hold ends, and a reset drops the hold."""
+    clock = _Clock()
+    interval = AdaptiveInterval(30, 600, clock=clock)
+    interval.mark_polled()
+    clock.now = 40
+    interval.hold(600)
+
+    assert interval.is_held()
+    assert not interval.is_due()
+    clock.now = 640
+    assert interval.is_due()
+
+    interval.hold(600)
+    interval.reset()
+    assert not interval.is_held()
+
+
+def test_adaptive_interval_push_mid_transition_keeps_command_poll():
+    """Test a push during a commanded transition doesn't defer the confirming poll."""
+    clock = _Clock()
+    interval = AdaptiveInterval(30, 600, clock=clock)
+    interval.mark_polled()
+    clock.now = 100
+    interval.reset(command=True)
+    interval.hold(10)
+
+    clock.now = 105
+    interval.record_push(changed=True)  # halfway through the fade
+    assert interval.has_fresh_push()
+    assert not interval.is_due()
+    clock.now = 110
+    assert interval.is_due()
+
+    interval.mark_polled()
+    interval.record_poll(changed=False)
+    clock.now = 145
+    interval.record_push(changed=False)
+    clock.now = 170
+    # Confirmed - pushes defer polls again
+    assert not interval.is_due()
+
+
+def test_adaptive_interval_detects_reliable_pusher():
+    """Test a device pushing all its changes drops to the heartbeat until it misses one."""
+    clock = _Clock()
+    interval = AdaptiveInterval(30, 600, heartbeat=1800, reliable_pushes=3, clock=clock)
+
+    interval.record_push(changed=True)
+    interval.record_push(changed=True)
+    assert not interval.push_reliable
+    assert interval.interval == 30
+    interval.record_push(changed=True)
+    assert interval.push_reliable
+    assert interval.interval == 1800
+
+    interval.record_poll(changed=False)
+    assert interval.interval == 1800
+
+    # A poll finding a change the device didn't push ends the trust
+    interval.record_poll(changed=True)
+    assert not interval.push_reliable
+    assert interval.interval == 30
+
+
+def test_rtt_estimator_nearby_light_gets_short_timeout():
+    """Test a one-hop light converges to a timeout of tens of milliseconds."""
+    rtt = RttEstimator(initial=3, min_timeout=0.02, max_timeout=10)
+    assert rtt.timeout == 3
+
+    for sample in (0.020, 0.025, 0.018, 0.022) * 5:
+        rtt.record_sample(sample)
+
+    assert 0.02 <= rtt.timeout < 0.1
+
+
+def test_rtt_estimator_distant_light_stops_timing_out():
+    """Test a light slower than the configured timeout gets a timeout above its RTT."""
+    rtt = RttEstimator(initial=3, min_timeout=0.1, max_timeout=10)
+
+    for sample in (3.5, 4.2, 3.8, 4.0, 4.4, 3.6):
+        rtt.record_sample(sample)
+        assert rtt.timeout > sample
+
+    assert rtt.timeout <= 10
+
+
+def test_rtt_estimator_backs_off_on_timeout_within_bounds():
+    """Test timeouts double the value, clamped to the configured maximum."""
+    rtt = RttEstimator(initial=3, min_timeout=0.1, max_timeout=10)
+    rtt.record_timeout()
+    assert rtt.timeout == 6
+    rtt.record_timeout()
+    assert rtt.timeout == 10
+
+    rtt.record_sample(0.001)
+    assert rtt.timeout == 0.1
+
+
+def test_adaptive_interval_backs_off_unreachable_device():
+    """Test timeouts double the interval up to the backoff ceiling."""
+    interval = AdaptiveInterval(30, 600, heartbeat=1800, backoff_ceiling=3600)
+    for expected in (60, 120, 240, 480, 960, 1920, 3600, 3600):
+        interval.record_timeout()
+        assert interval.interval == expected
+    interval.reset()
+    assert interval.interval == 30
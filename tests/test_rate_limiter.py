@@ -0,0 +1,79 @@
+"""Tests for the mesh airtime budget."""
+import asyncio
+
+import pytest
+
+from custom_components.hafele_local_mqtt.rate_limiter import (
+    MeshAirtimeBudget,
+    PublishPriority,
+)
+
+
+@pytest.mark.asyncio
+async def test_burst_then_rate_limited():
+    """Test the bucket allows a burst and then queues."""
+    budget = MeshAirtimeBudget(rate=100, burst=2)
+
+    assert await budget.async_acquire() is True
+    assert await budget.async_acquire() is True
+
+    waiter = asyncio.create_task(budget.async_acquire())
+    await asyncio.sleep(0)
+    assert budget.queue_depth == 1
+    assert await asyncio.wait_for(waiter, 1) is True
+    assert budget.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_priority_order():
+    """Test commands go before verification GETs, and those before polls."""
+    budget = MeshAirtimeBudget(rate=200, burst=1)
+    await budget.async_acquire()  # drain the bucket
+
+    order = []
+
+    async def _acquire(name, priority):
+        await budget.async_acquire(priority)
+        order.append(name)
+
+    tasks = [
+        asyncio.create_task(_acquire("poll", PublishPriority.POLL)),
+        asyncio.create_task(_acquire("verify", PublishPriority.VERIFY)),
+        asyncio.create_task(_acquire("command", PublishPriority.COMMAND)),
+    ]
+    await asyncio.wait_for(asyncio.gather(*tasks), 1)
+
+    assert order == ["command", "verify", "poll"]
+
+
+@pytest.mark.asyncio
+async def test_polls_shed_under_backlog():
+    """Test low-priority traffic is shed once the backlog is full."""
+    budget = MeshAirtimeBudget(rate=50, burst=1, max_backlog=2)
+    await budget.async_acquire()
+
+    polls = [
+        asyncio.create_task(budget.async_acquire(PublishPriority.POLL)) for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    assert budget.queue_depth == 2
+
+    # Backlog full: a new poll is shed immediately
+    assert await budget.async_acquire(PublishPriority.POLL) is False
+
+    # A command evicts the newest queued poll and takes its place
+    command = asyncio.create_task(budget.async_acquire(PublishPriority.COMMAND))
+    await asyncio.sleep(0)
+    results = await asyncio.wait_for(asyncio.gather(*polls, command), 1)
+
+    assert results == [True, False, True]
+    assert budget.shed_count == 2
+
+
+@pytest.mark.asyncio
+async def test_disabled_budget():
+    """Test rate 0 disables limiting."""
+    budget = MeshAirtimeBudget(rate=0)
+    for _ in range(100):
+        assert await budget.async_acquire(PublishPriority.POLL) is True
+    assert budget.queue_depth == 0
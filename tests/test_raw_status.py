@@ -0,0 +1,137 @@
+"""Tests for passive light state tracking from raw mesh messages."""
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.hafele_local_mqtt.const import POLLING_MODE_WINDOWED
+from custom_components.hafele_local_mqtt.light import HafeleLightCoordinator
+from custom_components.hafele_local_mqtt.payload import decode_raw_status
+from custom_components.hafele_local_mqtt.rawstatus import RawStatusTracker
+
+
+def _coordinator(mock_hass, mock_mqtt_client, addr):
+    coordinator = HafeleLightCoordinator(
+        mock_hass,
+        mock_mqtt_client,
+        addr,
+        f"Light {addr}",
+        "hafele",
+        30,
+        3,
+        POLLING_MODE_WINDOWED,
+        ["Light"],
+    )
+    coordinator.async_set_updated_data = MagicMock()
+    return coordinator
+
+
+@pytest.fixture
+def tracked(mock_hass, mock_mqtt_client):
+    """A tracker over one set-up light at address 0x12."""
+    coordinator = _coordinator(mock_hass, mock_mqtt_client, 0x12)
+    discovery = MagicMock()
+    discovery.get_device = lambda addr: {"device_addr": addr} if addr in (0x12, 0x13) else None
+    tracker = RawStatusTracker(mock_mqtt_client, discovery, {0x12: coordinator}, "hafele")
+    return tracker, coordinator
+
+
+@pytest.mark.asyncio
+async def test_raw_tracker_subscribes_with_raw_decoder(tracked, mock_mqtt_client):
+    """Test the tracker takes one subscription on the raw message stream."""
+    tracker, _ = tracked
+
+    await tracker.async_start()
+    await tracker.async_start()
+
+    mock_mqtt_client.async_subscribe.assert_called_once_with(
+        "hafele/rawMessage", tracker._on_raw_status, decoder=decode_raw_status
+    )
+
+
+def test_raw_status_updates_coordinator_without_poll(tracked):
+    """Test a lightness status seen on the mesh updates the light like a push."""
+    tracker, coordinator = tracked
+    raw = b'{"source": "0x0012", "opcode": "824E", "payload": "ff7f", "ttl": 5, "rssi": -60}'
+
+    tracker._on_raw_status("hafele/rawMessage", decode_raw_status(raw))
+
+    assert coordinator._status_data["onoff"] == 1
+    assert coordinator._status_data["lightness"] == pytest.approx(0.5, abs=1e-4)
+    assert coordinator.adaptive_interval.has_fresh_push()
+    coordinator.async_set_updated_data.assert_called_once()
+    assert tracker.applied == 1
+
+
+def test_raw_status_from_unknown_source_is_ignored(tracked):
+    """Test messages of other opcodes and of lights not set up here are dropped."""
+    tracker, coordinator = tracked
+
+    tracker._on_raw_status("hafele/rawMessage", None)
+    tracker._on_raw_status(
+        "hafele/rawMessage",
+        decode_raw_status(b'{"source": "0x0013", "opcode": "8204", "payload": "01"}'),
+    )
+
+    coordinator.async_set_updated_data.assert_not_called()
+    assert (tracker.applied, tracker.ignored) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_group_multicast_get_collects_member_replies(mock_hass, mock_mqtt_client):
+    """Test one raw Get to a group address refreshes every member that answers."""
+    members = {addr: _coordinator(mock_hass, mock_mqtt_client, addr) for addr in (1, 2, 3)}
+    discovery = MagicMock()
+    tracker = RawStatusTracker(mock_mqtt_client, discovery, members, "hafele")
+    await tracker.async_start()
+
+    async def _respond(topic, payload, **kwargs):
+        # Lights 1 and 2 answer the multicast, light 3 stays silent
+        loop = asyncio.get_running_loop()
+        for source in ("0001", "0002"):
+            raw = f'{{"source": "{source}", "opcode": "824E", "payload": "ffff"}}'.encode()
+            loop.call_soon(tracker._on_raw_status, "hafele/rawMessage", decode_raw_status(raw))
+        return True
+
+    mock_mqtt_client.async_publish.side_effect = _respond
+
+    missing = await tracker.async_refresh_group(0xC000, members.values(), 0.05)
+
+    assert missing == [members[3]]
+    mock_mqtt_client.async_publish.assert_called_once()
+    topic, payload = mock_mqtt_client.async_publish.call_args[0]
+    assert topic == "hafele/rawMessage/send"
+    assert payload == {"destination": 0xC000, "opcode": 0x824B, "payload": ""}
+    for addr in (1, 2):
+        # Counted as answered polls, not as pushes
+        assert members[addr]._status_data["lightness"] == 1.0
+        assert members[addr].adaptive_interval.last_poll is not None
+        assert members[addr].adaptive_interval.last_push is None
+    assert members[3].consecutive_timeouts == 0
+    assert (tracker.group_gets, tracker.group_replies) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_group_multicast_window_starts_after_publish(mock_hass, mock_mqtt_client):
+    """Test a Get held back for airtime doesn't use up the members' reply window."""
+    members = {addr: _coordinator(mock_hass, mock_mqtt_client, addr) for addr in (1, 2)}
+    tracker = RawStatusTracker(mock_mqtt_client, MagicMock(), members, "hafele")
+    await tracker.async_start()
+
+    async def _delayed_publish(topic, payload, **kwargs):
+        # The rate limiter holds the poll longer than the whole window
+        await asyncio.sleep(0.1)
+        loop = asyncio.get_running_loop()
+        for source in ("0001", "0002"):
+            raw = f'{{"source": "{source}", "opcode": "824E", "payload": "ffff"}}'.encode()
+            loop.call_later(
+                0.01, tracker._on_raw_status, "hafele/rawMessage", decode_raw_status(raw)
+            )
+        return True
+
+    mock_mqtt_client.async_publish.side_effect = _delayed_publish
+
+    missing = await tracker.async_refresh_group(0xC000, members.values(), 0.05)
+
+    assert missing == []
+    assert tracker.group_replies == 2
@@ -0,0 +1,58 @@
+"""Tests for the Hafele scene platform."""
+import pytest
+from unittest.mock import MagicMock
+
+from custom_components.hafele_local_mqtt.scene import HafeleSceneEntity
+
+
+@pytest.fixture
+def discovery():
+    discovery = MagicMock()
+    groups = {
+        100: {"group_name": "Kitchen", "devices": [1, 2, 3]},
+        101: {"group_name": "Dining", "devices": [3, 4]},
+    }
+    discovery.get_group = MagicMock(side_effect=groups.get)
+    return discovery
+
+
+@pytest.mark.asyncio
+async def test_scene_activate_is_one_publish_and_one_sweep(discovery, mock_mqtt_client):
+    """Test a scene recall publishes once and refreshes its lights in a single sweep."""
+    refresh_sweep = MagicMock()
+    scene = HafeleSceneEntity(
+        "Dinner",
+        {"scene": "Dinner", "groups": [100, 101]},
+        discovery,
+        mock_mqtt_client,
+        "hafele",
+        refresh_sweep,
+    )
+
+    await scene.async_activate(transition=2)
+
+    mock_mqtt_client.async_publish.assert_called_once_with(
+        "hafele/scenes/Dinner/activate", {"transition_time": 20}, qos=1
+    )
+    refresh_sweep.request.assert_called_once()
+    addrs, delay = refresh_sweep.request.call_args[0]
+    assert addrs == {1, 2, 3, 4}
+    assert delay == 3.0
+    assert scene._attr_unique_id == "scene_Dinner_mqtt"
+
+
+@pytest.mark.asyncio
+async def test_scene_activate_without_transition(discovery, mock_mqtt_client):
+    """Test a plain recall sends an empty payload and skips unknown groups."""
+    refresh_sweep = MagicMock()
+    scene = HafeleSceneEntity(
+        7, {"scene_id": 7, "scene_name": "Movie", "groups": [999]},
+        discovery, mock_mqtt_client, "hafele", refresh_sweep,
+    )
+
+    await scene.async_activate()
+
+    mock_mqtt_client.async_publish.assert_called_once_with(
+        "hafele/scenes/Movie/activate", {}, qos=1
+    )
+    assert refresh_sweep.request.call_args[0][0] == set()
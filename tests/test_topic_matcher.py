@@ -0,0 +1,86 @@
+"""Tests for the MQTT topic filter trie."""
+import pytest
+from unittest.mock import MagicMock
+
+from custom_components.hafele_local_mqtt.topic_matcher import TopicMatcher
+
+
+def test_exact_match():
+    """Test exact filters only match their own topic."""
+    matcher = TopicMatcher()
+    callback = MagicMock()
+    matcher.add("hafele/lights/Light 1/status", callback)
+
+    assert matcher.match("hafele/lights/Light 1/status") == [callback]
+    assert matcher.match("hafele/lights/Light 2/status") == []
+    assert matcher.match("hafele/lights/Light 1") == []
+
+
+def test_single_level_wildcard():
+    """Test + matches exactly one level."""
+    matcher = TopicMatcher()
+    callback = MagicMock()
+    matcher.add("hafele/lights/+/status", callback)
+
+    assert matcher.match("hafele/lights/Light 1/status") == [callback]
+    assert matcher.match("hafele/lights/status") == []
+    assert matcher.match("hafele/lights/a/b/status") == []
+
+
+def test_multi_level_wildcard():
+    """Test # matches the parent level and everything below it."""
+    matcher = TopicMatcher()
+    callback = MagicMock()
+    matcher.add("hafele/#", callback)
+
+    assert matcher.match("hafele") == [callback]
+    assert matcher.match("hafele/lights") == [callback]
+    assert matcher.match("hafele/lights/Light 1/status") == [callback]
+    assert matcher.match("other/lights") == []
+
+
+def test_dollar_topics_not_matched_by_leading_wildcards():
+    """Test wildcards at the first level don't match $SYS-style topics."""
+    matcher = TopicMatcher()
+    matcher.add("#", MagicMock())
+    matcher.add("+/info", MagicMock())
+
+    assert matcher.match("$SYS/info") == []
+
+
+def test_fan_out_to_multiple_filters_and_callbacks():
+    """Test one topic reaches every matching filter and every callback per filter."""
+    matcher = TopicMatcher()
+    first, second, wildcard, catch_all = MagicMock(), MagicMock(), MagicMock(), MagicMock()
+    matcher.add("hafele/lights/Light 1/status", first)
+    matcher.add("hafele/lights/Light 1/status", second)
+    matcher.add("hafele/lights/+/status", wildcard)
+    matcher.add("hafele/#", catch_all)
+
+    matches = matcher.match("hafele/lights/Light 1/status")
+    assert sorted(map(id, matches)) == sorted(map(id, [first, second, wildcard, catch_all]))
+    assert len(matcher) == 4
+
+
+def test_remove_prunes_and_keeps_other_callbacks():
+    """Test removing one callback leaves the others and prunes empty levels."""
+    matcher = TopicMatcher()
+    first, second = MagicMock(), MagicMock()
+    matcher.add("hafele/lights/+/status", first)
+    matcher.add("hafele/lights/+/status", second)
+
+    assert matcher.remove("hafele/lights/+/status", first) is True
+    assert matcher.match("hafele/lights/x/status") == [second]
+    assert matcher.remove("hafele/lights/+/status", first) is False
+
+    assert matcher.remove("hafele/lights/+/status", second) is True
+    assert "hafele/lights/+/status" not in matcher
+    assert matcher._root.children == {}
+    assert len(matcher) == 0
+
+
+def test_invalid_multi_level_wildcard():
+    """Test # is only allowed as the last level."""
+    matcher = TopicMatcher()
+    with pytest.raises(ValueError):
+        matcher.add("hafele/#/status", MagicMock())